@@ -4,107 +4,167 @@
 Ultra-simple MCP Calculator Server - MVP for testing
 Compatible with Elf's MCP client implementation
 """
-import json
+import operator
 import sys
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes"""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+TOOLS = [
+    {
+        "name": "calculate",
+        "description": "Perform basic arithmetic operations (add, subtract, multiply, divide)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "a": {"type": "number", "description": "First number"},
+                "b": {"type": "number", "description": "Second number"},
+                "operation": {"type": "string", "enum": ["add", "subtract", "multiply", "divide"], "description": "Operation to perform"}
+            },
+            "required": ["a", "b", "operation"]
+        }
+    }
+]
+
+# Shared tools/list result; never mutated, so it is safe to reuse across responses
+_TOOLS_LIST_RESULT = {"tools": TOOLS}
+
+def _divide(a, b):
+    """Divide a by b, rejecting division by zero"""
+    if b == 0:
+        raise ValueError("Cannot divide by zero")
+    return a / b
+
+OPS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": _divide,
+}
+
+class RPCError(Exception):
+    """JSON-RPC error raised by a handler and reported to the client"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+# Response skeletons reused for every reply; each is serialized before the next mutation
+_RESULT_RESPONSE = {"jsonrpc": "2.0", "id": None, "result": None}
+_ERROR_RESPONSE = {"jsonrpc": "2.0", "id": None, "error": {"code": 0, "message": ""}}
+
+def write_response(response: dict) -> None:
+    """Write a JSON-RPC response to stdout as a single UTF-8 line"""
+    stdout = sys.stdout.buffer
+    stdout.write(_dumps(response) + b"\n")
+    stdout.flush()
+
+def write_result(request_id, result: dict) -> None:
+    """Write a JSON-RPC success response"""
+    _RESULT_RESPONSE["id"] = request_id
+    _RESULT_RESPONSE["result"] = result
+    write_response(_RESULT_RESPONSE)
+
+def write_error(request_id, code: int, message: str) -> None:
+    """Write a JSON-RPC error response"""
+    error = _ERROR_RESPONSE["error"]
+    error["code"] = code
+    error["message"] = message
+    _ERROR_RESPONSE["id"] = request_id
+    write_response(_ERROR_RESPONSE)
+
+def _do_calculate(args: dict) -> dict:
+    """Run the calculate tool"""
+    a = args.get("a")
+    b = args.get("b")
+    operation = args.get("operation")
+
+    try:
+        op = OPS.get(operation)
+        if op is None:
+            raise ValueError(f"Unknown operation: {operation}")
+        result = op(a, b)
+    except Exception as e:
+        raise RPCError(-1, f"Calculation error: {str(e)}") from e
+
+    return {"content": [{"type": "text", "text": str(result)}]}
+
+TOOL_HANDLERS = {
+    "calculate": _do_calculate,
+}
+
+# Static initialize result; never mutated
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {"name": "calculator", "version": "1.0.0"}
+}
+
+def _handle_initialize(params: dict) -> dict:
+    """Handle the initialize handshake"""
+    return _INITIALIZE_RESULT
+
+def _handle_tools_list(params: dict) -> dict:
+    """Handle tools/list"""
+    return _TOOLS_LIST_RESULT
+
+def _handle_tools_call(params: dict) -> dict:
+    """Handle tools/call by dispatching on the tool name"""
+    tool_name = params.get("name")
+    handler = TOOL_HANDLERS.get(tool_name)
+    if handler is None:
+        raise RPCError(-1, f"Unknown tool: {tool_name}")
+    return handler(params.get("arguments", {}))
+
+METHOD_HANDLERS = {
+    "initialize": _handle_initialize,
+    "tools/list": _handle_tools_list,
+    "tools/call": _handle_tools_call,
+}
+
 def main():
     """Handle MCP requests via stdin/stdout"""
-    tools = [
-        {
-            "name": "calculate",
-            "description": "Perform basic arithmetic operations (add, subtract, multiply, divide)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "a": {"type": "number", "description": "First number"},
-                    "b": {"type": "number", "description": "Second number"},
-                    "operation": {"type": "string", "enum": ["add", "subtract", "multiply", "divide"], "description": "Operation to perform"}
-                },
-                "required": ["a", "b", "operation"]
-            }
-        }
-    ]
-    
-    for line in sys.stdin:
+    stdin = sys.stdin.buffer
+    while True:
+        line = stdin.readline()
+        if not line:
+            break
+        if line in (b"\n", b"\r\n"):
+            continue
+        req_id = None
         try:
-            request = json.loads(line.strip())
+            # JSON parsers accept surrounding whitespace, so the line is parsed as read
+            request = _loads(line)
+            req_id = request.get("id")
             method = request.get("method")
-            params = request.get("params", {})
-            
-            if method == "initialize":
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {"tools": {}},
-                        "serverInfo": {"name": "calculator", "version": "1.0.0"}
-                    }
-                }
-            elif method == "tools/list":
-                response = {
-                    "jsonrpc": "2.0", 
-                    "id": request.get("id"),
-                    "result": {"tools": tools}
-                }
-            elif method == "tools/call":
-                tool_name = params.get("name")
-                args = params.get("arguments", {})
-                
-                if tool_name == "calculate":
-                    a = args.get("a")
-                    b = args.get("b")
-                    operation = args.get("operation")
-                    
-                    try:
-                        if operation == "add":
-                            result = a + b
-                        elif operation == "subtract":
-                            result = a - b
-                        elif operation == "multiply":
-                            result = a * b
-                        elif operation == "divide":
-                            if b == 0:
-                                raise ValueError("Cannot divide by zero")
-                            result = a / b
-                        else:
-                            raise ValueError(f"Unknown operation: {operation}")
-                        
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request.get("id"),
-                            "result": {
-                                "content": [{"type": "text", "text": str(result)}]
-                            }
-                        }
-                    except Exception as e:
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request.get("id"),
-                            "error": {"code": -1, "message": f"Calculation error: {str(e)}"}
-                        }
-                else:
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "error": {"code": -1, "message": f"Unknown tool: {tool_name}"}
-                    }
+            params = request.get("params") or {}
+
+            handler = METHOD_HANDLERS.get(method)
+            if handler is None:
+                write_error(req_id, -32601, f"Method not found: {method}")
+                continue
+
+            try:
+                result = handler(params)
+            except RPCError as e:
+                write_error(req_id, e.code, e.message)
             else:
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {"code": -32601, "message": f"Method not found: {method}"}
-                }
-            
-            print(json.dumps(response), flush=True)
-            
+                write_result(req_id, result)
+
         except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": request.get("id") if 'request' in locals() else None,
-                "error": {"code": -32603, "message": str(e)}
-            }
-            print(json.dumps(error_response), flush=True)
+            write_error(req_id, -32603, str(e))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
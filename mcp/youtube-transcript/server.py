@@ -5,18 +5,52 @@ YouTube Transcript MCP Server
 Minimal implementation for extracting YouTube video transcripts and metadata
 Compatible with Elf0's MCP client implementation
 """
-import json
-import sys
+import functools
+import os
+from pathlib import Path
 import re
-from urllib.parse import urlparse, parse_qs
+import sys
+import time
+
 from youtube_transcript_api import YouTubeTranscriptApi
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes"""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
 try:
     from rich.console import Console
     console = Console(stderr=True)
 except ImportError:
     console = None
 
+# Matches youtube.com/watch?...v=ID, youtu.be/ID, or a bare 11-character video ID
+_VIDEO_ID_RE = re.compile(
+    r"(?:youtube\.com/watch\?(?:[^#&]*&)*v=|youtu\.be/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+    r"|^([A-Za-z0-9_-]{11})$"
+)
+
+# Verbose diagnostics for transcript fetching (set YT_TRANSCRIPT_DEBUG=1 to enable)
+_DEBUG = os.environ.get("YT_TRANSCRIPT_DEBUG") == "1"
+
+# Opt-in on-disk transcript cache (set YT_TRANSCRIPT_CACHE=1 to enable)
+_CACHE_ENABLED = os.environ.get("YT_TRANSCRIPT_CACHE") == "1"
+_CACHE_DIR = Path(os.environ.get("YT_TRANSCRIPT_CACHE_DIR", Path.home() / ".cache" / "elf0" / "youtube-transcript"))
+_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+# Language codes such as "en" or "pt-BR"; only these are used in cache file names
+_LANGUAGE_RE = re.compile(r"[A-Za-z]{2,3}(?:-[A-Za-z0-9]+)?")
+
 def log_message(message: str, style: str = None):
     """Log message using rich if available, otherwise print to stderr"""
     if console:
@@ -25,33 +59,91 @@ def log_message(message: str, style: str = None):
         print(f"[YouTube MCP] {message}", file=sys.stderr)
 
 
+class RPCError(Exception):
+    """JSON-RPC error raised by a handler and reported to the client"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+# Response skeletons reused for every reply; each is serialized before the next mutation
+_RESULT_RESPONSE = {"jsonrpc": "2.0", "id": None, "result": None}
+_ERROR_RESPONSE = {"jsonrpc": "2.0", "id": None, "error": {"code": 0, "message": ""}}
+
+
+def write_response(response: dict) -> None:
+    """Write a JSON-RPC response to stdout as a single UTF-8 line"""
+    stdout = sys.stdout.buffer
+    stdout.write(_dumps(response) + b"\n")
+    stdout.flush()
+
+
+def write_result(request_id, result: dict) -> None:
+    """Write a JSON-RPC success response"""
+    _RESULT_RESPONSE["id"] = request_id
+    _RESULT_RESPONSE["result"] = result
+    write_response(_RESULT_RESPONSE)
+
+
+def write_error(request_id, code: int, message: str) -> None:
+    """Write a JSON-RPC error response"""
+    error = _ERROR_RESPONSE["error"]
+    error["code"] = code
+    error["message"] = message
+    _ERROR_RESPONSE["id"] = request_id
+    write_response(_ERROR_RESPONSE)
+
+
+@functools.lru_cache(maxsize=1024)
 def extract_video_id(url: str) -> str:
     """Extract YouTube video ID from URL"""
-    # Handle youtube.com/watch?v=ID
-    if 'youtube.com/watch' in url:
-        parsed = urlparse(url)
-        params = parse_qs(parsed.query)
-        if 'v' in params:
-            return params['v'][0]
-    
-    # Handle youtu.be/ID
-    if 'youtu.be/' in url:
-        return url.split('youtu.be/')[-1].split('?')[0]
-    
-    # Handle direct video ID
-    if re.match(r'^[a-zA-Z0-9_-]{11}$', url):
-        return url
-    
-    raise ValueError(f"Could not extract video ID from URL: {url}")
+    match = _VIDEO_ID_RE.search(url)
+    if not match:
+        raise ValueError(f"Could not extract video ID from URL: {url}")
+    return match.group(1) or match.group(2)
 
 
 def validate_youtube_url(url: str) -> bool:
     """Validate if URL is a YouTube video URL"""
-    try:
-        extract_video_id(url)
-        return True
-    except ValueError:
-        return False
+    return _VIDEO_ID_RE.search(url) is not None
+
+
+def _fetch_transcript(video_id: str, language: str | None = None) -> list:
+    """Fetch transcript segments, reading through the on-disk cache when enabled"""
+    # The language comes from the caller, so anything but a plain code bypasses the
+    # cache rather than becoming part of a file path
+    use_cache = _CACHE_ENABLED and (language is None or _LANGUAGE_RE.fullmatch(language) is not None)
+    cache_file = _CACHE_DIR / f"{video_id}.{language or 'any'}.json"
+    if use_cache:
+        try:
+            if time.time() - cache_file.stat().st_mtime < _CACHE_MAX_AGE_SECONDS:
+                return _loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+
+    if language:
+        transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
+    else:
+        transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+
+    if use_cache:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(_dumps(transcript_list))
+        except (OSError, TypeError) as e:
+            log_message(f"⚠️ Could not write transcript cache: {e}", "yellow")
+
+    return transcript_list
+
+
+def _join_segments(transcript_list: list) -> tuple[str, int]:
+    """Join transcript segments into one text and count its words"""
+    parts = [item['text'] for item in transcript_list]
+    # Counting per segment avoids splitting the (potentially multi-MB) joined text again
+    word_count = sum(len(part.split()) for part in parts)
+    return ' '.join(parts), word_count
 
 
 def extract_transcript(url: str, language: str = "en") -> dict:
@@ -62,14 +154,13 @@ def extract_transcript(url: str, language: str = "en") -> dict:
         
         # Try to get transcript in specified language
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
+            transcript_list = _fetch_transcript(video_id, language)
         except Exception:
             # Fallback to auto-generated or any available language
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+            transcript_list = _fetch_transcript(video_id)
         
         # Join all transcript segments
-        transcript_text = ' '.join([item['text'] for item in transcript_list])
-        word_count = len(transcript_text.split())
+        transcript_text, word_count = _join_segments(transcript_list)
         
         log_message(f"✅ Transcript extracted: {word_count} words, {len(transcript_list)} segments", "green")
         
@@ -87,34 +178,40 @@ def extract_transcript(url: str, language: str = "en") -> dict:
 def get_transcript_text(url: str, language: str = "en") -> str:
     """Extract transcript text only from YouTube video"""
     try:
-        log_message(f"🔍 DEBUG: get_transcript_text called with URL: {url}", "yellow")
-        log_message(f"🔍 DEBUG: Language parameter: {language}", "yellow")
+        if _DEBUG:
+            log_message(f"🔍 DEBUG: get_transcript_text called with URL: {url}", "yellow")
+            log_message(f"🔍 DEBUG: Language parameter: {language}", "yellow")
         
         video_id = extract_video_id(url)
         log_message(f"📺 Fetching transcript text for video: {video_id}", "blue")
-        log_message(f"🔍 DEBUG: Extracted video ID: {video_id} from URL: {url}", "yellow")
+        if _DEBUG:
+            log_message(f"🔍 DEBUG: Extracted video ID: {video_id} from URL: {url}", "yellow")
         
         # Try to get transcript in specified language
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
-            log_message(f"🔍 DEBUG: Successfully got transcript in {language}", "yellow")
+            transcript_list = _fetch_transcript(video_id, language)
+            if _DEBUG:
+                log_message(f"🔍 DEBUG: Successfully got transcript in {language}", "yellow")
         except Exception as e:
-            log_message(f"🔍 DEBUG: Language {language} failed: {e}, trying fallback", "yellow")
+            if _DEBUG:
+                log_message(f"🔍 DEBUG: Language {language} failed: {e}, trying fallback", "yellow")
             # Fallback to auto-generated or any available language
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-            log_message(f"🔍 DEBUG: Fallback transcript retrieved", "yellow")
+            transcript_list = _fetch_transcript(video_id)
+            if _DEBUG:
+                log_message(f"🔍 DEBUG: Fallback transcript retrieved", "yellow")
         
         # Join all transcript segments
-        transcript_text = ' '.join([item['text'] for item in transcript_list])
-        word_count = len(transcript_text.split())
+        transcript_text, word_count = _join_segments(transcript_list)
         
         log_message(f"✅ Transcript text extracted: {word_count} words, {len(transcript_list)} segments", "green")
-        log_message(f"🔍 DEBUG: First 100 chars of transcript: {transcript_text[:100]}...", "yellow")
+        if _DEBUG:
+            log_message(f"🔍 DEBUG: First 100 chars of transcript: {transcript_text[:100]}...", "yellow")
         
         return transcript_text
     
     except Exception as e:
-        log_message(f"❌ DEBUG: Error in get_transcript_text: {str(e)}", "red")
+        if _DEBUG:
+            log_message(f"❌ DEBUG: Error in get_transcript_text: {str(e)}", "red")
         raise Exception(f"Failed to extract transcript text: {str(e)}")
 
 
@@ -135,185 +232,178 @@ def get_video_metadata(url: str) -> dict:
         raise Exception(f"Failed to get video metadata: {str(e)}")
 
 
+TOOLS = [
+    {
+        "name": "extract_transcript",
+        "description": "Extract transcript text from a YouTube video",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "description": "YouTube video URL or video ID"},
+                "language": {"type": "string", "description": "Language code (default: 'en')", "default": "en"}
+            },
+            "required": ["url"]
+        }
+    },
+    {
+        "name": "get_transcript_text",
+        "description": "Extract transcript text only from a YouTube video (returns plain text)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "description": "YouTube video URL or video ID"},
+                "language": {"type": "string", "description": "Language code (default: 'en')", "default": "en"}
+            },
+            "required": ["url"]
+        }
+    },
+    {
+        "name": "get_video_metadata",
+        "description": "Get metadata for a YouTube video (title, channel, duration, etc.)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "description": "YouTube video URL or video ID"}
+            },
+            "required": ["url"]
+        }
+    },
+    {
+        "name": "validate_youtube_url",
+        "description": "Validate if a URL is a valid YouTube video URL",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "description": "URL to validate"}
+            },
+            "required": ["url"]
+        }
+    }
+]
+
+# Shared tools/list result; never mutated, so it is safe to reuse across responses
+_TOOLS_LIST_RESULT = {"tools": TOOLS}
+
+
+def _require_url(args: dict) -> str:
+    """Return the 'url' argument or raise if it is missing"""
+    url = args.get("url")
+    if not url:
+        raise ValueError("URL is required")
+    return url
+
+
+def _tool_extract_transcript(args: dict) -> str:
+    """Run the extract_transcript tool"""
+    url = _require_url(args)
+    result = extract_transcript(url, args.get("language", "en"))
+    return _dumps(result).decode()
+
+
+def _tool_get_transcript_text(args: dict) -> str:
+    """Run the get_transcript_text tool"""
+    url = _require_url(args)
+    return get_transcript_text(url, args.get("language", "en"))
+
+
+def _tool_get_video_metadata(args: dict) -> str:
+    """Run the get_video_metadata tool"""
+    url = _require_url(args)
+    result = get_video_metadata(url)
+    return _dumps(result).decode()
+
+
+def _tool_validate_youtube_url(args: dict) -> str:
+    """Run the validate_youtube_url tool"""
+    url = _require_url(args)
+    result = {"valid": validate_youtube_url(url), "url": url}
+    return _dumps(result).decode()
+
+
+TOOL_HANDLERS = {
+    "extract_transcript": _tool_extract_transcript,
+    "get_transcript_text": _tool_get_transcript_text,
+    "get_video_metadata": _tool_get_video_metadata,
+    "validate_youtube_url": _tool_validate_youtube_url,
+}
+
+
+# Static initialize result; never mutated
+_INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {"tools": {}},
+    "serverInfo": {"name": "youtube-transcript", "version": "0.1.0"}
+}
+
+
+def _handle_initialize(params: dict) -> dict:
+    """Handle the initialize handshake"""
+    log_message("🔌 Client connected and initialized", "green")
+    return _INITIALIZE_RESULT
+
+
+def _handle_tools_list(params: dict) -> dict:
+    """Handle tools/list"""
+    return _TOOLS_LIST_RESULT
+
+
+def _handle_tools_call(params: dict) -> dict:
+    """Handle tools/call by dispatching on the tool name"""
+    tool_name = params.get("name")
+    handler = TOOL_HANDLERS.get(tool_name)
+    if handler is None:
+        raise RPCError(-1, f"Unknown tool: {tool_name}")
+
+    try:
+        text = handler(params.get("arguments", {}))
+    except Exception as e:
+        raise RPCError(-1, str(e)) from e
+
+    return {"content": [{"type": "text", "text": text}]}
+
+
+METHOD_HANDLERS = {
+    "initialize": _handle_initialize,
+    "tools/list": _handle_tools_list,
+    "tools/call": _handle_tools_call,
+}
+
+
 def main():
     """Handle MCP requests via stdin/stdout"""
     log_message("🚀 YouTube Transcript MCP Server starting...", "bold green")
     log_message("💡 Waiting for MCP requests via stdin", "dim")
-    
-    tools = [
-        {
-            "name": "extract_transcript",
-            "description": "Extract transcript text from a YouTube video",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "url": {"type": "string", "description": "YouTube video URL or video ID"},
-                    "language": {"type": "string", "description": "Language code (default: 'en')", "default": "en"}
-                },
-                "required": ["url"]
-            }
-        },
-        {
-            "name": "get_transcript_text",
-            "description": "Extract transcript text only from a YouTube video (returns plain text)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "url": {"type": "string", "description": "YouTube video URL or video ID"},
-                    "language": {"type": "string", "description": "Language code (default: 'en')", "default": "en"}
-                },
-                "required": ["url"]
-            }
-        },
-        {
-            "name": "get_video_metadata",
-            "description": "Get metadata for a YouTube video (title, channel, duration, etc.)",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "url": {"type": "string", "description": "YouTube video URL or video ID"}
-                },
-                "required": ["url"]
-            }
-        },
-        {
-            "name": "validate_youtube_url",
-            "description": "Validate if a URL is a valid YouTube video URL",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "url": {"type": "string", "description": "URL to validate"}
-                },
-                "required": ["url"]
-            }
-        }
-    ]
-    
-    for line in sys.stdin:
+
+    stdin = sys.stdin.buffer
+    while True:
+        line = stdin.readline()
+        if not line:
+            break
+        if line in (b"\n", b"\r\n"):
+            continue
+        req_id = None
         try:
-            request = json.loads(line.strip())
+            # JSON parsers accept surrounding whitespace, so the line is parsed as read
+            request = _loads(line)
+            req_id = request.get("id")
             method = request.get("method")
-            params = request.get("params", {})
-            
-            if method == "initialize":
-                log_message("🔌 Client connected and initialized", "green")
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {"tools": {}},
-                        "serverInfo": {"name": "youtube-transcript", "version": "0.1.0"}
-                    }
-                }
-            elif method == "tools/list":
-                response = {
-                    "jsonrpc": "2.0", 
-                    "id": request.get("id"),
-                    "result": {"tools": tools}
-                }
-            elif method == "tools/call":
-                tool_name = params.get("name")
-                args = params.get("arguments", {})
-                
-                try:
-                    if tool_name == "extract_transcript":
-                        url = args.get("url")
-                        language = args.get("language", "en")
-                        
-                        if not url:
-                            raise ValueError("URL is required")
-                        
-                        result = extract_transcript(url, language)
-                        
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request.get("id"),
-                            "result": {
-                                "content": [{"type": "text", "text": json.dumps(result, indent=2)}]
-                            }
-                        }
-                    
-                    elif tool_name == "get_transcript_text":
-                        url = args.get("url")
-                        language = args.get("language", "en")
-                        
-                        if not url:
-                            raise ValueError("URL is required")
-                        
-                        result = get_transcript_text(url, language)
-                        
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request.get("id"),
-                            "result": {
-                                "content": [{"type": "text", "text": result}]
-                            }
-                        }
-                    
-                    elif tool_name == "get_video_metadata":
-                        url = args.get("url")
-                        
-                        if not url:
-                            raise ValueError("URL is required")
-                        
-                        result = get_video_metadata(url)
-                        
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request.get("id"),
-                            "result": {
-                                "content": [{"type": "text", "text": json.dumps(result, indent=2)}]
-                            }
-                        }
-                    
-                    elif tool_name == "validate_youtube_url":
-                        url = args.get("url")
-                        
-                        if not url:
-                            raise ValueError("URL is required")
-                        
-                        is_valid = validate_youtube_url(url)
-                        result = {"valid": is_valid, "url": url}
-                        
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request.get("id"),
-                            "result": {
-                                "content": [{"type": "text", "text": json.dumps(result, indent=2)}]
-                            }
-                        }
-                    
-                    else:
-                        response = {
-                            "jsonrpc": "2.0",
-                            "id": request.get("id"),
-                            "error": {"code": -1, "message": f"Unknown tool: {tool_name}"}
-                        }
-                
-                except Exception as e:
-                    response = {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "error": {"code": -1, "message": str(e)}
-                    }
+            params = request.get("params") or {}
+
+            handler = METHOD_HANDLERS.get(method)
+            if handler is None:
+                write_error(req_id, -32601, f"Method not found: {method}")
+                continue
+
+            try:
+                result = handler(params)
+            except RPCError as e:
+                write_error(req_id, e.code, e.message)
             else:
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {"code": -32601, "message": f"Method not found: {method}"}
-                }
-            
-            print(json.dumps(response), flush=True)
-            
+                write_result(req_id, result)
+
         except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": request.get("id") if 'request' in locals() else None,
-                "error": {"code": -32603, "message": str(e)}
-            }
-            print(json.dumps(error_response), flush=True)
+            write_error(req_id, -32603, str(e))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,28 +1,25 @@
 from collections.abc import Generator
+from concurrent.futures import Future, wait
 import contextlib
-import json
 import logging
 import os
 from pathlib import Path
 import sys
+import threading
 from typing import Annotated, Any
 
 import rich
 from rich.console import Console as RichConsole
-from rich.live import Live
-from rich.logging import RichHandler  # Added
-from rich.markdown import Markdown
-from rich.spinner import Spinner
 import typer
 
 from elf0.core.exceptions import UserExitRequested
 from elf0.core.input_state import is_collecting_input
-from elf0.core.runner import run_workflow
 from elf0.utils.file_utils import (  # Added import
     extract_spec_description,
     list_spec_files,
     parse_at_references,
     parse_context_files,
+    read_text_file,
 )
 
 # Configure global Rich console for stderr
@@ -32,23 +29,56 @@ rich.console = RichConsole(stderr=True)
 # Dedicated Rich console for stdout (workflow results)
 stdout_workflow_console = RichConsole(file=sys.stdout)
 
-# --- BEGIN Centralized basicConfig (Module Level) ---
-# Setup root logger with RichHandler. Specific log levels are tuned by main_callback.
-logging.basicConfig(
-    level=logging.WARNING,  # Default root level. Loggers like 'elf0.core' will be adjusted.
-    format="%(message)s",   # RichHandler handles its own formatting.
-    datefmt="[%X]",         # RichHandler might use its own or this as a hint.
-    handlers=[
-        RichHandler(
-            rich_tracebacks=True,
-            markup=True,
-            show_path=False,
-            log_time_format="[%X]",
-            console=rich.console # Use the globally configured stderr RichConsole
-        )
-    ]
-)
-# --- END Centralized basicConfig ---
+# Logger levels per verbosity: INFO for elf0.core and HTTP libraries when verbose,
+# otherwise errors for elf0.core and warnings for HTTP libraries.
+LOG_LEVELS: dict[bool, dict[str, int]] = {
+    True: {"elf0.core": logging.INFO, "httpx": logging.INFO, "httpcore": logging.INFO},
+    False: {"elf0.core": logging.ERROR, "httpx": logging.WARNING, "httpcore": logging.WARNING},
+}
+
+def _make_rich_handler() -> logging.Handler:
+    """Create the RichHandler that renders log records on the stderr console."""
+    from rich.logging import RichHandler
+
+    handler = RichHandler(
+        rich_tracebacks=True,
+        markup=True,
+        show_path=False,
+        log_time_format="[%X]",
+        console=rich.console # Use the globally configured stderr RichConsole
+    )
+    handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+    return handler
+
+class _DeferredRichHandler(logging.Handler):
+    """Handler that only builds the RichHandler once a record is actually emitted.
+
+    Non-verbose runs usually log nothing, so they skip importing and configuring
+    rich.logging entirely while errors are still rendered the same way.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._handler: logging.Handler | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            self._handler = _make_rich_handler()
+        self._handler.handle(record)
+
+def _configure_logging(verbose: bool) -> None:
+    """Setup the root logger and the elf0/HTTP logger levels for the chosen verbosity."""
+    handler = _make_rich_handler() if verbose else _DeferredRichHandler()
+    # Default root level; loggers like 'elf0.core' are adjusted below
+    logging.basicConfig(level=logging.WARNING, handlers=[handler])
+    for logger_name, level in LOG_LEVELS[verbose].items():
+        logging.getLogger(logger_name).setLevel(level)
+
+def run_workflow(spec_path: Path, prompt: str, session_id: str) -> dict[str, Any]:
+    """Run a workflow, importing the runner (and langgraph) only when a command needs it."""
+    from elf0.core.runner import run_workflow as _run_workflow
+
+    return _run_workflow(spec_path, prompt, session_id)
 
 # Application state for --verbose flag
 class AppState:
@@ -96,25 +126,8 @@ def main_callback(
 
       elf0 agent workflow.yaml --prompt "Summarize" > result.txt 2> errors.log      # Output to result.txt, minimal logs to errors.log
     """
+    _configure_logging(verbose)
     app_state.verbose_mode = verbose
-    if app_state.verbose_mode:
-        # Enable INFO logging for elf.core and HTTP libraries
-        logging.getLogger("elf0.core").setLevel(logging.INFO)
-        # Removed NullHandler logic for elf.core
-
-        for lib_name in ["httpx", "httpcore"]:
-            lib_logger = logging.getLogger(lib_name)
-            # Removed NullHandler logic for http libs
-            lib_logger.setLevel(logging.INFO)
-    else:
-        # Default: Minimal logging (errors for elf.core, warnings for HTTP)
-        logging.getLogger("elf0.core").setLevel(logging.ERROR)
-        # Removed NullHandler logic for elf.core
-
-        for lib_name in ["httpx", "httpcore"]:
-            lib_logger = logging.getLogger(lib_name)
-            # Removed NullHandler logic for http libs
-            lib_logger.setLevel(logging.WARNING)
 
 def _conditional_secho(message: str, **kwargs: Any) -> None:
     """Helper to print to stderr.
@@ -137,6 +150,9 @@ def progress_spinner(message: str) -> Generator[None]:
         # In non-verbose mode, show spinner with clean terminal handoff
         import threading
 
+        from rich.live import Live
+        from rich.spinner import Spinner
+
         # Create spinner
         spinner = Spinner("dots", text=f"[dim]{message}[/dim]")
         live = Live(spinner, console=rich.console, refresh_per_second=10)
@@ -184,6 +200,21 @@ def prepare_workflow_input(prompt: str, context_content: str) -> str:
         return prompt
     return f"{context_content}\nUser prompt:\n{prompt}"
 
+def _dumps_result_json(result: object) -> str:
+    """Serialize a workflow result as indented JSON, using orjson when installed.
+
+    Raises:
+        TypeError: If the result cannot be serialized to JSON.
+    """
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.dumps(result, indent=2, ensure_ascii=False)
+    # orjson.JSONEncodeError is a TypeError subclass
+    return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
 def format_workflow_result(result: object) -> tuple[str, bool]:
     """Format workflow result for output.
 
@@ -195,7 +226,7 @@ def format_workflow_result(result: object) -> tuple[str, bool]:
     if isinstance(result, str):
         return result, False
     try:
-        return json.dumps(result, indent=4), True
+        return _dumps_result_json(result), True
     except TypeError as e:
         # This is an error, so it should always be shown on stderr
         typer.secho(f"Error: Could not serialize result to JSON: {e}", fg=typer.colors.RED)
@@ -290,6 +321,12 @@ def display_workflow_result(result: object) -> None:
     if isinstance(result, dict):
         output_content = result.get("output")
         if isinstance(output_content, str):
+            if not stdout_workflow_console.is_terminal:
+                # Piped or redirected: emit the raw text without parsing/rendering Markdown
+                stdout_workflow_console.out(output_content, highlight=False)
+                return
+            from rich.markdown import Markdown
+
             stdout_workflow_console.print(Markdown(output_content))
         else:
             # These warnings should go to stderr, only if verbose
@@ -324,7 +361,7 @@ def read_prompt_file(prompt_file: Path) -> str:
         raise typer.Exit(code=1)
 
     try:
-        content = prompt_file.read_text(encoding="utf-8")
+        content = read_text_file(prompt_file)
         return content if content is not None else ""
     except OSError as e:
         typer.secho(f"Error: Could not read prompt file '{prompt_file}': {e}", fg=typer.colors.RED)
@@ -362,6 +399,11 @@ def agent_command(
         typer.secho("Error: You must provide either --prompt or --prompt_file.", fg=typer.colors.RED)
         raise typer.Exit(code=1)
 
+    # Check the output destination before reading context or running the workflow,
+    # so an unusable --output fails immediately instead of discarding a finished run
+    if output_path:
+        validate_output_path(output_path)
+
     # Read prompt_file content if provided
     prompt_file_content = ""
     if prompt_file:
@@ -401,7 +443,6 @@ def agent_command(
             _conditional_secho(f"Warning: Workflow result is empty. Writing an empty file to '{output_path}'.", fg=typer.colors.YELLOW)
             content = ""
 
-        validate_output_path(output_path)
         save_workflow_result(output_path, content, is_json)
     else:
         display_workflow_result(result)
@@ -512,6 +553,31 @@ Output only the improved YAML specification."""
         typer.secho(f"Error saving improved YAML: {e}", fg=typer.colors.RED)
         raise typer.Exit(code=1) from e
 
+def _compile_in_background(spec_path: Path) -> Future:
+    """Load and compile a workflow on a daemon thread while the user types a prompt.
+
+    The compiled graph lands in the runner's cache, so the first run starts straight
+    away. Any error is left for that run to report.
+
+    Args:
+        spec_path: Path to the YAML spec file.
+
+    Returns:
+        A future that completes once the workflow is cached or has failed to load.
+    """
+    future: Future = Future()
+
+    def compile_workflow() -> None:
+        try:
+            from elf0.core.runner import load_compiled_workflow
+
+            future.set_result(load_compiled_workflow(spec_path))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=compile_workflow, name="elf0-compile", daemon=True).start()
+    return future
+
 def get_multiline_input() -> str:
     """Get multi-line input from user with support for pasting, arrow key navigation, and history.
 
@@ -544,6 +610,9 @@ def prompt_yaml_command(
     rich.console.print("[dim]Commands: '/exit', '/quit', '/bye' to quit | Enter twice or '/send' to send[/dim]")
     rich.console.print()
 
+    # Importing the LLM SDKs and compiling the graph overlaps with typing the first prompt
+    compiled_workflow = _compile_in_background(spec_path)
+
     try:
         while True:
             # Get multi-line user input
@@ -567,6 +636,8 @@ def prompt_yaml_command(
                 # Run the workflow with processed prompt
                 try:
                     with progress_spinner("Processing..."):
+                        # Wait for the background compile rather than compiling twice
+                        wait([compiled_workflow])
                         result = run_workflow(spec_path, final_prompt, session_id)
                 except UserExitRequested:
                     # User requested to exit during workflow, break the interactive loop
@@ -642,5 +713,105 @@ app.command("agent", help="Execute an agent workflow defined in YAML")(agent_com
 app.add_typer(improve_app)
 app.command("prompt", help="Start interactive conversation with a workflow agent (supports multi-line input)")(prompt_yaml_command)
 
-if __name__ == "__main__":
+# Options understood by the `elf0 agent` fast path, mapped to agent_command parameters
+AGENT_FAST_PATH_OPTIONS = {
+    "--prompt": "prompt",
+    "--prompt_file": "prompt_file",
+    "--session-id": "session_id",
+    "--context": "context_files",
+    "--output": "output_path",
+}
+
+def _is_writable_output_file(output_path: Path) -> bool:
+    """Check an --output path the way Typer's `dir_okay=False, writable=True` option does."""
+    if output_path.is_dir():
+        return False
+    if output_path.exists():
+        return os.access(output_path, os.W_OK)
+    return output_path.parent.is_dir() and os.access(output_path.parent, os.W_OK)
+
+def _parse_agent_args(args: list[str]) -> dict[str, Any] | None:
+    """Parse `agent` arguments in a single pass without building the Click command.
+
+    Args:
+        args: Command line arguments following `agent`
+
+    Returns:
+        Keyword arguments for agent_command, or None if Typer should handle the
+        arguments instead (help, unknown options, missing files, unusable --output).
+    """
+    values: dict[str, str] = {}
+    context_files: list[Path] = []
+    spec_path: Path | None = None
+
+    arg_iter = iter(args)
+    for arg in arg_iter:
+        if arg.startswith("-"):
+            option, has_value, value = arg.partition("=")
+            param = AGENT_FAST_PATH_OPTIONS.get(option)
+            if param is None:
+                return None
+            if not has_value:
+                value = next(arg_iter, None)
+                if value is None:
+                    return None
+            if param == "context_files":
+                context_files.append(Path(value))
+            else:
+                values[param] = value
+        elif spec_path is None:
+            spec_path = Path(arg)
+        else:
+            return None
+
+    # Let Typer report missing or invalid paths with its usual messages
+    if spec_path is None or not spec_path.is_file():
+        return None
+    prompt_file = Path(values["prompt_file"]) if "prompt_file" in values else None
+    if prompt_file is not None and not prompt_file.is_file():
+        return None
+    output_path = Path(values["output_path"]).resolve() if "output_path" in values else None
+    if output_path is not None and not _is_writable_output_file(output_path):
+        return None
+
+    return {
+        "spec_path": spec_path,
+        "prompt": values.get("prompt"),
+        "prompt_file": prompt_file,
+        "session_id": values.get("session_id", "session"),
+        "context_files": context_files or None,
+        "output_path": output_path,
+    }
+
+def main() -> None:
+    """Console entry point.
+
+    `elf0 agent` invocations are dispatched directly to agent_command; everything
+    else (including --help and invalid arguments) goes through the Typer app.
+    """
+    args = sys.argv[1:]
+    verbose = False
+    if args and args[0] in ("--verbose", "-v"):
+        verbose = True
+        args = args[1:]
+
+    if args and args[0] == "agent":
+        agent_kwargs = _parse_agent_args(args[1:])
+        if agent_kwargs is not None:
+            main_callback(verbose=verbose)
+            try:
+                agent_command(**agent_kwargs)
+            except typer.Exit as e:
+                sys.exit(e.exit_code)
+            # Interrupted runs end the way Typer's standalone mode ends them
+            except KeyboardInterrupt:
+                sys.exit(130)
+            except (EOFError, typer.Abort):
+                typer.echo("Aborted!", err=True)
+                sys.exit(1)
+            return
+
     app()
+
+if __name__ == "__main__":
+    main()
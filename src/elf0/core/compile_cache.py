@@ -0,0 +1,90 @@
+# src/elf0/core/compile_cache.py
+"""In-process cache of compiled workflow graphs keyed by spec file fingerprints."""
+
+from collections import OrderedDict
+import logging
+from pathlib import Path
+import threading
+from typing import Any
+
+from elf0.core.config import get_env_int
+from elf0.core.spec import Spec
+from elf0.utils.file_fingerprints import FileFingerprints
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of compiled workflows kept in memory, tunable for long-running hosts
+MAX_CACHED_WORKFLOWS = get_env_int("ELF0_MAX_CACHED_WORKFLOWS", 100)
+
+
+class CachedWorkflow:
+    """A compiled workflow graph together with the spec files it was built from."""
+
+    def __init__(self, spec: Spec, graph: Any, files: list[Path]):
+        self.spec = spec
+        self.graph = graph
+        self._fingerprints = FileFingerprints(files)
+
+    def is_fresh(self) -> bool:
+        """Check that none of the spec files have changed since compilation."""
+        return self._fingerprints.is_fresh()
+
+
+class CompiledWorkflowCache:
+    """LRU cache of compiled workflow graphs keyed by resolved spec path."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_WORKFLOWS):
+        self._entries: OrderedDict[Path, CachedWorkflow] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, spec_path: Path) -> CachedWorkflow | None:
+        """Return the cached workflow for a spec path if it is still fresh.
+
+        Args:
+            spec_path: Path to the root YAML spec file.
+
+        Returns:
+            The cached workflow, or None if it is missing or stale.
+        """
+        key = spec_path.resolve()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            if not cached.is_fresh():
+                logger.info(f"[dim]Spec changed, recompiling: {spec_path}[/dim]")
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return cached
+
+    def put(self, spec_path: Path, spec: Spec, graph: Any, files: list[Path]) -> CachedWorkflow:
+        """Store a compiled workflow, evicting the least recently used entry if full.
+
+        Args:
+            spec_path: Path to the root YAML spec file.
+            spec: The loaded spec the graph was compiled from.
+            graph: The compiled LangGraph graph.
+            files: Every spec file read while loading, including references.
+
+        Returns:
+            The cached workflow entry.
+        """
+        cached = CachedWorkflow(spec, graph, files)
+        key = spec_path.resolve()
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def clear(self) -> None:
+        """Remove all cached workflows."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance
+compiled_workflow_cache = CompiledWorkflowCache()
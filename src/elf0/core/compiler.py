@@ -1,29 +1,101 @@
 # src/elf0/core/compiler.py
 import asyncio
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Mapping
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import itertools
 import json
 import logging
-from typing import Any, Protocol, TypedDict
+import operator
+import re
+import string
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Annotated, Any, ClassVar, Protocol, TypedDict
+import weakref
 
-from langgraph.graph import END, StateGraph
 from pydantic import BaseModel, Field
 
 from .config import create_llm_config
 from .exceptions import UserExitRequested, WorkflowValidationError
 from .function_loader import function_loader
 from .llm_client import LLMClient
+from .spec import LLM as LLMSpecModel
 from .spec import Edge, Spec, WorkflowNode
 
-# Configure logging (This section will be removed)
+# langgraph is imported inside the graph-building functions so that importing
+# this module (e.g. for WorkflowState) does not pay its import cost
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+
+# Use uvloop for the event loops that run async nodes when it is installed
+try:
+    import uvloop
+
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+# Tool result cache keys are serialized with orjson when it is installed (the `orjson`
+# extra); its JSONEncodeError is a TypeError, so both variants fail the same way
+try:
+    import orjson
+
+    _CANONICAL_JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def _canonical_json(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes with sorted keys."""
+        return orjson.dumps(obj, default=str, option=_CANONICAL_JSON_OPTIONS)
+except ImportError:
+    def _canonical_json(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes with sorted keys."""
+        return json.dumps(obj, sort_keys=True, default=str).encode()
+
+# Runs node coroutines on their own event loop when the calling thread already has a
+# running loop; shared so nodes don't start a new thread or pool for every call
+_coroutine_runner_pool = ThreadPoolExecutor(thread_name_prefix="elf0-node-loop")
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+    """Run a node coroutine to completion from synchronous node code.
+
+    Without a running event loop the coroutine runs in the calling thread. Otherwise it
+    gets its own loop on a shared worker thread, so the running loop isn't blocked.
+
+    Args:
+        coro: The coroutine to run.
+        timeout: Seconds to wait for the worker thread, when one is needed.
+
+    Returns:
+        The coroutine's result.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro, loop_factory=_new_event_loop)
+    return _coroutine_runner_pool.submit(asyncio.run, coro, loop_factory=_new_event_loop).result(timeout=timeout)
+
+
 # Default max iterations if not specified in the spec's workflow
 DEFAULT_MAX_ITERATIONS = 7
 
+# Python tool node config key that sets the size of the node's result cache. Only
+# safe for functions whose result depends on nothing but their bound parameters.
+RESULT_CACHE_SIZE_CONFIG = "result_cache_size"
+
 
 class SafeNamespace:
     """A namespace that returns empty string for missing attributes instead of raising AttributeError."""
 
+    # One namespace is built per templated prompt, so instances skip the __dict__
+    __slots__ = ("_data", "_json_namespace")
+
     def __init__(self, data: dict[str, Any]):
-        self._data = {k: v for k, v in data.items() if isinstance(k, str)}
+        # Templates only read from the state, so it is wrapped rather than copied
+        self._data = data
+        self._json_namespace: SafeNamespace | None = None
 
     def __getattr__(self, name: str) -> Any:
         # First check regular state fields
@@ -33,14 +105,15 @@ class SafeNamespace:
         dynamic_state = self._data.get("dynamic_state", {})
         if dynamic_state and isinstance(dynamic_state, dict) and name in dynamic_state:
             return dynamic_state[name]
-        # Special handling for 'json' - parse JSON from output_key fields
+        # Special handling for 'json' - parse JSON from output_key fields once per namespace
         if name == "json":
-            return self._create_json_namespace()
+            if self._json_namespace is None:
+                self._json_namespace = self._create_json_namespace()
+            return self._json_namespace
         return ""
 
     def _create_json_namespace(self) -> "SafeNamespace":
         """Create a namespace that parses JSON from dynamic_state fields."""
-        import json
         json_data = {}
         dynamic_state = self._data.get("dynamic_state", {})
         if dynamic_state and isinstance(dynamic_state, dict):
@@ -93,7 +166,14 @@ class SafeNamespace:
 logger = logging.getLogger(__name__) # This will be 'elf.core.compiler'
 
 class WorkflowState(TypedDict):
-    """Represents the shared state of the workflow, passed between and modified by nodes."""
+    """Represents the shared state of the workflow, passed between and modified by nodes.
+
+    This is deliberately a TypedDict (a plain dict at runtime) rather than a slotted
+    dataclass: LangGraph merges node results as dict updates, and user Python
+    functions and MCP/Claude Code nodes receive the state as a dict and call
+    `state.get(...)` on it. Nodes keep copies cheap by returning only the keys they
+    change, or a single `dict.copy()` where the full state is returned.
+    """
     input: str
     output: str | None
     iteration_count: int | None
@@ -118,6 +198,58 @@ class WorkflowState(TypedDict):
     # Dynamic fields for output_key support - stores custom node outputs
     dynamic_state: dict[str, Any] | None
 
+def _latest(current: Any, update: Any) -> Any:
+    """State reducer that keeps the most recent write to a key.
+
+    Unlike LangGraph's default channel it accepts several writes in one step, so
+    nodes fanned out from the same source run in parallel instead of failing
+    because each returns the keys it left unchanged. When parallel nodes write
+    the same key, the last node to be scheduled wins.
+    """
+    return update
+
+def _merge_dicts(current: dict[str, Any] | None, update: dict[str, Any] | None) -> dict[str, Any] | None:
+    """State reducer that merges dict writes key by key.
+
+    Parallel branches that each store a named result all keep it, where `_latest`
+    would keep only the dict written by the last branch.
+    """
+    if update is None:
+        return current
+    if current is None:
+        return update
+    return {**current, **update}
+
+# State schema of every compiled graph, matching the `WorkflowState` TypedDict. Every
+# key uses the _latest reducer so parallel branches can write to the state in the same
+# step. It is defined once so all graphs share one Pydantic schema and validator
+# instead of building a new model class per compile.
+class WorkflowStateSchema(BaseModel):
+    """Schema for workflow state."""
+    input: Annotated[str, _latest]
+    output: Annotated[str | None, _latest] = None
+    iteration_count: Annotated[int | None, _latest] = Field(default=0)
+    evaluation_score: Annotated[float | None, _latest] = None
+    # Enhanced workflow metadata for better tracking
+    workflow_id: Annotated[str | None, _latest] = None
+    current_node: Annotated[str | None, _latest] = None
+    error_context: Annotated[str | None, _latest] = None
+    # User interaction fields
+    user_exit_requested: Annotated[bool | None, _latest] = None  # Flag when user requests to exit
+    # Structured output validation fields
+    structured_output: Annotated[dict[str, Any] | None, _latest] = None
+    validation_status: Annotated[str | None, _latest] = None  # 'valid', 'invalid', 'error', or None
+    validation_error: Annotated[str | None, _latest] = None
+    # Format processing fields
+    structured_data: Annotated[dict[str, Any] | None, _latest] = None
+    raw_json: Annotated[str | None, _latest] = None
+    format_status: Annotated[str | None, _latest] = None  # 'converted', 'error', or None
+    format_error: Annotated[str | None, _latest] = None
+    # Claude Code integration fields
+    claude_code_result: Annotated[dict[str, Any] | None, _latest] = None
+    # Dynamic fields for output_key support
+    dynamic_state: Annotated[dict[str, Any] | None, _merge_dicts] = None
+
 class NodeFunction(Protocol):
     """Protocol defining the interface for node functions."""
     def __call__(self, state: WorkflowState) -> WorkflowState: ...
@@ -126,6 +258,96 @@ class NodeFactory(Protocol):
     """Protocol defining the interface for node factory functions."""
     def __call__(self, spec: Spec, node: WorkflowNode) -> NodeFunction: ...
 
+# LLM clients shared by every node (agent or judge) whose resolved LLM configuration
+# is identical, so provider SDK clients and their HTTP connection pools are reused.
+# Entries are weak: a client lives as long as a compiled graph's nodes use it, so
+# graphs evicted from the compiled workflow cache do not keep their clients (and
+# response caches) alive.
+_llm_client_cache: weakref.WeakValueDictionary[tuple[Any, ...], LLMClient] = weakref.WeakValueDictionary()
+_llm_client_cache_lock = threading.Lock()
+
+# A quoted template variable such as {"key"}, left in a prompt by malformed LLM output
+_MALFORMED_TEMPLATE_VARIABLE_PATTERN = re.compile(r'\{["\'][^"\']*["\']\}')
+
+# Where a template field name such as {state.output} or {items[0]} leaves its base name
+_FIELD_NAME_END_PATTERN = re.compile(r"[.\[]")
+
+# A JSON object without nested braces, used to pull JSON out of wrapped LLM responses
+_FLAT_JSON_OBJECT_PATTERN = re.compile(r"\{[^{}]*\}")
+
+
+def _llm_client_key(llm_spec: LLMSpecModel) -> tuple[Any, ...]:
+    """Build a hashable cache key from a resolved LLM specification."""
+    return (
+        llm_spec.type,
+        llm_spec.model_name,
+        llm_spec.temperature,
+        llm_spec.api_key,
+        tuple(sorted(llm_spec.params.items())),
+    )
+
+
+# State-derived values available to LLM prompt templates besides {input}
+_PROMPT_TEMPLATE_VALUES: dict[str, Callable[[WorkflowState], Any]] = {
+    "output": lambda state: state.get("output", ""),
+    "iteration_count": lambda state: state.get("iteration_count", 0),
+    "evaluation_score": lambda state: state.get("evaluation_score", 0.0),
+    # Allow attribute-style access such as {state.output} with safe fallback
+    "state": SafeNamespace,
+}
+
+
+def _prompt_template_values(template: str) -> tuple[tuple[str, Callable[[WorkflowState], Any]], ...]:
+    """Select the state-derived template values a prompt template actually references.
+
+    The template is parsed once so that each call only computes the values it
+    uses (e.g. the `SafeNamespace` wrapper of the state is skipped unless the prompt
+    refers to `{state...}`). If the template cannot be analysed, every value is kept.
+    """
+    try:
+        fields = list(string.Formatter().parse(template))
+    except ValueError:
+        return tuple(_PROMPT_TEMPLATE_VALUES.items())
+    if any(format_spec and "{" in format_spec for _, _, format_spec, _ in fields):
+        # Nested replacement fields in a format spec are not listed by parse()
+        return tuple(_PROMPT_TEMPLATE_VALUES.items())
+    names = {_FIELD_NAME_END_PATTERN.split(field_name, maxsplit=1)[0] for _, field_name, _, _ in fields if field_name}
+    return tuple((name, value) for name, value in _PROMPT_TEMPLATE_VALUES.items() if name in names)
+
+
+def _compile_prompt_template(template: str) -> Callable[[dict[str, Any]], str]:
+    """Parse a prompt template once into a renderer for its per-call values.
+
+    Templates whose replacement fields are all plain names such as `{input}` are
+    split into literal text and field names here, so each call only joins the
+    pieces instead of re-parsing the template. Templates using attribute or index
+    access, conversions or format specs are rendered with `str.format_map`. Either
+    way a name missing from the values raises KeyError, as `str.format` does.
+    """
+    try:
+        fields = list(string.Formatter().parse(template))
+    except ValueError:
+        # Let the malformed template raise when it is rendered, as before
+        return template.format_map
+    if not all(
+        field_name is None or (field_name.isidentifier() and not format_spec and not conversion)
+        for _, field_name, format_spec, conversion in fields
+    ):
+        return template.format_map
+    pieces = tuple((literal, field_name) for literal, field_name, _, _ in fields)
+
+    def render(values: dict[str, Any]) -> str:
+        parts = []
+        for literal, name in pieces:
+            parts.append(literal)
+            if name is not None:
+                value = values[name]
+                parts.append(value if value.__class__ is str else format(value))
+        return "".join(parts)
+
+    return render
+
+
 def _create_llm_client(spec: Spec, node: WorkflowNode) -> LLMClient:
     """Creates and configures an `LLMClient` instance based on LLM specifications.
 
@@ -138,6 +360,9 @@ def _create_llm_client(spec: Spec, node: WorkflowNode) -> LLMClient:
         spec: The full workflow specification, containing LLM definitions in `spec.llms`.
         node: The `WorkflowNode` that references the LLM to be configured.
 
+    Clients are cached by their resolved configuration, so nodes that reference
+    the same LLM share a single `LLMClient`.
+
     Returns:
         A fully configured `LLMClient` instance.
 
@@ -145,12 +370,11 @@ def _create_llm_client(spec: Spec, node: WorkflowNode) -> LLMClient:
         ValueError: If the LLM reference in `node.ref` is not found in `spec.llms`,
                     or if the LLM configuration is missing the required 'type' attribute.
     """
-    if node.ref not in spec.llms:
+    llm_pydantic_model_instance = spec.llms.get(node.ref)
+    if llm_pydantic_model_instance is None:
         msg = f"LLM reference '{node.ref}' in node '{node.id}' not found in spec.llms"
         raise ValueError(msg)
 
-    llm_pydantic_model_instance = spec.llms[node.ref]
-
     # Safely get the type attribute
     llm_instance_type = getattr(llm_pydantic_model_instance, "type", None)
     if not llm_instance_type:
@@ -163,25 +387,35 @@ def _create_llm_client(spec: Spec, node: WorkflowNode) -> LLMClient:
             msg
         )
 
-    # Use create_llm_config to get a config object that includes the resolved API key
-    populated_config_obj = create_llm_config(
-        config=llm_pydantic_model_instance.model_dump(),
-        llm_type=llm_instance_type
-    )
+    # Use create_llm_config to get a config object that includes the resolved API key.
+    # create_llm_config keeps an api_key that is already set, so once the key has been
+    # resolved (e.g. by an earlier node with the same ref) the round-trip is skipped.
+    if not llm_pydantic_model_instance.api_key:
+        populated_config_obj = create_llm_config(
+            config=llm_pydantic_model_instance.model_dump(),
+            llm_type=llm_instance_type
+        )
 
-    # Update the original Pydantic model instance with the resolved API key
-    llm_pydantic_model_instance.api_key = populated_config_obj.api_key
+        # Update the original Pydantic model instance with the resolved API key
+        llm_pydantic_model_instance.api_key = populated_config_obj.api_key
 
-    # Return configured LLMClient
-    return LLMClient(llm_pydantic_model_instance)
+    # Return configured LLMClient, reusing one built for an identical configuration
+    client_key = _llm_client_key(llm_pydantic_model_instance)
+    with _llm_client_cache_lock:
+        llm_client = _llm_client_cache.get(client_key)
+        if llm_client is None:
+            llm_client = LLMClient(llm_pydantic_model_instance)
+            _llm_client_cache[client_key] = llm_client
+    return llm_client
 
 def make_llm_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
     """Creates a node function that uses an LLM to process input and generate output.
 
     The returned node function takes a `WorkflowState`, uses an LLM (configured via `spec`
     and `node.ref`) to process `state['input']` (after formatting it with `node.config.prompt`
-    if available), and returns an updated `WorkflowState` with the LLM's response
-    in `state['output']`. It also handles iteration counting and error handling.
+    if available), and returns the state updates with the LLM's response in `output`;
+    LangGraph merges them into the `WorkflowState`. It also handles iteration
+    counting and error handling.
 
     Args:
         spec: The full workflow specification.
@@ -192,6 +426,7 @@ def make_llm_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         A node function that processes state using the LLM.
     """
     llm_client = _create_llm_client(spec, node)
+    generate = llm_client.generate
 
     prompt_template_str: str | None = None
     # node.config is now a field in WorkflowNode, defaulting to an empty dict if not in YAML.
@@ -200,24 +435,21 @@ def make_llm_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         prompt_template_str = potential_prompt
     elif potential_prompt is not None: # 'prompt' key exists in config but its value is not a string
         logger.warning(f"[yellow]⚠ [Node: {node.id}] Invalid prompt type - ignored[/yellow]")
+    template_values = _prompt_template_values(prompt_template_str) if prompt_template_str else ()
+    render_prompt = _compile_prompt_template(prompt_template_str) if prompt_template_str else None
 
     def _prepare_prompt_template(state: WorkflowState, prompt_template_str: str, user_provided_input: str) -> str:
         """Prepare the final prompt to send to LLM."""
         if not prompt_template_str:
             return user_provided_input if user_provided_input else ""
 
-        # Support multiple state fields in template
-        template_kwargs = {
-            "input": user_provided_input,
-            "output": state.get("output", ""),
-            "iteration_count": state.get("iteration_count", 0),
-            "evaluation_score": state.get("evaluation_score", 0.0),
-            # Allow attribute-style access such as {state.output} with safe fallback
-            "state": SafeNamespace(state),
-        }
+        # Support multiple state fields in template; only the referenced ones are computed
+        template_kwargs = {"input": user_provided_input}
+        for name, value in template_values:
+            template_kwargs[name] = value(state)
 
         try:
-            return prompt_template_str.format(**template_kwargs)
+            return render_prompt(template_kwargs)
         except KeyError as e:
             logger.warning(f"[yellow]⚠ [Node: {node.id}] Template variable {e} not found in state, using partial formatting[/yellow]")
             return _handle_template_error(prompt_template_str, user_provided_input, str(e).strip("'\""))
@@ -227,11 +459,8 @@ def make_llm_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         # If the error key looks like a malformed JSON key, try to clean the prompt
         if error_key.startswith('"') and error_key.endswith('"'):
             # This is likely a malformed LLM output - remove the problematic template
-            cleaned_prompt = prompt_template_str
             # Remove the malformed template variable
-            import re
-            malformed_pattern = r'\{["\'][^"\']*["\']\}'
-            cleaned_prompt = re.sub(malformed_pattern, "[MALFORMED_OUTPUT]", cleaned_prompt)
+            cleaned_prompt = _MALFORMED_TEMPLATE_VARIABLE_PATTERN.sub("[MALFORMED_OUTPUT]", prompt_template_str)
             logger.warning(f"[yellow]⚠ [Node: {node.id}] Detected malformed template variable, cleaned prompt[/yellow]")
             return cleaned_prompt
         # Fall back to just input formatting for compatibility
@@ -262,8 +491,7 @@ def make_llm_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
             return '{"error": "Malformed LLM output - expected JSON object"}'
         if not cleaned.startswith("{"):
             # Try to extract JSON from response if it's wrapped in text
-            import re
-            json_match = re.search(r"\{[^{}]*\}", cleaned)
+            json_match = _FLAT_JSON_OBJECT_PATTERN.search(cleaned)
             if json_match:
                 return json_match.group(0)
             # If no JSON found and response looks like it should be JSON, return error
@@ -273,7 +501,7 @@ def make_llm_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
 
         return response
 
-    def _handle_structured_output(response: str, output_format: str, state: WorkflowState) -> WorkflowState:
+    def _handle_structured_output(response: str, output_format: str) -> dict[str, Any] | None:
         """Handle structured output processing."""
         logger.info(f"[blue][Node: {node.id}] Processing {output_format} format[/blue]")
         try:
@@ -283,122 +511,127 @@ def make_llm_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
                 yaml_output = spec_instance.to_yaml_string()
 
                 logger.info(f"[green]✓ [Node: {node.id}] JSON validation passed[/green]")
-                return WorkflowState({
-                    **state,
+                return {
                     "output": yaml_output,  # Clean YAML output
                     "structured_data": spec_instance.model_dump(exclude_none=True),
                     "raw_json": response,
                     "format_status": "converted",
                     "current_node": node.id,
                     "error_context": None
-                })
+                }
             if output_format == "yaml":
                 # Handle YAML format (existing logic)
                 structured_output = Spec.create_structured_output(response)
 
                 if structured_output["validation"]["is_valid"]:
                     logger.info(f"[green]✓ [Node: {node.id}] YAML validation passed[/green]")
-                    return WorkflowState({
-                        **state,
+                    return {
                         "output": structured_output["yaml_content"],
                         "structured_output": structured_output,
                         "validation_status": "valid",
                         "current_node": node.id,
                         "error_context": None
-                    })
+                    }
                 error_msg = structured_output["validation"]["error"]
                 logger.error(f"[red]✗ [Node: {node.id}] YAML validation failed: {error_msg}[/red]")
-                return WorkflowState({
-                    **state,
+                return {
                     "output": response,
                     "structured_output": structured_output,
                     "validation_status": "invalid",
                     "validation_error": error_msg,
                     "current_node": node.id,
                     "error_context": f"YAML validation failed: {error_msg}"
-                })
+                }
             logger.warning(f"[yellow]⚠ [Node: {node.id}] Unknown format: {output_format}[/yellow]")
             return None  # Continue with normal processing
 
         except Exception as e:
-            logger.exception(f"[red]✗ [Node: {node.id}] Structured output error: {e!s}[/red]")
-            return WorkflowState({
-                **state,
+            error_text = str(e)
+            logger.exception(f"[red]✗ [Node: {node.id}] Structured output error: {error_text}[/red]")
+            return {
                 "output": response,
                 "format_status": "error",
-                "format_error": str(e),
+                "format_error": error_text,
                 "current_node": node.id,
-                "error_context": f"Structured output error: {e!s}"
-            })
+                "error_context": f"Structured output error: {error_text}"
+            }
+
+    # Per-node settings, read from the config once rather than on every call
+    output_key = node.config.get("output_key")
+    expects_json_output = bool(output_key) and "json" in str(node.config.get("prompt", "")).lower()
+    output_format = node.config.get("format")
+    counts_iterations = node.id == "breakdown_worker"
+
+    # Parts of the per-call log line that never change for this node
+    max_iter_display = getattr(spec.workflow, "max_iterations", None) or DEFAULT_MAX_ITERATIONS
+    llm_label = f"{llm_client.spec.type}:{llm_client.spec.model_name}"
 
     def node_fn(state: WorkflowState) -> WorkflowState:
+        # The run ends with UserExitRequested once the graph finishes, so skip the LLM call
+        if state.get("user_exit_requested"):
+            return {"current_node": node.id}
+
         try:
-            current_iter_display = (state.get("iteration_count") or 0) + 1
-            max_iter_display = getattr(spec.workflow, "max_iterations", None) or DEFAULT_MAX_ITERATIONS
-            iteration_str = f"Iteration {current_iter_display}/{max_iter_display}"
+            # Checked once per call; the INFO lines below slice and format per invocation
+            info_enabled = logger.isEnabledFor(logging.INFO)
 
             user_provided_input = state.get("input", "")
 
             # Prepare prompt using helper function
             final_prompt_to_llm = _prepare_prompt_template(state, prompt_template_str, user_provided_input)
 
-            if not final_prompt_to_llm and not user_provided_input:
+            # A blank prompt cannot produce a useful answer, so it never reaches the LLM
+            if not final_prompt_to_llm.strip() and not user_provided_input.strip():
                 error_msg = f"Node {node.id} (type: {node.kind}) has no prompt template in config and no 'input' in state. Cannot proceed."
                 logger.error(f"[red]✗ [Node: {node.id}] {error_msg}[/red]")
-                return WorkflowState({
-                    **state,
+                return {
                     "output": f"ConfigurationError: {error_msg}",
                     "current_node": node.id,
                     "error_context": error_msg
-                })
+                }
 
-            logger.info(f"[blue][Node: {node.id}] LLM call ({iteration_str}) {llm_client.spec.type}:{llm_client.spec.model_name}[/blue]")
-            response = llm_client.generate(final_prompt_to_llm)
-            logger.info(f"[dim][Node: {node.id}] Response: {response[:50]}...[/dim]")
+            if info_enabled:
+                current_iter_display = (state.get("iteration_count") or 0) + 1
+                logger.info(f"[blue][Node: {node.id}] LLM call (Iteration {current_iter_display}/{max_iter_display}) {llm_label}[/blue]")
+            response = generate(final_prompt_to_llm)
+            if info_enabled:
+                logger.info(f"[dim][Node: {node.id}] Response: {response[:50]}...[/dim]")
 
             # Clean and validate response for nodes that expect JSON
-            output_key = node.config.get("output_key")
-            if output_key and "json" in str(node.config.get("prompt", "")).lower():
+            if expects_json_output:
                 response = _clean_json_response(response)
 
             # Check if this node has a structured output format
-            output_format = node.config.get("format")
             if output_format:
-                structured_result = _handle_structured_output(response, output_format, state)
+                structured_result = _handle_structured_output(response, output_format)
                 if structured_result is not None:
                     return structured_result
 
-            if node.id == "breakdown_worker":
+            if counts_iterations:
                 current_iteration_for_node = state.get("iteration_count") or 0
-                return WorkflowState({
-                    **state,
+                return {
                     "output": response,
                     "iteration_count": current_iteration_for_node + 1,
                     "current_node": node.id,
                     "error_context": None
-                })
+                }
 
             # Handle output_key for custom state field assignment
-            result_state = {
-                **state,  # Preserve all existing state
+            state_updates: dict[str, Any] = {
                 "output": response,
                 "current_node": node.id,
                 "error_context": None
             }
 
-            # If node has output_key, store response in dynamic_state
-            output_key = node.config.get("output_key")
+            # If node has output_key, store response in a copy of dynamic_state
             if output_key and isinstance(output_key, str):
-                if "dynamic_state" not in result_state or result_state["dynamic_state"] is None:
-                    result_state["dynamic_state"] = {}
-                result_state["dynamic_state"][output_key] = response
+                state_updates["dynamic_state"] = {**(state.get("dynamic_state") or {}), output_key: response}
 
-            return WorkflowState(result_state)
+            return state_updates
         except Exception as e:
             logger.exception(f"[red]✗ [Node: {node.id}] LLM error: {e!s}[/red]")
-            # Preserve original state from before this node's execution on error
+            # Keys not returned keep their values from before this node's execution
             return {
-                **state,
                 "output": f"Error: {e!s}",
                 "current_node": node.id,
                 "error_context": f"LLM error in node {node.id}: {type(e).__name__}"
@@ -410,9 +643,11 @@ def load_tool(fn: Any) -> NodeFunction:
 
     The wrapped tool is expected to operate on or use the `WorkflowState`.
     The returned node function takes the current `WorkflowState`, calls the tool,
-    and integrates its result back into the `WorkflowState`.
+    and returns only the state keys it produced, which LangGraph then writes into
+    the state; the other keys keep their values. Parallel branches therefore never
+    overwrite each other's results with the stale values of a full state copy.
     - If the tool returns a string, it becomes `state['output']`.
-    - If the tool returns a dictionary, it's merged into the state.
+    - If the tool returns a dictionary, it is used as the state update.
     - Other return types are converted to string and set as `state['output']`.
     Error handling is included.
 
@@ -422,16 +657,16 @@ def load_tool(fn: Any) -> NodeFunction:
     Returns:
         A node function compatible with StateGraph that executes the tool.
     """
+    # The log line only depends on the tool, so it is formatted once
+    executing_msg = f"[blue]Executing tool: {getattr(fn, '__name__', 'unknown')}[/blue]"
+
     def node_fn(state: WorkflowState) -> WorkflowState:
         try:
             if fn is None:
                 logger.warning("[yellow]⚠ Tool function is None - returning input as output[/yellow]")
-                return {
-                    **state,
-                    "output": state.get("input", "")
-                }
+                return {"output": state.get("input", "")}
 
-            logger.info(f"[blue]Executing tool: {getattr(fn, '__name__', 'unknown')}[/blue]")
+            logger.info(executing_msg)
 
             # Execute the tool function with the current state
             if callable(fn):
@@ -439,33 +674,18 @@ def load_tool(fn: Any) -> NodeFunction:
 
                 # If the tool returns a string, use it as output
                 if isinstance(result, str):
-                    return {
-                        **state,
-                        "output": result
-                    }
-                # If the tool returns a dict, merge it with state
+                    return {"output": result}
+                # If the tool returns a dict, it is the state update
                 if isinstance(result, dict):
-                    return {
-                        **state,
-                        **result
-                    }
+                    return result
                 # Otherwise convert to string
-                return {
-                    **state,
-                    "output": str(result)
-                }
+                return {"output": str(result)}
             logger.warning("[yellow]⚠ Tool function is not callable[/yellow]")
-            return {
-                **state,
-                "output": f"Tool function {fn} is not callable"
-            }
+            return {"output": f"Tool function {fn} is not callable"}
 
         except Exception as e:
             logger.exception(f"[red]✗ Tool execution error: {e!s}[/red]")
-            return {
-                **state,
-                "output": f"Tool error: {e!s}"
-            }
+            return {"output": f"Tool error: {e!s}"}
     return node_fn
 
 def make_mcp_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
@@ -487,72 +707,63 @@ def make_mcp_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
     # Create MCP node instance
     mcp_node = MCPNode(node.config)
 
+    # Per-call log lines only depend on the node, so they are formatted once
+    executing_msg = f"[blue][Node: {node.id}] Executing MCP tool: {mcp_node.tool_name}[/blue]"
+    completed_msg = f"[green]✓ [Node: {node.id}] MCP tool completed[/green]"
+
     def node_fn(state: WorkflowState) -> WorkflowState:
         try:
-            logger.info(f"[blue][Node: {node.id}] Executing MCP tool: {mcp_node.tool_name}[/blue]")
+            logger.info(executing_msg)
 
             # Convert state to regular dict for MCP node
             state_dict = dict(state)
 
             # Execute MCP tool
             try:
-                # Handle async execution
-                try:
-                    loop = asyncio.get_running_loop()
-                    # If we're already in an event loop, we need to handle this differently
-                    result_state = asyncio.run_coroutine_threadsafe(
-                        mcp_node.execute(state_dict),
-                        loop
-                    ).result(timeout=30.0)
-                except RuntimeError:
-                    # No event loop running, create one
-                    result_state = asyncio.run(mcp_node.execute(state_dict))
-
-                logger.info(f"[green]✓ [Node: {node.id}] MCP tool completed[/green]")
+                result_state = _run_coroutine(mcp_node.execute(state_dict), timeout=30.0)
+
+                logger.info(completed_msg)
 
                 # Use the output field from the result state if available, otherwise fallback to mcp_result
                 output = result_state.get("output", result_state.get("mcp_result", ""))
 
-                return WorkflowState({
-                    **state,
+                return {
                     "output": output,
                     "current_node": node.id,
                     "error_context": None
-                })
+                }
 
             except MCPConnectionError as e:
-                logger.exception(f"[red]✗ [Node: {node.id}] MCP connection error: {e!s}[/red]")
-                return WorkflowState({
-                    **state,
-                    "output": f"MCP Connection Error: {e!s}",
+                error_text = str(e)
+                logger.exception(f"[red]✗ [Node: {node.id}] MCP connection error: {error_text}[/red]")
+                return {
+                    "output": f"MCP Connection Error: {error_text}",
                     "current_node": node.id,
-                    "error_context": f"MCP connection error: {e!s}"
-                })
+                    "error_context": f"MCP connection error: {error_text}"
+                }
             except MCPToolError as e:
-                logger.exception(f"[red]✗ [Node: {node.id}] MCP tool error: {e!s}[/red]")
-                return WorkflowState({
-                    **state,
-                    "output": f"MCP Tool Error: {e!s}",
+                error_text = str(e)
+                logger.exception(f"[red]✗ [Node: {node.id}] MCP tool error: {error_text}[/red]")
+                return {
+                    "output": f"MCP Tool Error: {error_text}",
                     "current_node": node.id,
-                    "error_context": f"MCP tool error: {e!s}"
-                })
+                    "error_context": f"MCP tool error: {error_text}"
+                }
             except TimeoutError:
                 logger.exception(f"[red]✗ [Node: {node.id}] MCP tool timed out[/red]")
-                return WorkflowState({
-                    **state,
+                return {
                     "output": "MCP Tool Error: Tool execution timed out",
                     "current_node": node.id,
                     "error_context": "MCP tool timeout"
-                })
+                }
 
         except Exception as e:
             logger.exception(f"[red]✗ [Node: {node.id}] Unexpected MCP error: {e!s}[/red]")
-            return WorkflowState({
-                **state,
+            return {
                 "output": f"Unexpected error: {e!s}",
                 "current_node": node.id,
                 "error_context": f"Unexpected MCP error: {type(e).__name__}"
-            })
+            }
 
     return node_fn
 
@@ -587,88 +798,72 @@ def make_claude_code_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         def error_node_fn(state: WorkflowState) -> WorkflowState:
             error_msg = f"Claude Code node configuration error: {error_message}"
             logger.exception(f"[red]✗ [Node: {node_id}] {error_msg}[/red]")
-            return WorkflowState({
-                **state,
+            return {
                 "output": error_msg,
                 "current_node": node_id,
                 "error_context": error_msg
-            })
+            }
         return error_node_fn
 
+    # Per-call log lines only depend on the node, so they are formatted once
+    executing_msg = f"[blue][Node: {node.id}] Executing Claude Code task: {claude_code_node.task}[/blue]"
+    completed_msg = f"[green]✓ [Node: {node.id}] Claude Code task completed[/green]"
+
     def node_fn(state: WorkflowState) -> WorkflowState:
         try:
-            logger.info(f"[blue][Node: {node.id}] Executing Claude Code task: {claude_code_node.task}[/blue]")
+            logger.info(executing_msg)
 
             # Convert state to regular dict for Claude Code node
             state_dict = dict(state)
 
             # Execute Claude Code task
             try:
-                # Handle async execution with proper event loop management
-                import concurrent.futures
-
-                def run_claude_code():
-                    """Run Claude Code in a new event loop in a separate thread."""
-                    # Create a new event loop for this thread
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        return loop.run_until_complete(claude_code_node.execute(state_dict))
-                    finally:
-                        loop.close()
-                        asyncio.set_event_loop(None)
+                # Longer timeout for code operations
+                result_state = _run_coroutine(asyncio.wait_for(claude_code_node.execute(state_dict), timeout=120.0))
 
-                # Always run in a separate thread to avoid event loop conflicts
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(run_claude_code)
-                    result_state = future.result(timeout=120.0)  # Longer timeout for code operations
-
-                logger.info(f"[green]✓ [Node: {node.id}] Claude Code task completed[/green]")
+                logger.info(completed_msg)
 
                 # Use the output field from the result state
                 output = result_state.get("output", "")
 
-                return WorkflowState({
-                    **state,
+                return {
                     "output": output,
                     "claude_code_result": result_state.get("claude_code_result"),
                     "current_node": node.id,
                     "error_context": None
-                })
+                }
 
             except ClaudeCodeConnectionError as e:
-                logger.exception(f"[red]✗ [Node: {node.id}] Claude Code connection error: {e!s}[/red]")
-                return WorkflowState({
-                    **state,
-                    "output": f"Claude Code Connection Error: {e!s}",
+                error_text = str(e)
+                logger.exception(f"[red]✗ [Node: {node.id}] Claude Code connection error: {error_text}[/red]")
+                return {
+                    "output": f"Claude Code Connection Error: {error_text}",
                     "current_node": node.id,
-                    "error_context": f"Claude Code connection error: {e!s}"
-                })
+                    "error_context": f"Claude Code connection error: {error_text}"
+                }
             except ClaudeCodeExecutionError as e:
-                logger.exception(f"[red]✗ [Node: {node.id}] Claude Code execution error: {e!s}[/red]")
-                return WorkflowState({
-                    **state,
-                    "output": f"Claude Code Execution Error: {e!s}",
+                error_text = str(e)
+                logger.exception(f"[red]✗ [Node: {node.id}] Claude Code execution error: {error_text}[/red]")
+                return {
+                    "output": f"Claude Code Execution Error: {error_text}",
                     "current_node": node.id,
-                    "error_context": f"Claude Code execution error: {e!s}"
-                })
+                    "error_context": f"Claude Code execution error: {error_text}"
+                }
             except TimeoutError:
                 logger.exception(f"[red]✗ [Node: {node.id}] Claude Code task timed out[/red]")
-                return WorkflowState({
-                    **state,
+                return {
                     "output": "Claude Code Error: Task execution timed out",
                     "current_node": node.id,
                     "error_context": "Claude Code task timeout"
-                })
+                }
 
         except Exception as e:
             logger.exception(f"[red]✗ [Node: {node.id}] Unexpected Claude Code error: {e!s}[/red]")
-            return WorkflowState({
-                **state,
+            return {
                 "output": f"Unexpected Claude Code error: {e!s}",
                 "current_node": node.id,
                 "error_context": f"Unexpected Claude Code error: {type(e).__name__}"
-            })
+            }
 
     return node_fn
 
@@ -689,9 +884,18 @@ def make_judge_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         A node function that performs the judgment and updates the `WorkflowState`.
     """
     judge_llm_client = _create_llm_client(spec, node)
+    # Parts of the per-call log line that never change for this node
+    max_iter_display = getattr(spec.workflow, "max_iterations", None) or DEFAULT_MAX_ITERATIONS
+    judge_llm_label = f"{judge_llm_client.spec.type}:{judge_llm_client.spec.model_name}"
 
     def node_fn(state: WorkflowState) -> WorkflowState:
+        # Nothing left to judge once the user has asked to exit
+        if state.get("user_exit_requested"):
+            return {"current_node": node.id}
+
         try:
+            info_enabled = logger.isEnabledFor(logging.INFO)
+
             # Determine input for the judge
             input_to_judge = state.get("output")
             if input_to_judge is None:
@@ -702,29 +906,23 @@ def make_judge_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
             # iteration_count in state is completed iterations. Current is +1.
             # The judge node itself will increment iteration_count for the *next* state.
             # So for *this* run, current_iter_display is based on the incoming state.
-            current_iter_display = (state.get("iteration_count") or 0) + 1
-            max_iter_display = getattr(spec.workflow, "max_iterations", None) or DEFAULT_MAX_ITERATIONS
-            iteration_str = f"Iteration {current_iter_display}/{max_iter_display}"
-
-            logger.info(f"[blue][Node: {node.id}] Judge evaluation ({iteration_str}) {judge_llm_client.spec.type}:{judge_llm_client.spec.model_name}[/blue]")
+            if info_enabled:
+                current_iter_display = (state.get("iteration_count") or 0) + 1
+                logger.info(f"[blue][Node: {node.id}] Judge evaluation (Iteration {current_iter_display}/{max_iter_display}) {judge_llm_label}[/blue]")
 
             judgment_prompt = str(input_to_judge)
             raw_llm_output = judge_llm_client.generate(judgment_prompt)
-            logger.info(f"[dim][Node: {node.id}] Judge output: {raw_llm_output[:50]}...[/dim]") # Show a bit more for JSON
+            if info_enabled:
+                logger.info(f"[dim][Node: {node.id}] Judge output: {raw_llm_output[:50]}...[/dim]") # Show a bit more for JSON
 
             parsed_score_value: float | None = None
 
             try:
-                # Clean the string: remove markdown fences and trim whitespace
+                # Clean the string: remove a ```json or ``` fence and trim whitespace
                 cleaned_json_str = raw_llm_output.strip()
-                if cleaned_json_str.startswith("```json"):
-                    cleaned_json_str = cleaned_json_str[len("```json"):]
-                elif cleaned_json_str.startswith("```"):
-                     cleaned_json_str = cleaned_json_str[len("```"):]
-
-                if cleaned_json_str.endswith("```"):
-                    cleaned_json_str = cleaned_json_str[:-len("```")]
-                cleaned_json_str = cleaned_json_str.strip()
+                if cleaned_json_str.startswith("```"):
+                    cleaned_json_str = cleaned_json_str.removeprefix("```").removeprefix("json")
+                cleaned_json_str = cleaned_json_str.removesuffix("```").strip()
 
                 if not cleaned_json_str:
                     logger.warning(f"[yellow]⚠ [Node: {node.id}] Empty JSON string after cleaning[/yellow]")
@@ -754,7 +952,6 @@ def make_judge_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
                 logger.warning(f"[yellow]⚠ [Node: {node.id}] Defaulting evaluation_score to 0.0[/yellow]")
 
             return {
-                **state,
                 "output": raw_llm_output,
                 "iteration_count": iteration_count_for_next_state, # Update iteration count for the next node
                 "evaluation_score": final_score_for_state
@@ -762,7 +959,6 @@ def make_judge_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         except Exception as e:
             logger.exception(f"[red]✗ [Node: {node.id}] Unhandled exception: {type(e).__name__}[/red]")
             return {
-                **state,
                 "output": f"Error in Judge Node '{node.id}': {type(e).__name__} - {e!s}",
                 "iteration_count": (state.get("iteration_count") or 0) + 1,
                 "evaluation_score": state.get("evaluation_score") if isinstance(state.get("evaluation_score"), float) else 0.0
@@ -786,18 +982,34 @@ def make_branch_node(node: Any) -> NodeFunction:
     def node_fn(state: WorkflowState) -> WorkflowState:
         # Branch nodes are pass-through - preserve previous output for routing
         return {
-            **state,
             "current_node": getattr(node, "id", "branch_node"),
             "error_context": None
         }
     return node_fn
 
+def _make_branch_node_for_spec(spec: Spec, node: WorkflowNode) -> NodeFunction:
+    """Adapts `make_branch_node` to the `NodeFactory` signature."""
+    return make_branch_node(node)
+
+def _result_cache_key(bound_params: dict[str, Any]) -> str | None:
+    """Return a content hash of a tool call's bound parameters, or None if they can't be hashed."""
+    try:
+        canonical = _canonical_json(bound_params)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha1(canonical, usedforsecurity=False).hexdigest()
+
 def make_tool_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
     """Creates a tool node function that routes to either Python or MCP tool loaders.
 
     This function examines the referenced function's type and calls the appropriate
     loader (load_tool for Python functions, load_mcp_tool for MCP functions).
 
+    Python tool nodes may set `result_cache_size` in their config to memoize results
+    by a hash of the bound parameters (including the state, when the function takes
+    it), so a repeated call with the same inputs skips the function. Errors are never
+    cached.
+
     Args:
         spec: The full workflow specification containing function definitions
         node: The WorkflowNode referencing the tool function
@@ -820,39 +1032,59 @@ def make_tool_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         try:
             # Load the actual function
             func = function_loader.load_function(function_spec.entrypoint)
+            executing_msg = f"[blue]Executing {function_spec.entrypoint}[/blue]"
+            # Get parameters from node config
+            parameters = node.config.get("parameters", {}) if node.config else {}
+            call_tool = function_loader.state_caller(func, parameters)
+            result_cache_size = int(node.config.get(RESULT_CACHE_SIZE_CONFIG, 0)) if node.config else 0
+            # The full parameter binding is only needed to key cached results
+            bind_parameters = function_loader.parameter_binder(func, parameters) if result_cache_size > 0 else None
+            result_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+            result_cache_lock = threading.Lock()
 
             # Create wrapper that handles parameter binding
             def python_function_wrapper(state: WorkflowState) -> WorkflowState:
                 try:
-                    # Get parameters from node config
-                    parameters = node.config.get("parameters", {}) if node.config else {}
-
-                    # Bind parameters from state and config
-                    bound_params = function_loader.bind_parameters(func, state, parameters)
+                    cache_key = _result_cache_key(bind_parameters(state)) if bind_parameters is not None else None
+                    if cache_key is not None:
+                        with result_cache_lock:
+                            cached = result_cache.get(cache_key)
+                            if cached is not None:
+                                result_cache.move_to_end(cache_key)
+                                return dict(cached)
 
                     # Execute function
-                    logger.info(f"[blue]Executing {function_spec.entrypoint}[/blue]")
-                    result = func(**bound_params)
+                    logger.info(executing_msg)
+                    result = call_tool(state)
 
-                    # Handle return value
+                    # Handle return value; only the changed keys are returned
+                    # and LangGraph merges them into the state
                     if isinstance(result, dict):
                         # Function returned state update
-                        return {**state, **result}
-                    if isinstance(result, str):
+                        update = result
+                    elif isinstance(result, str):
                         # Function returned string output
-                        return {**state, "output": result}
-                    # Convert other types to string
-                    return {**state, "output": str(result)}
+                        update = {"output": result}
+                    else:
+                        # Convert other types to string
+                        update = {"output": str(result)}
+
+                    if cache_key is not None:
+                        with result_cache_lock:
+                            result_cache[cache_key] = dict(update)
+                            while len(result_cache) > result_cache_size:
+                                result_cache.popitem(last=False)
+                    return update
 
                 except UserExitRequested:
                     # Let UserExitRequested propagate up to terminate the workflow
                     raise
                 except Exception as e:
-                    logger.exception(f"[red]✗ Python function error: {e!s}[/red]")
+                    error_text = str(e)
+                    logger.exception(f"[red]✗ Python function error: {error_text}[/red]")
                     return {
-                        **state,
-                        "output": f"Function error: {e!s}",
-                        "error_context": f"Python function '{function_spec.entrypoint}' failed: {e!s}"
+                        "output": f"Function error: {error_text}",
+                        "error_context": f"Python function '{function_spec.entrypoint}' failed: {error_text}"
                     }
 
             return load_tool(python_function_wrapper)
@@ -861,12 +1093,14 @@ def make_tool_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
             error_msg = str(load_error)
             logger.exception(f"[red]✗ Failed to load Python function: {error_msg}[/red]")
 
+            # The error fields never change, so they are built once and shared read-only
+            error_updates = MappingProxyType({
+                "output": f"Failed to load function '{function_spec.entrypoint}': {error_msg}",
+                "error_context": f"Function loading error: {error_msg}"
+            })
+
             def error_function(state: WorkflowState) -> WorkflowState:
-                return {
-                    **state,
-                    "output": f"Failed to load function '{function_spec.entrypoint}': {error_msg}",
-                    "error_context": f"Function loading error: {error_msg}"
-                }
+                return dict(error_updates)
 
             return error_function
 
@@ -874,12 +1108,13 @@ def make_tool_node(spec: Spec, node: WorkflowNode) -> NodeFunction:
         # For MCP functions, create a placeholder that explains the new architecture
         logger.info(f"[blue]MCP function {function_spec.name} - use MCP nodes instead[/blue]")
 
+        placeholder_updates = MappingProxyType({
+            "output": f"MCP function '{function_spec.name}' - Use MCP nodes instead of function references for MCP tools",
+            "error_context": "MCP functionality is now handled by MCP nodes directly"
+        })
+
         def mcp_function_placeholder(state: WorkflowState) -> WorkflowState:
-            return {
-                **state,
-                "output": f"MCP function '{function_spec.name}' - Use MCP nodes instead of function references for MCP tools",
-                "error_context": "MCP functionality is now handled by MCP nodes directly"
-            }
+            return dict(placeholder_updates)
 
         return mcp_function_placeholder
 
@@ -893,11 +1128,13 @@ class NodeFactoryRegistry:
     _factories: dict[str, NodeFactory] = {
         "agent": make_llm_node,
         "tool": make_tool_node,
-        "judge": lambda spec, node: make_judge_node(spec, node),
-        "branch": lambda spec, node: make_branch_node(node),
+        "judge": make_judge_node,
+        "branch": _make_branch_node_for_spec,
         "mcp": make_mcp_node,
         "claude_code": make_claude_code_node,
     }
+    # Read-only live view of the registered factories; additions go through register()
+    factories: ClassVar[Mapping[str, NodeFactory]] = MappingProxyType(_factories)
 
     @classmethod
     def get(cls, kind: str) -> NodeFactory:
@@ -937,6 +1174,142 @@ class NodeFactoryRegistry:
         """
         cls._factories[kind] = factory
 
+# Comparison operators allowed in edge condition expressions
+CONDITION_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Captures key, optional default, operator and value from
+#   state.get('key', default_val) op value_val  OR  state.get('key') op value_val
+_COMPARISON_PATTERN = re.compile(r"state\.get\s*\(\s*['\"](.*?)['\"]\s*(?:,\s*(.*?))?\s*\)\s*([><=!]+)\s*(.*)")
+
+# Direct key access: the whole expression is state.get('key') or state['key']
+_KEY_ACCESS_PATTERN = re.compile(r"state\.(?:get\s*\(\s*['\"](.*?)['\"]\s*(?:,\s*.*?)?\s*\)|\[['\"](.*?)['\"]\])")
+
+
+def _parse_condition_value(val_str: str) -> int | float | str:
+    """Parse a string value to int, float, or string."""
+    val_str = val_str.strip()
+    if val_str.isdigit() or (val_str.startswith("-") and val_str[1:].isdigit()):
+        return int(val_str)
+    try:
+        return float(val_str)
+    except ValueError:
+        return val_str.strip('"\'')
+
+
+def _compile_single_condition(condition_str: str) -> Callable[[dict[str, Any]], bool | str]:
+    """Compile a single condition like 'state.get('key', default) op value' into a predicate."""
+    stripped = condition_str.strip()
+    match = _COMPARISON_PATTERN.match(stripped)
+
+    if not match:
+        # Handle simple boolean expressions
+        lowered = condition_str.lower()
+        if lowered in ("true", "false"):
+            literal = lowered == "true"
+            return lambda state: literal
+
+        # Handle direct state key access if the expression is *just* state.get('key') or state['key']
+        # (intended to evaluate its truthiness)
+        key_access_match = _KEY_ACCESS_PATTERN.fullmatch(stripped)
+        if key_access_match:
+            access_key = key_access_match.group(1) or key_access_match.group(2)
+            # Default to None if key not found, then evaluate truthiness
+            return lambda state: bool(state.get(access_key))
+
+        # Treat as string literal (for target node names if no other pattern matched)
+        # This allows conditions to be direct node names for unconditional routing via conditional_edges
+        target = condition_str.strip('"\'')
+        return lambda state: target
+
+    key, default_val_str, op_str, value_expr_str = match.groups()
+
+    # Parse default value from expression. If not provided in expr, use None for state.get().
+    default_for_state_get = _parse_condition_value(default_val_str) if default_val_str is not None else None
+
+    # Parse the value to compare against
+    comp_value = _parse_condition_value(value_expr_str)
+
+    compare_op = CONDITION_OPERATORS.get(op_str)
+    if compare_op is None:
+        msg = f"Unsupported operator: {op_str}"
+
+        def unsupported(state: dict[str, Any]) -> bool:
+            raise ValueError(msg)
+
+        return unsupported
+
+    # Specialize on the comparison value's type so the per-call work is just the lookup
+    # and the operator; only string comparisons need the state value stripped
+    if isinstance(comp_value, str):
+        def compare_str(state: dict[str, Any]) -> bool:
+            state_value = state.get(key, default_for_state_get)
+            if isinstance(state_value, str):
+                state_value = state_value.strip()
+            return compare_op(state_value, comp_value)
+
+        return compare_str
+
+    def compare(state: dict[str, Any]) -> bool:
+        return compare_op(state.get(key, default_for_state_get), comp_value)
+
+    return compare
+
+
+def _any_of(predicates: list[Callable[[dict[str, Any]], bool | str]]) -> Callable[[dict[str, Any]], bool]:
+    """Combine predicates with 'or', stopping at the first one that holds."""
+    def evaluate(state: dict[str, Any]) -> bool:
+        for predicate in predicates:  # noqa: SIM110 - a loop avoids any()'s per-call generator
+            if predicate(state):
+                return True
+        return False
+
+    return evaluate
+
+
+def _all_of(predicates: list[Callable[[dict[str, Any]], bool | str]]) -> Callable[[dict[str, Any]], bool]:
+    """Combine predicates with 'and', stopping at the first one that fails."""
+    def evaluate(state: dict[str, Any]) -> bool:
+        for predicate in predicates:  # noqa: SIM110 - a loop avoids all()'s per-call generator
+            if not predicate(state):
+                return False
+        return True
+
+    return evaluate
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_condition(expr: str) -> Callable[[dict[str, Any]], bool | str]:
+    """Compile a full condition expression, including 'and'/'or' combinations, into a predicate.
+
+    Predicates are pure functions of the state, so the result is memoized per
+    expression and edges (or recompiled workflows) with the same condition share it.
+    Combinations are built as plain loops over the compiled parts, so evaluating
+    them doesn't create generator objects on every call.
+    """
+    # Handle complex expressions with 'and' and 'or'
+    if " and " in expr or " or " in expr:
+        # Split by 'and' first (higher precedence), then by 'or' within each part
+        and_predicates = [
+            _any_of([_compile_single_condition(part.strip()) for part in and_part.split(" or ")])
+            if " or " in and_part
+            else _compile_single_condition(and_part.strip())
+            for and_part in expr.split(" and ")
+        ]
+        # A lone 'or' group already evaluates to a bool
+        if len(and_predicates) == 1:
+            return and_predicates[0]
+        return _all_of(and_predicates)
+    # Handle single condition
+    return _compile_single_condition(expr)
+
+
 def create_condition_function(expr: str) -> Callable[[dict[str, Any]], Any]:
     """Creates a callable function from a condition expression string for graph routing.
 
@@ -945,6 +1318,10 @@ def create_condition_function(expr: str) -> Callable[[dict[str, Any]], Any]:
     function. This generated function takes a `WorkflowState` (as a dictionary)
     and evaluates the expression against it, returning a boolean or a target node name.
 
+    The expression is parsed once, when the function is created, and the parsed
+    predicate is shared by every condition with the same expression; evaluating it
+    against a state only reads the referenced keys and applies the comparisons.
+
     Supported expressions include:
     - Comparisons: `state.get('key', default_value) op value` (e.g., `state.get('score', 0) > 5`)
       where `op` can be `>=`, `<=`, `>`, `<`, `==`, `!=`.
@@ -966,102 +1343,11 @@ def create_condition_function(expr: str) -> Callable[[dict[str, Any]], Any]:
     Raises:
         ValueError: If the expression string contains unsupported operations or fails to parse.
     """
-    import operator
-    import re
-
-    # Define allowed operators
-    ops = {
-        ">=": operator.ge,
-        "<=": operator.le,
-        ">": operator.gt,
-        "<": operator.lt,
-        "==": operator.eq,
-        "!=": operator.ne,
-    }
-
-    def _parse_value(val_str: str) -> int | float | str:
-        """Parse a string value to int, float, or string."""
-        val_str = val_str.strip()
-        if val_str.isdigit() or (val_str.startswith("-") and val_str[1:].isdigit()):
-            return int(val_str)
-        try:
-            return float(val_str)
-        except ValueError:
-            return val_str.strip('"\'')
-
-    def _evaluate_single_condition(condition_str: str, state: dict[str, Any]) -> bool | str:
-        """Evaluate a single condition like 'state.get('key', default) op value'."""
-        # Updated pattern to correctly capture key, optional default, operator, and value.
-        # Handles: state.get('key', default_val) op value_val
-        #      OR: state.get('key') op value_val
-        pattern = r"state\.get\s*\(\s*['\"](.*?)['\"]\s*(?:,\s*(.*?))?\s*\)\s*([><=!]+)\s*(.*)"
-        match = re.match(pattern, condition_str.strip())
-
-        if not match:
-            # Handle simple boolean expressions
-            if condition_str.lower() in ("true", "false"):
-                return condition_str.lower() == "true"
-
-            # Handle direct state key access if the expression is *just* state.get('key') or state['key']
-            # (intended to evaluate its truthiness)
-            key_access_pattern = r"state\.(?:get\s*\(\s*['\"](.*?)['\"]\s*(?:,\s*.*?)?\s*\)|\[['\"](.*?)['\"]\])"
-            key_access_match = re.fullmatch(key_access_pattern, condition_str.strip())
-            if key_access_match:
-                key = key_access_match.group(1) or key_access_match.group(2)
-                # Default to None if key not found, then evaluate truthiness
-                return bool(state.get(key))
-
-            # Treat as string literal (for target node names if no other pattern matched)
-            # This allows conditions to be direct node names for unconditional routing via conditional_edges
-            return condition_str.strip('"\'')
-
-        key, default_val_str, op_str, value_expr_str = match.groups()
-
-        # Parse default value from expression. If not provided in expr, use None for state.get().
-        default_for_state_get = _parse_value(default_val_str) if default_val_str is not None else None
-
-        # Parse the value to compare against
-        comp_value = _parse_value(value_expr_str)
-
-        # Get state value using the key and the parsed or implicit default
-        state_value_raw = state.get(key, default_for_state_get)
-
-        # Prepare state_value for comparison: if it's a string and comp_value is also a string, strip it.
-        state_value_for_comparison = state_value_raw
-        if isinstance(state_value_raw, str) and isinstance(comp_value, str):
-            state_value_for_comparison = state_value_raw.strip()
-
-        # Perform comparison using the appropriate operator
-        if op_str in ops:
-            return ops[op_str](state_value_for_comparison, comp_value)
-        msg = f"Unsupported operator: {op_str}"
-        raise ValueError(msg)
+    evaluate = _compile_condition(expr)
 
     def condition(state: dict[str, Any]) -> bool | str:
         try:
-            # Handle complex expressions with 'and' and 'or'
-            if " and " in expr or " or " in expr:
-                # Split by 'and' and 'or' operators
-                # For simplicity, we'll handle left-to-right evaluation
-
-                # Split by 'and' first (higher precedence)
-                and_parts = expr.split(" and ")
-                and_results = []
-
-                for and_part in and_parts:
-                    # Handle 'or' within each 'and' part
-                    if " or " in and_part:
-                        or_parts = and_part.split(" or ")
-                        or_result = any(_evaluate_single_condition(part.strip(), state) for part in or_parts)
-                        and_results.append(or_result)
-                    else:
-                        and_results.append(_evaluate_single_condition(and_part.strip(), state))
-
-                return all(and_results)
-
-            # Handle single condition
-            return _evaluate_single_condition(expr, state)
-
+            return evaluate(state)
         except Exception as e:
             msg = f"Failed to evaluate condition '{expr}': {e!s}"
             raise ValueError(msg)
@@ -1069,15 +1355,119 @@ def create_condition_function(expr: str) -> Callable[[dict[str, Any]], Any]:
     return condition
 
 
-def add_nodes_to_graph(graph: StateGraph, spec: Spec) -> None:
+def _linear_chains(spec: Spec) -> dict[str, list[WorkflowNode]]:
+    """Find the maximal runs of nodes that can only ever execute one after another.
+
+    A node joins the run of its predecessor when that predecessor is not a stop node,
+    has a single unconditional edge and that edge is the only one leading to the
+    node. Such a run gains nothing from being scheduled node by node, so it is
+    compiled into a single graph node.
+
+    Args:
+        spec: The workflow specification containing the nodes and edges.
+
+    Returns:
+        The runs of two or more nodes, keyed by the ID of their first node.
+    """
+    workflow = spec.workflow
+    links: list[tuple[str, str]] = [(edge.source, edge.target) for edge in workflow.edges]
+    if workflow.type == "sequential":
+        links.extend((current.id, following.id) for current, following in itertools.pairwise(workflow.nodes))
+
+    successors: dict[str, list[str]] = {}
+    in_degree: dict[str, int] = {}
+    for source, target in links:
+        successors.setdefault(source, []).append(target)
+        in_degree[target] = in_degree.get(target, 0) + 1
+    # Routers choose a successor at runtime, so a conditional source never fuses
+    routed = {edge.source for edge in workflow.edges if edge.condition}
+
+    nodes_by_id = {node.id: node for node in workflow.nodes}
+    entry_id = workflow.nodes[0].id if workflow.nodes else None
+
+    def fused_successor(node: WorkflowNode) -> WorkflowNode | None:
+        targets = successors.get(node.id, [])
+        if node.stop or node.id in routed or len(targets) != 1:
+            return None
+        target = nodes_by_id.get(targets[0])
+        if target is None or target.id == entry_id or in_degree[target.id] != 1:
+            return None
+        return target
+
+    followers = {nxt.id for node in workflow.nodes if (nxt := fused_successor(node)) is not None}
+    chains: dict[str, list[WorkflowNode]] = {}
+    for node in workflow.nodes:
+        if node.id in followers:
+            continue
+        chain = [node]
+        while (nxt := fused_successor(chain[-1])) is not None:
+            chain.append(nxt)
+        if len(chain) > 1:
+            chains[node.id] = chain
+    return chains
+
+def _fuse_chain(node_fns: list[NodeFunction], state_keys: frozenset[str]) -> NodeFunction:
+    """Run a chain of node functions as one node.
+
+    Each step sees the state as LangGraph would have passed it: earlier updates are
+    applied in order and keys outside the state schema are dropped.
+
+    Args:
+        node_fns: The node functions in execution order.
+        state_keys: The keys of the workflow state schema.
+
+    Returns:
+        A node function returning the combined update of the whole chain.
+    """
+    def fused_fn(state: WorkflowState) -> WorkflowState:
+        current = dict(state)
+        combined: dict[str, Any] = {}
+        for node_fn in node_fns:
+            update = node_fn(current)
+            if update:
+                update = {key: value for key, value in update.items() if key in state_keys}
+                current.update(update)
+                combined.update(update)
+        return combined
+
+    return fused_fn
+
+def _store_output_under_key(node_fn: NodeFunction, output_key: str) -> NodeFunction:
+    """Wrap a node function so its output is also kept under `output_key` in `dynamic_state`.
+
+    Args:
+        node_fn: The node function to wrap.
+        output_key: The name to store the node's output under.
+
+    Returns:
+        A node function whose updates also carry the named output.
+    """
+    def keyed_node_fn(state: WorkflowState) -> WorkflowState:
+        update = node_fn(state)
+        if update and "output" in update:
+            dynamic_state = {**(state.get("dynamic_state") or {}), output_key: update["output"]}
+            update = {**update, "dynamic_state": dynamic_state}
+        return update
+
+    return keyed_node_fn
+
+def _build_node_fn(spec: Spec, node: WorkflowNode) -> NodeFunction:
+    """Create the node function for a node with the factory registered for its kind."""
+    node_fn = NodeFactoryRegistry.get(node.kind)(spec, node)
+    output_key = node.output_key or node.config.get("output_key")
+    return _store_output_under_key(node_fn, output_key) if output_key else node_fn
+
+def add_nodes_to_graph(graph: "StateGraph", spec: Spec) -> None:
     """Adds all nodes defined in `spec.workflow.nodes` to the `StateGraph`.
 
     For each node in the specification, this function:
     1. Retrieves the appropriate node factory using `NodeFactoryRegistry.get(node.kind)`.
-    2. Calls the factory to create the actual node callable (an instance of `NodeFunction`).
+    2. Calls the factory to create the actual node callable (an instance of `NodeFunction`),
+       wrapped to keep its output in `dynamic_state` when the node has an `output_key`.
     3. Adds the callable to the `graph` with `graph.add_node(node.id, node_fn)`.
     Additionally, if a node is marked with `node.stop is True`, an edge is automatically
-    added from this node to the `END` state of the graph.
+    added from this node to the `END` state of the graph. Runs of nodes found by
+    `_linear_chains` are added as one node under the ID of their first node.
 
     Args:
         graph: The `StateGraph` instance to which nodes will be added.
@@ -1086,19 +1476,53 @@ def add_nodes_to_graph(graph: StateGraph, spec: Spec) -> None:
     if spec.workflow is None:
         msg = "Workflow must be present for compilation"
         raise WorkflowValidationError(msg)
+    from langgraph.graph import END
+
     logger.info("[blue]Building workflow nodes[/blue]")
+    chains = _linear_chains(spec)
+    fused_ids = {member.id for chain in chains.values() for member in chain[1:]}
+    # LangGraph adds a channel for every WorkflowState key once nodes are added, so
+    # the keys a fused step may write are taken from the TypedDict as well
+    state_keys = frozenset(graph.channels) | frozenset(WorkflowState.__annotations__)
     for node in spec.workflow.nodes:
+        if node.id in fused_ids:
+            continue
         logger.info(f"[dim]  Adding node: {node.id} ({node.kind})[/dim]")
-        factory = NodeFactoryRegistry.get(node.kind)
-        node_fn = factory(spec, node)
-        graph.add_node(node.id, node_fn)
-
-        # If this is a stop node, add an edge to END
-        if node.stop:
-            logger.info(f"[dim]  End condition: {node.id}[/dim]")
+        chain = chains.get(node.id, [node])
+        if len(chain) == 1:
+            graph.add_node(node.id, _build_node_fn(spec, node))
+        else:
+            # The chain runs as a single node registered under its first node's ID
+            logger.info(f"[dim]  Fused chain: {' → '.join(member.id for member in chain)}[/dim]")
+            member_fns = [_build_node_fn(spec, member) for member in chain]
+            graph.add_node(node.id, _fuse_chain(member_fns, state_keys))
+
+        # If this node (or the last node of its chain) is a stop node, add an edge to END
+        if chain[-1].stop:
+            logger.info(f"[dim]  End condition: {chain[-1].id}[/dim]")
             graph.add_edge(node.id, END)
 
-def add_edges_to_graph(graph: StateGraph, spec: Spec) -> None:
+def _independent_root_ids(spec: Spec) -> list[str]:
+    """Return the IDs of nodes after the entry point that no edge leads to.
+
+    Such nodes depend on nothing but the workflow input. They are only started with
+    the entry point when the workflow sets `parallel_roots`; otherwise they are never
+    reached.
+
+    Args:
+        spec: The workflow specification containing the nodes and edges.
+
+    Returns:
+        The root node IDs in the order the nodes are defined.
+    """
+    workflow = spec.workflow
+    # Sequential workflows link every node to the one before it
+    if workflow.type == "sequential":
+        return []
+    targets = {edge.target for edge in workflow.edges}
+    return [node.id for node in workflow.nodes[1:] if node.id not in targets]
+
+def add_edges_to_graph(graph: "StateGraph", spec: Spec) -> None:
     """Configures all edges in the `StateGraph` based on `spec.workflow.edges`.
 
     For sequential workflows, automatically creates edges between consecutive nodes.
@@ -1106,16 +1530,18 @@ def add_edges_to_graph(graph: StateGraph, spec: Spec) -> None:
     1. Groups edges by their `source` node.
     2. For each source node:
         a. If there are conditional edges (edges with a `condition` string):
-            - A router function is dynamically created. This router uses `create_condition_function`
+            - A router function is dynamically created. This router uses `_compile_condition`
               to parse each condition string into an evaluatable function that operates on `WorkflowState`.
             - `graph.add_conditional_edges` is called with the source node, the router,
-              and a mapping of expected router return values (target node names) to target nodes.
+              and the list of target node names the router can return.
             - Handles default targets if specified, or routes to `END` if no condition matches
               and no default is set.
         b. If there are only unconditional edges:
             - Each edge is added directly using `graph.add_edge(edge.source, edge.target)`.
             - Supports fan-out to multiple targets if multiple unconditional edges exist from a source.
-    Logs detailed information about the edge configurations being applied.
+    Edges inside a fused chain are skipped and edges leaving its last node start from
+    the chain's first node. Logs detailed information about the edge configurations
+    being applied.
 
     Args:
         graph: The `StateGraph` instance to which edges will be added.
@@ -1124,31 +1550,44 @@ def add_edges_to_graph(graph: StateGraph, spec: Spec) -> None:
     if spec.workflow is None:
         msg = "Workflow must be present for compilation"
         raise WorkflowValidationError(msg)
+    from langgraph.graph import END
+
     logger.info("[blue]Building workflow edges[/blue]")
 
+    # Edges inside a fused chain are dropped and those leaving it start from the
+    # graph node that runs the chain
+    graph_node_ids = {member.id: head_id for head_id, chain in _linear_chains(spec).items() for member in chain}
+    fused_ids = graph_node_ids.keys() - graph_node_ids.values()
+
     # Handle sequential workflows by automatically creating edges between consecutive nodes
     if spec.workflow.type == "sequential":
         logger.info("[dim]Sequential workflow - auto-linking nodes[/dim]")
-        nodes = spec.workflow.nodes
-        for i in range(len(nodes) - 1):
-            current_node = nodes[i]
-            next_node = nodes[i + 1]
+        unfused_links = (
+            (current_node, next_node)
+            for current_node, next_node in itertools.pairwise(spec.workflow.nodes)
+            if next_node.id not in fused_ids
+        )
+        for current_node, next_node in unfused_links:
             logger.info(f"[dim]  {current_node.id} → {next_node.id}[/dim]")
-            graph.add_edge(current_node.id, next_node.id)
+            graph.add_edge(graph_node_ids.get(current_node.id, current_node.id), next_node.id)
 
         # Also process any additional edges from the edges list (for sequential workflows with custom overrides)
         if spec.workflow.edges:
             logger.info("[dim]Processing custom edges[/dim]")
 
-    edges_by_source: dict[str, list[Edge]] = {}
-    for edge in spec.workflow.edges:
-        edges_by_source.setdefault(edge.source, []).append(edge)
+    # Group edges by source and split them into (conditional, unconditional) in one pass;
+    # sources keep the order in which they first appear
+    edges_by_source: dict[str, tuple[list[Edge], list[Edge]]] = {}
+    for edge in (edge for edge in spec.workflow.edges if edge.target not in fused_ids):
+        source = graph_node_ids.get(edge.source, edge.source)
+        source_edges = edges_by_source.setdefault(source, ([], []))
+        source_edges[0 if edge.condition else 1].append(edge)
 
-    for source, edges_from_source in edges_by_source.items():
-        logger.info(f"[dim]Processing edges from {source}[/dim]")
+    # Built once so the leaf-node check below is a set lookup rather than a scan per source
+    non_stop_node_ids = {node.id for node in spec.workflow.nodes if not node.stop}
 
-        conditional_edges = [e for e in edges_from_source if e.condition]
-        unconditional_edges = [e for e in edges_from_source if not e.condition]
+    for source, (conditional_edges, unconditional_edges) in edges_by_source.items():
+        logger.info(f"[dim]Processing edges from {source}[/dim]")
 
         if conditional_edges:
             # If there are any conditional edges, all decisions from this node
@@ -1171,20 +1610,27 @@ def add_edges_to_graph(graph: StateGraph, spec: Spec) -> None:
                 def_target: str | None
             ) -> Callable[[dict[str, Any]], str]:
 
-                condition_target_pairs = [
-                    (create_condition_function(e.condition or "true"), e.target)
+                # The router reports evaluation errors itself, so it uses the compiled
+                # predicates directly rather than create_condition_function's wrappers
+                condition_target_pairs = tuple(
+                    (_compile_condition(e.condition or "true"), e.condition, e.target)
                     for e in cond_edges
-                ]
+                )
 
                 def router(state: dict[str, Any]) -> str:
-                    logger.info(f"[dim]  Router evaluating: {str(state.get('output', ''))[:30]}...[/dim]") # Log the state output
-                    for condition_fn, target_node_name in condition_target_pairs:
+                    # str() of the whole output can be expensive, so skip it unless INFO is shown
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"[dim]  Router evaluating: {str(state.get('output', ''))[:30]}...[/dim]") # Log the state output
+                    for condition_fn, condition_expr, target_node_name in condition_target_pairs:
                         try:
                             if condition_fn(state): # condition_fn should return boolean
                                 logger.info(f"[dim]  Routing {source_node_id} → {target_node_name}[/dim]")
                                 return target_node_name # Router returns the key for the ends_map
                         except Exception as e:
-                            logger.exception(f"[red]✗ Routing error for {source_node_id}: {e!s}[/red]")
+                            logger.exception(
+                                f"[red]✗ Routing error for {source_node_id}: "
+                                f"Failed to evaluate condition '{condition_expr}': {e!s}[/red]"
+                            )
                             # In a production system, you might want to raise or handle this more specifically
 
                     if def_target:
@@ -1198,18 +1644,18 @@ def add_edges_to_graph(graph: StateGraph, spec: Spec) -> None:
 
             router_fn = create_router_for_source(source, conditional_edges, default_target)
 
-            # The conditional_edge_mapping keys are what the router returns.
-            # The values are the actual node IDs (or special targets like END).
-            # Our router is designed to return actual target node names or END.
-            edge_mapping: dict[Any, Any] = {e.target: e.target for e in conditional_edges}
+            # Our router returns actual target node names or END, so the possible
+            # destinations are passed as a list and LangGraph maps each name to itself.
+            # dict.fromkeys keeps the first occurrence of each target in edge order.
+            edge_targets = dict.fromkeys(e.target for e in conditional_edges)
             if default_target:
-                edge_mapping[default_target] = default_target # Add default target to map
-            edge_mapping[END] = END # Ensure END is always a valid target if router returns it
+                edge_targets[default_target] = None # Add default target to map
+            edge_targets[END] = None # Ensure END is always a valid target if router returns it
 
             graph.add_conditional_edges(
                 source,
                 router_fn,
-                edge_mapping
+                list(edge_targets)
             )
 
         elif unconditional_edges: # No conditional edges from this source, only unconditional ones.
@@ -1217,33 +1663,35 @@ def add_edges_to_graph(graph: StateGraph, spec: Spec) -> None:
                  logger.info(f"[dim]  Fan-out from {source}: {[e.target for e in unconditional_edges]}[/dim]")
             for edge in unconditional_edges:
                 logger.info(f"[dim]  {source} → {edge.target}[/dim]")
-                graph.add_edge(edge.source, edge.target)  # ✅ FIXED: Actually add the edge
+                graph.add_edge(source, edge.target)  # ✅ FIXED: Actually add the edge
         else:
             # This case means the node is a leaf node in terms of defined edges.
             # If it's not a 'stop: true' node, the graph might halt here if no global end is reached.
             logger.info(f"[dim]  No outgoing edges from {source}[/dim]")
 
             # Check if this node should have edges but doesn't
-            node = next((n for n in spec.workflow.nodes if n.id == source), None)
-            if node and not node.stop:
+            if source in non_stop_node_ids:
                 logger.warning(f"[yellow]⚠ Node {source} has no edges and stop=False - may terminate unexpectedly[/yellow]")
 
 
-def compile_to_langgraph(spec: Spec) -> StateGraph:
+def compile_to_langgraph(spec: Spec) -> "StateGraph":
     """Compiles a `Spec` object into a runnable `langgraph.StateGraph`.
 
     This orchestration function performs the following steps:
     1. Validates that the spec has a workflow (should be resolved by this point).
-    2. Defines a `WorkflowStateSchema` (a Pydantic model) that dictates the structure
-       of the state object passed between nodes in the graph. This schema matches
-       the `WorkflowState` TypedDict.
+    2. Uses the shared `WorkflowStateSchema` (a Pydantic model) that dictates the
+       structure of the state object passed between nodes in the graph. This schema
+       matches the `WorkflowState` TypedDict.
     3. Initializes a `StateGraph` instance with this `WorkflowStateSchema`.
     4. Calls `add_nodes_to_graph(graph, spec)` to populate the graph with all defined nodes
        from the specification, creating node callables via `NodeFactoryRegistry`.
     5. Calls `add_edges_to_graph(graph, spec)` to establish the control flow (transitions)
        between these nodes, including conditional logic based on `WorkflowState`.
     6. Sets the entry point of the graph using `graph.set_entry_point()`, typically to the
-       ID of the first node defined in `spec.workflow.nodes`.
+       ID of the first node defined in `spec.workflow.nodes`. Any other node that no edge
+       leads to is unreachable and logged as a warning, unless the workflow sets
+       `parallel_roots`, in which case it is started from `START` alongside the entry
+       point and runs concurrently with it.
 
     Args:
         spec: The workflow specification object containing all definitions for nodes,
@@ -1256,6 +1704,8 @@ def compile_to_langgraph(spec: Spec) -> StateGraph:
     Raises:
         ValueError: If the spec doesn't have a workflow (references should be resolved by now).
     """
+    from langgraph.graph import START, StateGraph
+
     logger.info("[blue]Compiling workflow[/blue]")
 
     # Ensure the spec has a workflow (references should be resolved by this point)
@@ -1266,31 +1716,6 @@ def compile_to_langgraph(spec: Spec) -> StateGraph:
     # Type narrowing for mypy
     workflow = spec.workflow
 
-    # Define the state schema using Pydantic
-    class WorkflowStateSchema(BaseModel):
-        """Schema for workflow state."""
-        input: str
-        output: str | None = None
-        iteration_count: int | None = Field(default=0)
-        evaluation_score: float | None = None
-        # Enhanced workflow metadata for better tracking
-        workflow_id: str | None = None
-        current_node: str | None = None
-        error_context: str | None = None
-        # User interaction fields
-        user_exit_requested: bool | None = None  # Flag when user requests to exit
-        # Structured output validation fields
-        structured_output: dict[str, Any] | None = None
-        validation_status: str | None = None  # 'valid', 'invalid', 'error', or None
-        validation_error: str | None = None
-        # Format processing fields
-        structured_data: dict[str, Any] | None = None
-        raw_json: str | None = None
-        format_status: str | None = None  # 'converted', 'error', or None
-        format_error: str | None = None
-        # Dynamic fields for output_key support
-        dynamic_state: dict[str, Any] | None = None
-
     # Create a new graph with explicit state schema
     graph = StateGraph(
         state_schema=WorkflowStateSchema
@@ -1304,6 +1729,15 @@ def compile_to_langgraph(spec: Spec) -> StateGraph:
     if workflow.nodes:
         logger.info(f"[dim]Entry point: {workflow.nodes[0].id}[/dim]")
         graph.set_entry_point(workflow.nodes[0].id)
+        for root_id in _independent_root_ids(spec):
+            if workflow.parallel_roots:
+                logger.info(f"[dim]Parallel entry point: {root_id}[/dim]")
+                graph.add_edge(START, root_id)
+            else:
+                logger.warning(
+                    f"[yellow]⚠ Node {root_id} has no incoming edges and will never run; "
+                    f"set workflow.parallel_roots to start it with the entry point[/yellow]"
+                )
 
     logger.info("[green]✓ Workflow compilation complete[/green]")
     return graph
@@ -1,11 +1,11 @@
 # src/elf/core/config.py
+from dataclasses import asdict, dataclass, field
 import logging  # Added logger
 import os
 from pathlib import Path
 from typing import Any, Literal
 
 from dotenv import load_dotenv
-from pydantic import BaseModel
 
 # Configure a logger for this module
 logger = logging.getLogger(__name__)
@@ -17,12 +17,20 @@ PROVIDER_CONFIG = {
     "ollama": {"requires_api_key": False}
 }
 
-class LLMConfig(BaseModel):
-    """Configuration for an LLM client."""
+# Environment variable holding each provider's API key, e.g. OPENAI_API_KEY
+API_KEY_ENV_VARS = {provider: f"{provider.upper()}_API_KEY" for provider in PROVIDER_CONFIG}
+
+@dataclass(slots=True)
+class LLMConfig:
+    """Configuration for an LLM client.
+
+    A plain dataclass rather than a pydantic model: the values come from an already
+    validated `spec.LLM`, so building one is just attribute assignment.
+    """
     type: Literal["openai", "anthropic", "ollama"]  # Added type field
     model_name: str
     temperature: float = 0.7
-    params: dict[str, Any] = {}
+    params: dict[str, Any] = field(default_factory=dict)
     api_key: str | None = None
 
 def load_env_file(env_path: str | None = None) -> None:
@@ -64,17 +72,20 @@ def get_api_key(provider_name: str) -> str | None:
     provider_name_lower = provider_name.lower()
 
     # Check if provider exists in configuration
-    if provider_name_lower not in PROVIDER_CONFIG:
+    provider_config = PROVIDER_CONFIG.get(provider_name_lower)
+    if provider_config is None:
         msg = f"Unknown provider: {provider_name}"
         raise ValueError(msg)
 
     # Check if provider requires API key
-    if not PROVIDER_CONFIG[provider_name_lower]["requires_api_key"]:
+    if not provider_config["requires_api_key"]:
         logger.info(f"[dim]Provider {provider_name} - no API key required[/dim]")
         return None
 
-    env_var_name = f"{provider_name.upper()}_API_KEY"
-    api_key = os.getenv(env_var_name)
+    # The environment is read on every call (not cached) so that keys set or
+    # reloaded from .env after import are always picked up
+    env_var_name = API_KEY_ENV_VARS[provider_name_lower]
+    api_key = os.environ.get(env_var_name)
 
     # Explicitly check for missing API key
     if api_key is None or api_key.strip() == "":
@@ -84,6 +95,29 @@ def get_api_key(provider_name: str) -> str | None:
     logger.info(f"[green]✓ API key found for {provider_name}[/green]")
     return api_key
 
+def get_env_int(env_var_name: str, default: int) -> int:
+    """Read a positive integer setting from the environment.
+
+    Args:
+        env_var_name: The environment variable to read.
+        default: The value used when the variable is unset or invalid.
+
+    Returns:
+        The parsed value, or `default` if the variable is unset, not an integer or
+        not positive.
+    """
+    raw_value = os.environ.get(env_var_name)
+    if raw_value is None or raw_value.strip() == "":
+        return default
+    try:
+        value = int(raw_value)
+    except ValueError:
+        value = 0
+    if value < 1:
+        logger.warning(f"[yellow]⚠ Ignoring {env_var_name}={raw_value!r}, expected a positive integer; using {default}[/yellow]")
+        return default
+    return value
+
 def create_llm_config(config: dict[str, Any] | LLMConfig, llm_type: str | None = None) -> LLMConfig:
     """Create an LLM configuration with API key handling.
     The API key is sourced first from the input config, then from environment variables if needed.
@@ -107,7 +141,7 @@ def create_llm_config(config: dict[str, Any] | LLMConfig, llm_type: str | None =
         # Try to determine llm_type if not explicitly passed but available in the config dict
         effective_llm_type = llm_type or current_config_dict.get("type")
     elif isinstance(config, LLMConfig):
-        current_config_dict = config.model_dump() # Get dict from Pydantic model
+        current_config_dict = asdict(config) # Get dict from the dataclass
         # Try to determine llm_type if not explicitly passed but available in the config object
         effective_llm_type = llm_type or getattr(config, "type", None)
     else:
@@ -118,8 +152,14 @@ def create_llm_config(config: dict[str, Any] | LLMConfig, llm_type: str | None =
         msg = "llm_type must be provided or present in config"
         raise ValueError(msg)
 
-    # Ensure type is set in the config
-    current_config_dict["type"] = effective_llm_type
+    if effective_llm_type not in PROVIDER_CONFIG:
+        msg = f"Unknown provider: {effective_llm_type}"
+        raise ValueError(msg)
+
+    model_name = current_config_dict.get("model_name")
+    if not model_name:
+        msg = "model_name must be present in config"
+        raise ValueError(msg)
 
     # Handle API key
     api_key_to_use: str | None = current_config_dict.get("api_key")
@@ -128,10 +168,13 @@ def create_llm_config(config: dict[str, Any] | LLMConfig, llm_type: str | None =
     if not api_key_to_use:
         api_key_to_use = get_api_key(effective_llm_type)
 
-    # Update the dictionary with the resolved API key
-    current_config_dict["api_key"] = api_key_to_use
-
-    return LLMConfig(**current_config_dict)
+    return LLMConfig(
+        type=effective_llm_type,
+        model_name=model_name,
+        temperature=current_config_dict.get("temperature", 0.7),
+        params=current_config_dict.get("params") or {},
+        api_key=api_key_to_use,
+    )
 
 # Load environment variables from .env file when this module is imported.
 # This ensures it's done once at the beginning.
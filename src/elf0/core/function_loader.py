@@ -1,5 +1,6 @@
 # src/elf/core/function_loader.py
 from collections.abc import Callable
+import functools
 import importlib
 import inspect
 import logging
@@ -73,41 +74,110 @@ class SimpleFunctionLoader:
         if "state" not in sig.parameters:
             logger.warning(f"[yellow]⚠ Function {entrypoint} missing 'state' parameter[/yellow]")
 
-    def bind_parameters(self, func: Callable, state: dict[str, Any], parameters: dict[str, Any] | None = None) -> dict[str, Any]:
-        """Bind workflow state and config parameters to function signature.
-
-        Args:
-            func: The function to call
-            state: Current workflow state
-            parameters: Parameter configuration from YAML
-
-        Returns:
-            Dictionary of bound parameters ready for function call
-        """
-        if parameters is None:
-            parameters = {}
-
+    def _classify_parameters(
+        self, func: Callable, parameters: dict[str, Any]
+    ) -> tuple[inspect.Signature, dict[str, Any], list[tuple[str, str]]]:
+        """Split configured parameters into static values and `${state.field}` references."""
         sig = inspect.signature(func)
-        bound_params = {}
+        static_params: dict[str, Any] = {}
+        state_fields: list[tuple[str, str]] = []
 
-        # Always pass state if function accepts it
-        if "state" in sig.parameters:
-            bound_params["state"] = state
-
-        # Process parameter bindings
         for param_name, param_value in parameters.items():
             if param_name in sig.parameters:
                 # Handle ${state.field} substitution
                 if isinstance(param_value, str) and param_value.startswith("${state."):
                     field_name = param_value[8:-1]  # Remove ${state. and }
-                    bound_params[param_name] = state.get(field_name)
+                    state_fields.append((param_name, field_name))
                 else:
                     # Static value
-                    bound_params[param_name] = param_value
+                    static_params[param_name] = param_value
             else:
                 logger.warning(f"[yellow]⚠ Parameter {param_name} not found in function signature[/yellow]")
 
-        return bound_params
+        return sig, static_params, state_fields
+
+    def parameter_binder(self, func: Callable, parameters: dict[str, Any] | None = None) -> Callable[[dict[str, Any]], dict[str, Any]]:
+        """Prepare parameter binding for repeated calls of a function.
+
+        The function signature is inspected and each configured parameter is
+        classified as static or `${state.field}` once, so binding for a call only
+        reads the referenced state fields.
+
+        Args:
+            func: The function to call
+            parameters: Parameter configuration from YAML
+
+        Returns:
+            A function taking the workflow state and returning the bound parameters
+        """
+        sig, static_params, state_fields = self._classify_parameters(func, parameters or {})
+        accepts_state = "state" in sig.parameters
+
+        def bind(state: dict[str, Any]) -> dict[str, Any]:
+            # Always pass state if function accepts it; a configured "state" parameter wins
+            bound_params = {"state": state, **static_params} if accepts_state else dict(static_params)
+            for param_name, field_name in state_fields:
+                bound_params[param_name] = state.get(field_name)
+            return bound_params
+
+        return bind
+
+    def state_caller(self, func: Callable, parameters: dict[str, Any] | None = None) -> Callable[[dict[str, Any]], Any]:
+        """Prepare a function to be called with the workflow state alone.
+
+        Static parameters are bound once with `functools.partial`, so a call only
+        passes the state and any `${state.field}` values. When `state` is the first
+        positional parameter it is passed positionally, which avoids building a
+        keyword dict per call. Calls receive the same arguments as `parameter_binder`
+        produces.
+
+        Args:
+            func: The function to call
+            parameters: Parameter configuration from YAML
+
+        Returns:
+            A function taking the workflow state and returning the function's result
+        """
+        sig, static_params, state_fields = self._classify_parameters(func, parameters or {})
+        # A configured "state" parameter wins over the workflow state
+        passes_state = "state" in sig.parameters and "state" not in static_params
+        bound = functools.partial(func, **static_params) if static_params else func
+
+        if state_fields:
+            def call_with_fields(state: dict[str, Any]) -> Any:
+                field_params = {param_name: state.get(field_name) for param_name, field_name in state_fields}
+                if passes_state:
+                    field_params["state"] = state
+                return bound(**field_params)
+
+            return call_with_fields
+
+        if not passes_state:
+            return lambda state: bound()
+
+        first_param = next(iter(sig.parameters.values()))
+        if first_param.name == "state" and first_param.kind in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        ):
+            return bound
+        return lambda state: bound(state=state)
+
+    def bind_parameters(self, func: Callable, state: dict[str, Any], parameters: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Bind workflow state and config parameters to function signature.
+
+        Callers binding the same function repeatedly should build a
+        `parameter_binder` once instead.
+
+        Args:
+            func: The function to call
+            state: Current workflow state
+            parameters: Parameter configuration from YAML
+
+        Returns:
+            Dictionary of bound parameters ready for function call
+        """
+        return self.parameter_binder(func, parameters)(state)
 
 # Global instance
 function_loader = SimpleFunctionLoader()
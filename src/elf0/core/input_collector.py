@@ -95,6 +95,11 @@ def _collect_simple_input() -> str:
         # In testing environments, stdin/stdout/stderr might be redirected
         pass
 
+    # Piped input is read straight from stdin: input() would write its prompt to
+    # stdout (mixing it into workflow output) and flush on every call
+    if not sys.stdin.isatty():
+        return sys.stdin.readline().removesuffix("\n")
+
     try:
         return input("> ")
     except EOFError:
@@ -1,18 +1,96 @@
 # src/elf0/core/llm_client.py
+from collections import OrderedDict
+from concurrent.futures import Future
+import functools
+import itertools
 import logging
+from secrets import SystemRandom
+import threading
+import time
 from typing import TYPE_CHECKING, Any, Protocol
+import weakref
 
 import openai
 
 from .spec import LLM as LLMSpecModel
 
+logger = logging.getLogger(__name__)
+
 # HTTP Status Code Constants
 HTTP_TOO_MANY_REQUESTS = 429
 HTTP_SERVER_ERROR_THRESHOLD = 500
 
+# LLM param that sets the size of the per-client response cache; its value is the
+# maximum number of prompts to remember (0 disables caching)
+RESPONSE_CACHE_SIZE_PARAM = "response_cache_size"
+
+# Anthropic LLM param that marks the system prompt as a cacheable prompt prefix, so
+# repeated calls with the same system prompt are billed and processed as cache reads
+CACHE_SYSTEM_PROMPT_PARAM = "cache_system_prompt"
+
+# Response cache size used when the param is absent and the LLM's temperature is 0,
+# since a deterministic request repeated with the same prompt gives the same answer
+DETERMINISTIC_RESPONSE_CACHE_SIZE = 128
+
+# Source of retry jitter, shared rather than created for every request
+_secure_random = SystemRandom()
+
 if TYPE_CHECKING:
     from openai.types.chat import ChatCompletionMessageParam
 
+# OpenAI-compatible clients shared by providers with the same connection settings, so
+# every LLM on an endpoint reuses one pool of keep-alive HTTP connections. Entries are
+# weak so a client is released once no provider uses it any more.
+_openai_clients: weakref.WeakValueDictionary[tuple[str, str | None, int], openai.OpenAI] = weakref.WeakValueDictionary()
+_openai_clients_lock = threading.Lock()
+
+
+def _get_openai_client(api_key: str, base_url: str | None, max_retries: int) -> openai.OpenAI:
+    """Return the shared OpenAI client for an API key, base URL and retry limit.
+
+    Args:
+        api_key: The API key the client authenticates with.
+        base_url: The API base URL, or None for the OpenAI default.
+        max_retries: How many times the client retries failed requests.
+
+    Returns:
+        An `openai.OpenAI` client, created on first use for these settings.
+    """
+    client_key = (api_key, base_url, max_retries)
+    with _openai_clients_lock:
+        client = _openai_clients.get(client_key)
+        if client is None:
+            client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries)
+            _openai_clients[client_key] = client
+    return client
+
+
+# Anthropic clients shared by every provider with the same API key, held weakly
+_anthropic_clients: weakref.WeakValueDictionary[str, Any] = weakref.WeakValueDictionary()
+_anthropic_clients_lock = threading.Lock()
+
+
+def _get_anthropic_client(api_key: str) -> Any:
+    """Return the shared Anthropic client for an API key.
+
+    Args:
+        api_key: The API key the client authenticates with.
+
+    Returns:
+        An `anthropic.Anthropic` client, created on first use for this key.
+
+    Raises:
+        ImportError: If the `anthropic` package is not installed.
+    """
+    with _anthropic_clients_lock:
+        client = _anthropic_clients.get(api_key)
+        if client is None:
+            import anthropic
+
+            client = anthropic.Anthropic(api_key=api_key)
+            _anthropic_clients[api_key] = client
+    return client
+
 
 # Protocol for LLM Providers
 class BaseLLMProvider(Protocol):
@@ -54,11 +132,27 @@ class OpenAIProvider(BaseLLMProvider):
         if not self.api_key:
             msg = "OpenAI API key is required."
             raise ValueError(msg)
-        openai.api_key = self.api_key
+        # Clients are shared per API key, so providers with the same key reuse pooled
+        # connections without mutating the global openai.api_key
+        self.client = _get_openai_client(
+            self.api_key,
+            None,
+            self.params.get("max_retries", openai.DEFAULT_MAX_RETRIES),
+        )
+
+        # Request arguments that are the same for every call, omitting temperature
+        # if it is None or the OpenAI default (1)
+        max_tokens = self.params.get("max_tokens")
+        self._base_create_kwargs: dict[str, Any] = {
+            "model": self.model_name,
+            **({"max_tokens": max_tokens} if max_tokens is not None else {})
+        }
+        if self.temperature is not None and self.temperature != 1:
+            self._base_create_kwargs["temperature"] = self.temperature
+        self._create_completion = functools.partial(self.client.chat.completions.create, **self._base_create_kwargs)
 
     def generate(self, prompt: str, system_prompt: str | None = None) -> str:
         """Generate response using OpenAI."""
-        max_tokens = self.params.get("max_tokens")
         # Allow system_prompt from params to override the direct argument for backward compatibility or spec-driven system_prompt
         final_system_prompt = self.params.get("system_prompt", system_prompt)
 
@@ -73,24 +167,18 @@ class OpenAIProvider(BaseLLMProvider):
             "content": prompt
         })
 
-        # Build kwargs dynamically, omitting temperature if it is None or default (1)
-        create_kwargs: dict[str, Any] = {
-            "model": self.model_name,
-            "messages": messages,
-            **({"max_tokens": max_tokens} if max_tokens is not None else {})
-        }
-
-        # Only include temperature if it's not the OpenAI default (1)
-        if self.temperature is not None and self.temperature != 1:
-            create_kwargs["temperature"] = self.temperature
-
         try:
-            response = openai.chat.completions.create(**create_kwargs)
+            response = self._create_completion(messages=messages)
         except openai.BadRequestError as e:  # type: ignore[attr-defined]
-            # Handle models that reject non-default temperature. Retry without it once.
-            if ("temperature" in str(e).lower()) and ("unsupported" in str(e).lower()) and ("default" in str(e).lower()):
-                create_kwargs.pop("temperature", None)
-                response = openai.chat.completions.create(**create_kwargs)
+            # Handle models that reject non-default temperature. Retry without it once,
+            # and leave it out of later requests so they don't fail the same way.
+            error_text = str(e).lower()
+            if "temperature" in error_text and "unsupported" in error_text and "default" in error_text:
+                self._base_create_kwargs.pop("temperature", None)
+                self._create_completion = functools.partial(
+                    self.client.chat.completions.create, **self._base_create_kwargs
+                )
+                response = self._create_completion(messages=messages)
             else:
                 raise
 
@@ -112,8 +200,7 @@ class AnthropicProvider(BaseLLMProvider):
             raise ValueError(msg)
 
         try:
-            import anthropic
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = _get_anthropic_client(self.api_key)
         except ImportError:
             msg = (
                 "The 'anthropic' package is required to use AnthropicProvider. "
@@ -123,41 +210,44 @@ class AnthropicProvider(BaseLLMProvider):
                 msg
             )
 
-    def generate(self, prompt: str, system_prompt: str | None = None) -> str:
-        """Generate response using Anthropic with retry logic for transient errors."""
-        from secrets import SystemRandom
-        import time
-
-        logger = logging.getLogger(__name__)
-        secure_random = SystemRandom()
-
-        # Get retry configuration from params
+        # The retry schedule only depends on the params, so the backoff delays
+        # (before jitter) are computed once rather than on every failure
         max_retries = self.params.get("max_retries", 3)
         initial_delay = self.params.get("retry_delay", 1.0)
         max_delay = self.params.get("max_retry_delay", 60.0)
         backoff_factor = self.params.get("retry_backoff_factor", 2.0)
+        self._retry_delays = tuple(
+            min(initial_delay * (backoff_factor ** attempt), max_delay) for attempt in range(max_retries)
+        )
+        self._base_message_kwargs = {
+            "model": self.model_name,
+            "max_tokens": self.params.get("max_tokens", 4096),  # Anthropic's default max
+            "temperature": self.temperature,
+        }
 
+    def generate(self, prompt: str, system_prompt: str | None = None) -> str:
+        """Generate response using Anthropic with retry logic for transient errors."""
+        max_retries = len(self._retry_delays)
         last_exception = None
 
         for attempt in range(max_retries + 1):
             try:
-                # Get parameters with sensible defaults
-                max_tokens = self.params.get("max_tokens", 4096)  # Anthropic's default max
                 final_system_prompt = self.params.get("system_prompt", system_prompt)
 
-                # Prepare messages
-                messages = [{"role": "user", "content": prompt}]
-
                 # Build kwargs for the API call
                 kwargs = {
-                    "model": self.model_name,
-                    "max_tokens": max_tokens,
-                    "temperature": self.temperature,
-                    "messages": messages
+                    **self._base_message_kwargs,
+                    "messages": [{"role": "user", "content": prompt}],
                 }
 
                 # Only add system if it has a value
-                if final_system_prompt:
+                if final_system_prompt and self.params.get(CACHE_SYSTEM_PROMPT_PARAM):
+                    kwargs["system"] = [{
+                        "type": "text",
+                        "text": final_system_prompt,
+                        "cache_control": {"type": "ephemeral"}
+                    }]
+                elif final_system_prompt:
                     kwargs["system"] = final_system_prompt
 
                 # Create the completion
@@ -174,16 +264,17 @@ class AnthropicProvider(BaseLLMProvider):
                 if hasattr(e, "status_code"):
                     # Retry on server errors (5xx) and rate limiting (429)
                     is_retryable = e.status_code >= HTTP_SERVER_ERROR_THRESHOLD or e.status_code == HTTP_TOO_MANY_REQUESTS
-                elif "overloaded" in str(e).lower() or "rate limit" in str(e).lower():
-                    is_retryable = True
+                else:
+                    error_text = str(e).lower()
+                    is_retryable = "overloaded" in error_text or "rate limit" in error_text
 
                 # If this is the last attempt or not retryable, raise the error
                 if attempt >= max_retries or not is_retryable:
                     break
 
-                # Calculate delay with exponential backoff and jitter
-                delay = min(initial_delay * (backoff_factor ** attempt), max_delay)
-                jitter = secure_random.uniform(0.1, 0.3) * delay  # Add 10-30% jitter
+                # Exponential backoff from the precomputed schedule, plus jitter
+                delay = self._retry_delays[attempt]
+                jitter = _secure_random.uniform(0.1, 0.3) * delay  # Add 10-30% jitter
                 final_delay = delay + jitter
 
                 logger.warning(f"Anthropic API error (attempt {attempt + 1}/{max_retries + 1}): {e}")
@@ -196,21 +287,45 @@ class AnthropicProvider(BaseLLMProvider):
 
 # Ollama Provider Implementation (Local, no API key)
 class OllamaProvider(BaseLLMProvider):
-    """LLM Provider for Ollama models."""
+    """LLM Provider for Ollama models.
+
+    `params.base_url` may list several Ollama servers separated by commas; requests
+    are then spread across them in round-robin order.
+    """
 
     def __init__(self, model_name: str, api_key: str | None, temperature: float, params: dict[str, Any]):
         self.model_name = model_name
         self.temperature = temperature
         self.params = params
-        self.base_url = self.params.get("base_url", "http://localhost:11434") # Default Ollama URL
+        base_urls = [
+            url.strip()
+            for url in str(self.params.get("base_url", "http://localhost:11434")).split(",") # Default Ollama URL
+            if url.strip()
+        ]
+        self.base_url = base_urls[0]
 
         # For Ollama, we use the openai client but point it to the Ollama server
         # API key is not typically used unless Ollama server is configured to require it.
-        self.client = openai.OpenAI(base_url=f"{self.base_url}/v1", api_key="ollama") # api_key can be dummy for local
+        self.clients = [
+            _get_openai_client("ollama", f"{base_url}/v1", openai.DEFAULT_MAX_RETRIES) # api_key can be dummy for local
+            for base_url in base_urls
+        ]
+        self.client = self.clients[0]
+
+        # Bind the request arguments that are the same for every call
+        max_tokens = self.params.get("max_tokens")
+        self._create_completions = itertools.cycle([
+            functools.partial(
+                client.chat.completions.create,
+                model=self.model_name,
+                temperature=self.temperature,
+                **({"max_tokens": max_tokens} if max_tokens is not None else {})
+            )
+            for client in self.clients
+        ])
 
     def generate(self, prompt: str, system_prompt: str | None = None) -> str:
         """Generate response using Ollama with OpenAI client compatibility."""
-        max_tokens = self.params.get("max_tokens")
         final_system_prompt = self.params.get("system_prompt", system_prompt)
 
         messages: list[ChatCompletionMessageParam] = []
@@ -224,12 +339,7 @@ class OllamaProvider(BaseLLMProvider):
             "content": prompt
         })
 
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            temperature=self.temperature,
-            **({"max_tokens": max_tokens} if max_tokens is not None else {})
-        )
+        response = next(self._create_completions)(messages=messages)
 
         content = response.choices[0].message.content
         return content if content is not None else ""
@@ -276,9 +386,34 @@ class LLMClient:
             params=self.spec.params
         )
 
+        # Optional LRU of prompt -> response. Model, temperature and system prompt are
+        # fixed per client, so the prompt alone identifies a request.
+        default_cache_size = DETERMINISTIC_RESPONSE_CACHE_SIZE if self.spec.temperature == 0 else 0
+        self._response_cache_size = int(self.spec.params.get(RESPONSE_CACHE_SIZE_PARAM, default_cache_size))
+        self.response_cache_hits = 0
+        self.response_cache_misses = 0
+        self._response_cache: OrderedDict[str, str] = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        # Prompts currently being generated, so concurrent duplicates wait on one request
+        self._pending_responses: dict[str, Future[str]] = {}
+        # System prompt can be part of params in the spec
+        self._system_prompt = self.spec.params.get("system_prompt")
+
     def generate(self, prompt: str) -> str:
         """Generate a response from the configured LLM for the given prompt.
 
+        When the LLM spec sets `params.response_cache_size`, or leaves it unset with a
+        temperature of 0, responses are cached per client and a repeated prompt is
+        answered without calling the provider. Hits and misses are counted in
+        `response_cache_hits` and `response_cache_misses`.
+
+        Responses are requested without streaming: every consumer (routing
+        conditions, judge score parsing, structured output, prompt templates of
+        the next node) needs the complete text, so partial chunks would not let
+        downstream work start any earlier.
+        Concurrent calls with the same prompt (e.g. parallel branches) then share a
+        single in-flight request instead of each calling the provider.
+
         Args:
             prompt: The input prompt to send to the LLM.
 
@@ -288,40 +423,52 @@ class LLMClient:
         Raises:
             RuntimeError: If there's an error generating a response.
         """
+        if self._response_cache_size <= 0:
+            return self._generate_uncached(prompt)
+
+        with self._response_cache_lock:
+            cached = self._response_cache.get(prompt)
+            if cached is not None:
+                self._response_cache.move_to_end(prompt)
+                self.response_cache_hits += 1
+                return cached
+            pending = self._pending_responses.get(prompt)
+            is_owner = pending is None
+            if pending is None:
+                pending = Future()
+                self._pending_responses[prompt] = pending
+                self.response_cache_misses += 1
+            else:
+                self.response_cache_hits += 1
+
+        if not is_owner:
+            # Another thread is already generating this prompt; wait for its result
+            return pending.result()
+
+        try:
+            response = self._generate_uncached(prompt)
+        except BaseException as e:
+            with self._response_cache_lock:
+                del self._pending_responses[prompt]
+            pending.set_exception(e)
+            raise
+
+        with self._response_cache_lock:
+            self._response_cache[prompt] = response
+            self._response_cache.move_to_end(prompt)
+            while len(self._response_cache) > self._response_cache_size:
+                self._response_cache.popitem(last=False)
+            del self._pending_responses[prompt]
+        pending.set_result(response)
+        return response
+
+    def _generate_uncached(self, prompt: str) -> str:
+        """Call the provider for a prompt, wrapping provider errors in RuntimeError."""
         try:
-            # System prompt can be part of params in the spec
-            system_prompt_from_spec = self.spec.params.get("system_prompt")
-            return self.provider.generate(prompt, system_prompt=system_prompt_from_spec) # type: ignore
+            return self.provider.generate(prompt, system_prompt=self._system_prompt) # type: ignore
         except Exception as e:
             # Catch potential NotImplementedError from Anthropic placeholder
             if isinstance(e, NotImplementedError):
                 raise
             msg = f"Error generating response from LLM provider {self.spec.type} (model {self.spec.model_name}): {e!s}"
             raise RuntimeError(msg)
-
-# Example of how create_llm_config from config.py would be used with LLMSpecModel
-# This is conceptual, as the actual instantiation will happen in the compiler.
-#
-# from .config import create_llm_config
-#
-# raw_spec_from_yaml = {
-#     'type': 'openai',
-#     'model_name': 'gpt-4o-mini',
-#     'temperature': 0.5,
-#     'params': {'max_tokens': 100}
-# }
-#
-# # 1. Create the Pydantic model from the raw dict
-# pydantic_llm_spec = LLMSpecModel(**raw_spec_from_yaml)
-#
-# # 2. Populate/override API key using create_llm_config
-# # create_llm_config now needs the llm_type to fetch the correct key
-# config_with_api_key = create_llm_config(pydantic_llm_spec.model_dump(), llm_type=pydantic_llm_spec.type)
-#
-# # 3. Update the pydantic_llm_spec with the api_key from config_with_api_key
-# # This step is crucial: LLMSpecModel needs an api_key field or create_llm_config needs to return LLMSpecModel
-# # Assuming LLMSpecModel will be updated to include an Optional[str] api_key field:
-# # pydantic_llm_spec_with_key = LLMSpecModel(**config_with_api_key.model_dump())
-#
-# # 4. Then, LLMClient can be initialized
-# # client = LLMClient(pydantic_llm_spec_with_key)
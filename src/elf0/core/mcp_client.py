@@ -1,9 +1,23 @@
 # src/elf/core/mcp_client.py
 import asyncio
-import json
 import logging
 from typing import Any
 
+# JSON-RPC messages are encoded with orjson when it is installed (the `orjson` extra)
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 class MCPError(Exception):
@@ -87,8 +101,7 @@ class SimpleMCPClient:
         }
 
         # Send request
-        request_line = json.dumps(request) + "\n"
-        self.process.stdin.write(request_line.encode())
+        self.process.stdin.write(_dumps(request) + b"\n")
         await self.process.stdin.drain()
 
         # Read response
@@ -97,7 +110,8 @@ class SimpleMCPClient:
             msg = "No response from MCP server"
             raise MCPConnectionError(msg)
 
-        response = json.loads(response_line.decode().strip())
+        # JSON parsers accept the trailing newline, so the line is parsed as read
+        response = _loads(response_line)
 
         if "error" in response:
             msg = f"MCP Error: {response['error']}"
@@ -2,10 +2,14 @@
 from collections.abc import Callable
 import json
 import logging
+import re
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# ${state.field} references in prompts; the field may be a dotted path
+_STATE_REFERENCE_PATTERN = re.compile(r"\$\{state\.([^}]+)\}")
+
 # Type annotations for conditionally imported SDK components
 claude_code_sdk: Callable | None = None
 ClaudeCodeOptions: type | None = None
@@ -141,11 +145,7 @@ class ClaudeCodeNode:
         """Bind template parameters in prompt from state."""
         bound_prompt = self.prompt
 
-        # Simple template substitution for ${state.field} patterns
-        import re
-        pattern = r"\$\{state\.([^}]+)\}"
-
-        def replace_match(match):
+        def replace_match(match: re.Match[str]) -> str:
             field_path = match.group(1)
             # Support nested field access like "output" or "structured_data.field"
             field_parts = field_path.split(".")
@@ -157,7 +157,10 @@ class ClaudeCodeNode:
                     return match.group(0)  # Return original if field not found
             return str(value)
 
-        bound_prompt = re.sub(pattern, replace_match, bound_prompt)
+        # Simple template substitution for ${state.field} patterns; most prompts
+        # have none, so the substitution is skipped unless the marker is present
+        if "${state." in bound_prompt:
+            bound_prompt = _STATE_REFERENCE_PATTERN.sub(replace_match, bound_prompt)
 
         # Also support simple {input} substitution for compatibility
         if "{input}" in bound_prompt:
@@ -1,11 +1,55 @@
 # src/elf/core/nodes/mcp_node.py
+import asyncio
 import logging
+import threading
 from typing import Any
+import weakref
 
-from elf0.core.mcp_client import MCPConnectionError, SimpleMCPClient
+from elf0.core.mcp_client import MCPConnectionError, MCPToolError, SimpleMCPClient
 
 logger = logging.getLogger(__name__)
 
+# Event loop that owns the processes of keep-alive MCP servers. asyncio subprocess
+# pipes belong to the loop that started them, while each node call runs on a loop
+# of its own, so kept servers are only ever talked to from this one.
+_server_loop: asyncio.AbstractEventLoop | None = None
+_server_loop_lock = threading.Lock()
+
+
+def _get_server_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop for keep-alive servers, starting its thread on first use."""
+    global _server_loop
+    with _server_loop_lock:
+        if _server_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="elf0-mcp-servers", daemon=True).start()
+            _server_loop = loop
+        return _server_loop
+
+
+def _release_kept_client(client: SimpleMCPClient) -> None:
+    """Stop a keep-alive server process on the server loop.
+
+    Registered as a finalizer of the node that owns the client, so the server is
+    stopped when the node is garbage collected (for example once its compiled
+    workflow is evicted from the cache) and at interpreter exit at the latest.
+    """
+    loop = _server_loop
+    if loop is None or loop.is_closed():
+        return
+    future = asyncio.run_coroutine_threadsafe(client.disconnect(), loop)
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        # Collected on the server loop itself, which must not block on its own work
+        return
+    try:
+        future.result(timeout=5)
+    except Exception as e:
+        logger.warning(f"[yellow]⚠ Could not stop MCP server {client.command}: {e}[/yellow]")
+
 class MCPNode:
     """MVP MCP node - basic tool execution."""
 
@@ -14,10 +58,38 @@ class MCPNode:
         self.server_cwd = config["server"].get("cwd")
         self.tool_name = config["tool"]
         self.parameters = config.get("parameters", {})
+        # Keep-alive nodes start their server once and reuse it for later calls
+        self.keep_alive = bool(config["server"].get("keep_alive", False))
         self.client = None
+        self._client_lock: asyncio.Lock | None = None
+        # Stops the kept server when this node is collected or the interpreter exits
+        self._client_finalizer: weakref.finalize | None = None
+        # Templates are parsed once here, so binding a call only reads the state
+        self._parameter_plan = [self._plan_parameter(key, value) for key, value in self.parameters.items()]
+
+    @staticmethod
+    def _plan_parameter(key: str, value: Any) -> tuple[str, str, str | None, Any]:
+        """Classify a configured parameter as a static value, state lookup or JSON extraction.
+
+        Returns:
+            A (key, kind, name, value) tuple, where `name` is the state field or JSON
+            key to read and `value` is the configured value.
+        """
+        if isinstance(value, str) and value.startswith("${"):
+            # Template substitution
+            var_name = value[2:-1].replace("state.", "")
+            # Special handling for JSON extraction from previous output
+            if var_name.startswith("json."):
+                return key, "json", var_name[5:], value  # Remove "json." prefix
+            return key, "state", var_name, value
+        return key, "static", None, value
 
     async def execute(self, state: dict[str, Any]) -> dict[str, Any]:
         """Execute MCP tool and update state."""
+        if self.keep_alive:
+            call = asyncio.run_coroutine_threadsafe(self._call_kept_server(state), _get_server_loop())
+            return self._store_result(state, await asyncio.wrap_future(call))
+
         # Connect to server
         self.client = SimpleMCPClient(self.server_command, cwd=self.server_cwd)
         connected = await self.client.connect()
@@ -32,25 +104,74 @@ class MCPNode:
 
             # Execute tool
             result = await self.client.call_tool(self.tool_name, bound_params)
+            return self._store_result(state, result)
+
+        finally:
+            await self.client.disconnect()
 
-            # Extract text content from MCP result format
-            if "content" in result and isinstance(result["content"], list):
-                # Find first text content
-                for content_item in result["content"]:
-                    if content_item.get("type") == "text":
-                        state["output"] = content_item["text"]
-                        break
-                else:
-                    state["output"] = str(result)
+    async def _call_kept_server(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Call the tool on this node's long-lived server, starting it when needed.
+
+        Runs on the keep-alive server loop. Calls are serialized because the stdio
+        transport reads each response as the next line from the server.
+        """
+        if self._client_lock is None:
+            self._client_lock = asyncio.Lock()
+        async with self._client_lock:
+            client = self.client
+            if client is None or client.process is None or client.process.returncode is not None:
+                self._forget_kept_client()
+                client = SimpleMCPClient(self.server_command, cwd=self.server_cwd)
+                if not await client.connect():
+                    await client.disconnect()
+                    msg = "Failed to connect to MCP server"
+                    raise MCPConnectionError(msg)
+                self.client = client
+                self._client_finalizer = weakref.finalize(self, _release_kept_client, client)
+
+            try:
+                return await client.call_tool(self.tool_name, self._bind_parameters(state))
+            except MCPToolError:
+                # The server answered with an error, so it is still usable
+                raise
+            except Exception:
+                # The stream may be out of step with the server; start afresh next call
+                self._forget_kept_client()
+                await client.disconnect()
+                raise
+
+    def _forget_kept_client(self) -> None:
+        """Drop the kept client without stopping it; callers stop or replace its process."""
+        if self._client_finalizer is not None:
+            self._client_finalizer.detach()
+            self._client_finalizer = None
+        self.client = None
+
+    def close(self) -> None:
+        """Stop this node's keep-alive server, if one is running."""
+        if self._client_finalizer is not None:
+            self._client_finalizer()
+            self._client_finalizer = None
+        self.client = None
+
+    @staticmethod
+    def _store_result(state: dict[str, Any], result: dict[str, Any]) -> dict[str, Any]:
+        """Write an MCP tool result into the state."""
+        # Extract text content from MCP result format
+        if "content" in result and isinstance(result["content"], list):
+            # Find first text content
+            for content_item in result["content"]:
+                if content_item.get("type") == "text":
+                    state["output"] = content_item["text"]
+                    break
             else:
                 state["output"] = str(result)
+        else:
+            state["output"] = str(result)
 
-            # Also store raw MCP result
-            state["mcp_result"] = result
-            return state
-
-        finally:
-            await self.client.disconnect()
+        # Also store raw MCP result
+        state["mcp_result"] = result
+        return state
 
     def _extract_json_from_dynamic_state(self, dynamic_state: dict, json_key: str) -> tuple[Any, bool]:
         """Extract JSON value from dynamic_state."""
@@ -129,18 +250,12 @@ class MCPNode:
     def _bind_parameters(self, state: dict[str, Any]) -> dict[str, Any]:
         """Enhanced parameter binding from state with JSON parsing support."""
         bound = {}
-        for key, value in self.parameters.items():
-            if isinstance(value, str) and value.startswith("${"):
-                # Template substitution
-                var_name = value[2:-1].replace("state.", "")
-
-                # Special handling for JSON extraction from previous output
-                if var_name.startswith("json."):
-                    # Extract from JSON in output field or dynamic_state
-                    json_key = var_name[5:]  # Remove "json." prefix
-                    bound[key] = self._handle_json_parameter(key, json_key, state)
-                else:
-                    bound[key] = state.get(var_name, value)
+        for key, kind, name, value in self._parameter_plan:
+            if kind == "state":
+                bound[key] = state.get(name, value)
+            elif kind == "json":
+                # Extract from JSON in output field or dynamic_state
+                bound[key] = self._handle_json_parameter(key, name, state)
             else:
                 bound[key] = value
         return bound
@@ -1,11 +1,48 @@
 from pathlib import Path
 from typing import Any
 
+from elf0.core.compile_cache import CachedWorkflow, compiled_workflow_cache
 from elf0.core.compiler import compile_to_langgraph
 from elf0.core.spec import load_spec
 
 from .exceptions import UserExitRequested
 
+# Upper bound on the nodes LangGraph runs at once when a workflow fans out. Nodes
+# mostly wait on LLM, MCP and tool I/O, so this is set above the CPU-based default
+# thread pool size rather than derived from the core count.
+MAX_CONCURRENT_NODES = 64
+
+
+def load_compiled_workflow(spec_path: Path) -> CachedWorkflow:
+    """Load and compile a workflow, reusing the cached graph if the spec is unchanged.
+
+    Args:
+        spec_path: Path to the YAML spec file
+
+    Returns:
+        The cached workflow holding the spec and its compiled graph
+
+    Raises:
+        ValueError: If the spec targets an unsupported runtime
+    """
+    spec_path = Path(spec_path)  # Callers may pass a plain string
+    cached = compiled_workflow_cache.get(spec_path)
+    if cached is not None:
+        return cached
+
+    # Load and validate the spec, recording every file it pulls in via references
+    loaded_files: list[Path] = []
+    spec = load_spec(str(spec_path), loaded_files=loaded_files)
+
+    # Compile to appropriate runtime
+    if spec.runtime != "langgraph":
+        msg = f"Unsupported runtime: {spec.runtime}"
+        raise ValueError(msg)
+
+    # For LangGraph 0.4.3, we need to compile the graph first
+    compiled = compile_to_langgraph(spec).compile()
+    return compiled_workflow_cache.put(spec_path, spec, compiled, loaded_files)
+
 
 def run_workflow(spec_path: Path, prompt: str, session_id: str) -> dict[str, Any]:
     """Run a workflow defined in a YAML spec file.
@@ -22,28 +59,20 @@ def run_workflow(spec_path: Path, prompt: str, session_id: str) -> dict[str, Any
         UserExitRequested: When user requests to exit via /exit, /quit, or /bye
     """
     try:
-        # Load and validate the spec
-        spec = load_spec(str(spec_path))
-
-        # Compile to appropriate runtime
-        if spec.runtime == "langgraph":
-            graph = compile_to_langgraph(spec)
-            # For LangGraph 0.4.3, we need to compile the graph first
-            compiled = graph.compile()
-            # Then we can invoke it
-            result = compiled.invoke(
-                {"input": prompt},
-                config={"configurable": {"thread_id": session_id}}
-            )
-
-            # Check if user requested to exit during workflow execution
-            if result.get("user_exit_requested"):
-                msg = "User requested to exit during workflow execution"
-                raise UserExitRequested(msg)
-
-            return result
-        msg = f"Unsupported runtime: {spec.runtime}"
-        raise ValueError(msg)
+        workflow = load_compiled_workflow(spec_path)
+
+        # Then we can invoke it
+        result = workflow.graph.invoke(
+            {"input": prompt},
+            config={"configurable": {"thread_id": session_id}, "max_concurrency": MAX_CONCURRENT_NODES}
+        )
+
+        # Check if user requested to exit during workflow execution
+        if result.get("user_exit_requested"):
+            msg = "User requested to exit during workflow execution"
+            raise UserExitRequested(msg)
+
+        return result
 
     except UserExitRequested:
         # Re-raise to let the CLI handle the exit gracefully
@@ -1,7 +1,9 @@
 # src/elf/core/spec.py
+from collections import OrderedDict
 from collections.abc import Callable
 import json
 from pathlib import Path
+import threading
 from typing import (
     Any,
     ClassVar,
@@ -12,7 +14,9 @@ from typing import (
 from pydantic import BaseModel, Field, ValidationInfo, field_validator, model_validator
 import yaml
 
-from elf0.utils.yaml_loader import load_yaml_file
+from elf0.core.config import get_env_int
+from elf0.utils.file_fingerprints import FileFingerprints
+from elf0.utils.yaml_loader import load_yaml_file, parse_yaml
 
 
 class CircularReferenceError(Exception):
@@ -198,12 +202,15 @@ class WorkflowNode(BaseModel):
     that determines its behavior, and a `ref` that points to a specific LLM,
     function, or sub-workflow configuration defined elsewhere in the `Spec`.
     The `stop` flag indicates if the workflow should terminate after this node executes.
+    An `output_key` (here or in `config`) also keeps the node's output under that name,
+    so later prompts can read it as `{state.<output_key>}`.
     """
 
     id: str
     kind: Literal["agent", "tool", "judge", "branch", "mcp", "claude_code"]
     ref: str | None = None     # key into llms/functions/sub-workflows (not used for MCP nodes)
     config: dict[str, Any] = Field(default_factory=dict)
+    output_key: str | None = None
     stop: bool = False
 
 class Edge(BaseModel):
@@ -235,13 +242,15 @@ class Workflow(BaseModel):
     Contains the `type` of workflow pattern (e.g., 'sequential', 'react'), a list
     of `WorkflowNode` definitions, and a list of `Edge` definitions that connect them.
     `max_iterations` can optionally limit the number of cycles in looped workflows.
-    This model orchestrates how nodes and edges form the executable graph.
+    `parallel_roots` opts in to starting nodes that no edge leads to alongside the
+    entry point; otherwise such nodes never run. This model orchestrates how nodes and edges form the executable graph.
     """
 
     type: Literal["sequential", "react", "evaluator_optimizer", "custom_graph"]
     nodes: list[WorkflowNode]
     edges: list[Edge]
     max_iterations: int | None = Field(default=None, description="Maximum number of iterations for the workflow loop.")
+    parallel_roots: bool = Field(default=False, description="Start nodes that no edge leads to alongside the entry point.")
 
     @model_validator(mode="after")
     def validate_workflow_structure(self) -> "Workflow":
@@ -363,7 +372,7 @@ class Spec(BaseModel):
                 return False, None, "YAML content is empty after cleaning"
 
             # Parse YAML content
-            data = yaml.safe_load(cleaned_yaml)
+            data = parse_yaml(cleaned_yaml)
             if data is None:
                 return False, None, "YAML content is empty or null"
 
@@ -458,7 +467,12 @@ class Spec(BaseModel):
         return cls.model_json_schema()
 
     @classmethod
-    def from_file(cls, spec_path: str, visited: set[Path] | None = None) -> "Spec":
+    def from_file(
+        cls,
+        spec_path: str,
+        visited: set[Path] | None = None,
+        loaded_files: list[Path] | None = None,
+    ) -> "Spec":
         """Loads, parses, and validates a workflow specification from a YAML file.
 
         Supports recursive loading with reference resolution and circular detection.
@@ -471,6 +485,8 @@ class Spec(BaseModel):
         Args:
             spec_path: The string path to the YAML specification file.
             visited: Set of already visited paths for circular reference detection.
+            loaded_files: Optional list that receives the resolved path of every
+                          spec file read, including referenced files.
 
         Returns:
             A validated `Spec` instance representing the workflow.
@@ -501,6 +517,8 @@ class Spec(BaseModel):
 
         # Add current path to visited set
         visited.add(path)
+        loaded_files = [] if loaded_files is None else loaded_files
+        loaded_files.append(path)
 
         try:
             # Load YAML data
@@ -541,7 +559,7 @@ class Spec(BaseModel):
                         # Recursively load the referenced spec
                         # For the first reference, it becomes the base.
                         # For subsequent references, they merge into the accumulated base.
-                        referenced_spec = cls.from_file(str(resolved_ref_path), visited.copy())
+                        referenced_spec = _load_referenced_spec(resolved_ref_path, visited, loaded_files)
                         new_data_to_merge = referenced_spec.model_dump(exclude_none=True)
 
                         if not accumulated_base_data: # First reference
@@ -610,14 +628,109 @@ class Spec(BaseModel):
         factory = cls._workflow_patterns[pattern]
         return factory(**kwargs)
 
-def load_spec(spec_path: str) -> Spec:
+# Maximum number of loaded specs kept in memory, tunable for long-running hosts
+MAX_CACHED_SPECS = get_env_int("ELF0_MAX_CACHED_SPECS", 100)
+
+# Validated specs keyed by resolved root path, stored with the fingerprints of the files
+# they were read from and, when the spec round-trips through it exactly, its JSON form
+_spec_cache: OrderedDict[Path, tuple[FileFingerprints, Spec, str | None]] = OrderedDict()
+_spec_cache_lock = threading.Lock()
+
+def clear_spec_cache() -> None:
+    """Remove all cached specs."""
+    with _spec_cache_lock:
+        _spec_cache.clear()
+
+def _fresh_cached_spec(key: Path) -> tuple[FileFingerprints, Spec, str | None] | None:
+    """Return the cached entry for a resolved spec path if none of its files changed."""
+    with _spec_cache_lock:
+        cached = _spec_cache.get(key)
+    if cached is None or not cached[0].is_fresh():
+        return None
+    with _spec_cache_lock:
+        if key in _spec_cache:
+            _spec_cache.move_to_end(key)
+    return cached
+
+def _round_trip_json(spec: Spec) -> str | None:
+    """Return the spec as JSON if validating that JSON rebuilds an equal spec, else None.
+
+    Values JSON can't represent exactly, such as YAML dates in a node config, would
+    come back changed, so specs holding them are copied rather than rebuilt.
+    """
+    spec_json = spec.model_dump_json()
+    try:
+        rebuilt = Spec.model_validate_json(spec_json)
+    except ValueError:
+        return None
+    return spec_json if rebuilt == spec else None
+
+def _independent_copy(spec: Spec, spec_json: str | None) -> Spec:
+    """Return a copy of a cached spec that callers may modify freely.
+
+    Rebuilding from JSON runs in pydantic's core and is several times faster than a
+    deep copy of the model tree.
+    """
+    if spec_json is not None:
+        return Spec.model_validate_json(spec_json)
+    return spec.model_copy(deep=True)
+
+def _cache_spec(key: Path, files: list[Path], spec: Spec) -> str | None:
+    """Store a validated spec with the fingerprints of the files it was read from.
+
+    The cache keeps `spec` itself, so callers must not modify it afterwards.
+
+    Returns:
+        The spec's JSON form if it was cached and round-trips exactly, else None.
+    """
+    try:
+        fingerprints = FileFingerprints(files)
+    except OSError:
+        return None
+    spec_json = _round_trip_json(spec)
+    with _spec_cache_lock:
+        _spec_cache[key] = (fingerprints, spec, spec_json)
+        _spec_cache.move_to_end(key)
+        while len(_spec_cache) > MAX_CACHED_SPECS:
+            _spec_cache.popitem(last=False)
+    return spec_json
+
+def _load_referenced_spec(ref_path: Path, visited: set[Path], loaded_files: list[Path]) -> Spec:
+    """Load a referenced spec, sharing the validated copy cached by `load_spec`.
+
+    A base spec referenced by several workflows is then parsed and validated once.
+    A cached spec loaded without error cannot lead back into the current chain, so
+    reusing it never hides a circular reference. The result is only read by the caller.
+    """
+    key = ref_path.resolve()
+    cached = _fresh_cached_spec(key)
+    if cached is not None:
+        fingerprints, spec, _ = cached
+        loaded_files.extend(fingerprints.paths)
+        return spec
+
+    files: list[Path] = []
+    spec = Spec.from_file(str(ref_path), visited.copy(), files)
+    loaded_files.extend(files)
+    _cache_spec(key, files, spec)
+    return spec
+
+def load_spec(spec_path: str, loaded_files: list[Path] | None = None) -> Spec:
     """Loads, parses, and validates a workflow specification from a YAML file.
 
-    This is a convenience function that directly calls `Spec.from_file(spec_path)`.
-    It provides a simple, top-level function for loading specifications.
+    This is a convenience function around `Spec.from_file(spec_path)` that caches
+    the validated spec per process. A cached spec is reused while the spec file and
+    every file it references are unchanged (same mtime and size, or else the same
+    content hash), skipping YAML parsing, reference merging and validation. Referenced specs are cached too,
+    so a shared base spec is validated once for all the workflows built on it.
+    Each call returns an independent copy, rebuilt from the cached spec's JSON when
+    it round-trips exactly, so callers are free to modify the result (the compiler
+    fills in API keys).
 
     Args:
         spec_path: The string path to the YAML specification file.
+        loaded_files: Optional list that receives the resolved path of every
+                      spec file read, including referenced files.
 
     Returns:
         A validated `Spec` instance.
@@ -626,7 +739,20 @@ def load_spec(spec_path: str) -> Spec:
         FileNotFoundError: If the YAML file does not exist.
         pydantic.ValidationError: If the YAML content is invalid against the `Spec` schema.
     """
-    return Spec.from_file(spec_path)
+    key = Path(spec_path).resolve()
+    cached = _fresh_cached_spec(key)
+    if cached is not None:
+        fingerprints, cached_spec, spec_json = cached
+        if loaded_files is not None:
+            loaded_files.extend(fingerprints.paths)
+        return _independent_copy(cached_spec, spec_json)
+
+    files: list[Path] = []
+    spec = Spec.from_file(spec_path, loaded_files=files)
+    if loaded_files is not None:
+        loaded_files.extend(files)
+    _cache_spec(key, files, spec.model_copy(deep=True))
+    return spec
 
 # Convenience factory methods for common workflow patterns
 def create_sequential_workflow(nodes: list[dict[str, Any]]) -> Workflow:
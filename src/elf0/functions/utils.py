@@ -1,58 +1,8 @@
 # src/elf/functions/utils.py
 """Utility functions for Elf workflows."""
 
-import sys
-import time
-
-from rich.console import Console
-
 from elf0.core.compiler import WorkflowState
 
-# Exit command constants
-EXIT_COMMANDS = {"/exit", "/quit", "/bye"}
-
-def _is_exit_command(response: str) -> bool:
-    """Check if response is an exit command."""
-    return response.strip().lower() in EXIT_COMMANDS
-
-def _show_exit_feedback() -> None:
-    """Show exit processing feedback with appropriate indicators."""
-    console = Console(stderr=True)
-
-    if sys.stderr.isatty():
-        # Rich terminal - use spinner for exit processing
-        with console.status("[dim]🚪 Processing exit request...[/dim]", spinner="dots"):
-            time.sleep(0.4)
-        console.print("[dim red]✗[/dim red] [dim]Exiting workflow...[/dim]")
-    else:
-        # Non-terminal - simple text indicators
-        console.print("[dim]🚪 Processing exit request...[/dim]")
-        console.print("[dim]✗ Exiting workflow...[/dim]")
-
-def _show_processing_feedback() -> None:
-    """Show normal input processing feedback."""
-    console = Console(stderr=True)
-
-    if sys.stderr.isatty():
-        # Rich terminal - use professional spinner with checkmark
-        with console.status("[dim]🤔 Processing your input...[/dim]", spinner="dots"):
-            time.sleep(0.6)
-        console.print("[dim green]✓[/dim green] [dim]Input received, continuing workflow...[/dim]")
-    else:
-        # Non-terminal - simple text indicator
-        console.print("[dim]🤔 Processing your input...[/dim]")
-        console.print("[dim]✓ Input received, continuing workflow...[/dim]")
-
-def _create_exit_state(state: WorkflowState, user_response: str) -> WorkflowState:
-    """Create workflow state for exit request."""
-    return {
-        **state,
-        "user_input": user_response,
-        "output": f"User requested to exit: {user_response}",
-        "user_exit_requested": True
-    }
-
-# Legacy functions removed - now using unified input_collector module
 
 def get_user_input(state: WorkflowState, prompt: str = "Please provide input:") -> WorkflowState:
     """Function that requests user input via CLI with multi-line support.
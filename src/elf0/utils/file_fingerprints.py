@@ -0,0 +1,57 @@
+# src/elf0/utils/file_fingerprints.py
+"""Change detection for files backing an in-memory cache."""
+
+from collections.abc import Iterable
+import hashlib
+from pathlib import Path
+
+# (mtime_ns, size) of a file
+FileStamp = tuple[int, int]
+
+
+def file_stamp(path: Path) -> FileStamp:
+    """Return the cheap freshness stamp (mtime, size) for a file."""
+    stat_result = path.stat()
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-1 content digest of a file."""
+    return hashlib.sha1(path.read_bytes(), usedforsecurity=False).hexdigest()
+
+
+class FileFingerprints:
+    """The stamps and content digests of a set of files, taken when they were read.
+
+    Raises:
+        OSError: From the constructor, if one of the files can't be read.
+    """
+
+    __slots__ = ("_digests", "_stamps")
+
+    def __init__(self, files: Iterable[Path]):
+        self._stamps: dict[Path, FileStamp] = {path: file_stamp(path) for path in files}
+        self._digests: dict[Path, str] = {path: file_digest(path) for path in self._stamps}
+
+    @property
+    def paths(self) -> list[Path]:
+        """The fingerprinted files, in the order they were given."""
+        return list(self._stamps)
+
+    def is_fresh(self) -> bool:
+        """Check that none of the files have changed since they were fingerprinted.
+
+        Files are compared by mtime and size first; only when those differ is the
+        content hash recomputed, so touching a file without editing it stays fresh.
+        """
+        for path, stamp in self._stamps.items():
+            try:
+                current_stamp = file_stamp(path)
+                if current_stamp == stamp:
+                    continue
+                if file_digest(path) != self._digests[path]:
+                    return False
+            except OSError:
+                return False
+            self._stamps[path] = current_stamp
+        return True
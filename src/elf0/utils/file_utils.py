@@ -1,18 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import mmap
+import os
 from pathlib import Path
 import re
-
-import yaml  # PyYAML library for YAML parsing
+import stat
 
 logger = logging.getLogger(__name__)
 
+# An @filename.ext reference in a prompt: '@' followed by one or more non-whitespace,
+# non-'@' characters, optionally followed by a dot and more such characters (for the
+# extension)
+_AT_REFERENCE_PATTERN = re.compile(r"@([^\s@]+(?:\.[^\s@]+)*)")
+
 def is_valid_file(path: Path) -> bool:
     """Check if a path exists and is a file."""
-    return path.exists() and path.is_file()
+    # is_file() is False for missing paths, so a single stat covers both checks
+    return path.is_file()
 
 def is_valid_directory(path: Path) -> bool:
     """Check if a path exists and is a directory."""
-    return path.exists() and path.is_dir()
+    return path.is_dir()
 
 def is_relevant_file(path: Path) -> bool:
     """Check if a file should be included in directory scanning."""
@@ -43,14 +51,15 @@ def is_relevant_file(path: Path) -> bool:
         return False
 
     # Handle extensionless files
-    if not suffix and path.is_file():
+    if not suffix:
         try:
-            # Simple size check
-            if path.stat().st_size > 1024 * 1024:  # 1MB
+            # One stat answers both "is it a regular file" and the size check (1MB)
+            stat_result = path.stat()
+            if not stat.S_ISREG(stat_result.st_mode) or stat_result.st_size > 1024 * 1024:
                 return False
-            # Basic text detection
+            # Basic text detection (read() stops at EOF, so no second stat is needed)
             with path.open("rb") as f:
-                sample = f.read(min(1024, path.stat().st_size))
+                sample = f.read(1024)
                 if not sample:
                     return False
                 # Check if mostly printable ASCII characters
@@ -75,13 +84,19 @@ def get_directory_files(directory: Path, max_files: int = 5) -> list[Path]:
     relevant_files = []
 
     try:
-        for item in directory.iterdir():
-            if item.is_file() and is_relevant_file(item):
-                relevant_files.append(item)
-                if len(relevant_files) >= max_files:
-                    logger.warning(f"Directory '@{directory}' contains many files. "
-                                 f"Only including first {max_files} relevant files.")
-                    break
+        # scandir reports the entry type from the directory listing itself,
+        # so non-files are skipped without a stat per entry
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                item = Path(entry.path)
+                if is_relevant_file(item):
+                    relevant_files.append(item)
+                    if len(relevant_files) >= max_files:
+                        logger.warning(f"Directory '@{directory}' contains many files. "
+                                     f"Only including first {max_files} relevant files.")
+                        break
 
         return sorted(relevant_files, key=lambda p: p.name.lower())
 
@@ -92,29 +107,92 @@ def get_directory_files(directory: Path, max_files: int = 5) -> list[Path]:
         logger.warning(f"Could not read directory '@{directory}': {e}")
         return []
 
+# Upper bound on threads used to read context files concurrently
+MAX_READ_WORKERS = 32
+
+# Files at least this large are memory-mapped rather than read into a bytes buffer;
+# must be positive, since empty files cannot be mapped
+MMAP_MIN_BYTES = 256 * 1024  # 256KB
+
+def read_text_file(path: Path) -> str:
+    """Read a UTF-8 text file with universal newlines, like `Path.read_text`.
+
+    Large files are decoded straight from a read-only memory map, so the raw
+    bytes are never copied into a second buffer before decoding.
+
+    Args:
+        path: Path to the file to read.
+
+    Returns:
+        The decoded file content.
+
+    Raises:
+        OSError: If the file cannot be opened or mapped.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_MIN_BYTES:  # Small files, including empty ones that cannot be mapped
+            content = f.read().decode("utf-8")
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mapped) as view:
+                    content = str(view, "utf-8")
+    # Match text-mode reads, which translate \r\n and \r to \n
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+def _read_context_file(file_path: Path) -> tuple[str, str] | None:
+    """Read one context file and build its filename header.
+
+    Returns:
+        A (header, content) pair, or None if the file could not be read.
+    """
+    try:
+        current_path = Path(file_path) # Ensure it's a Path object
+        content = read_text_file(current_path)
+    except OSError as e:
+        logger.warning(f"Could not read context file '{file_path}': {e}. Skipping.")
+        return None
+    # Show directory context for files from directories
+    if len(str(current_path.parent)) > 1:  # Not just "."
+        header = f"Content of {current_path.parent}/{current_path.name}"
+    else:
+        header = f"Content of {current_path.name}"
+    return header, content
+
 def read_files_content(files: list[Path]) -> str:
     """Read content from a list of files.
 
+    Multiple files are read concurrently in a thread pool; the output keeps the
+    order of `files`.
+
     Args:
         files: List of paths to files to read.
 
     Returns:
         Combined content from all valid files, with headers indicating filename.
     """
-    content_parts = []
-    for file_path in files:
-        try:
-            current_path = Path(file_path) # Ensure it's a Path object
-            with current_path.open(encoding="utf-8") as f:
-                # Show directory context for files from directories
-                if len(str(current_path.parent)) > 1:  # Not just "."
-                    header = f"Content of {current_path.parent}/{current_path.name}"
-                else:
-                    header = f"Content of {current_path.name}"
-                content_parts.append(f"{header}:\n{f.read()}\n---")
-        except OSError as e:
-            logger.warning(f"Could not read context file '{file_path}': {e}. Skipping.")
-    return "\n".join(content_parts)
+    if len(files) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(files))) as executor:
+            results = list(executor.map(_read_context_file, files))
+    else:
+        results = [_read_context_file(file_path) for file_path in files]
+
+    # Join all fragments at once so file contents are copied a single time,
+    # rather than into a per-file formatted string and again by the join
+    fragments: list[str] = []
+    for result in results:
+        if result is None:
+            continue
+        header, content = result
+        if fragments:
+            fragments.append("\n")
+        fragments.extend((header, ":\n", content, "\n---"))
+    return "".join(fragments)
 
 def parse_comma_separated_files(file_str: str) -> list[Path]:
     """Parse a comma-separated string of file paths.
@@ -127,11 +205,12 @@ def parse_comma_separated_files(file_str: str) -> list[Path]:
     """
     valid_files = []
     for f_name in file_str.split(","):
-        path = Path(f_name.strip())
+        name = f_name.strip()
+        path = Path(name)
         if is_valid_file(path):
             valid_files.append(path)
         else:
-            logger.warning(f"Context file '{f_name.strip()}' not found or is not a file. Skipping.")
+            logger.warning(f"Context file '{name}' not found or is not a file. Skipping.")
     return valid_files
 
 def parse_context_files(context_files_input: list[Path] | None) -> str:
@@ -150,6 +229,8 @@ def parse_context_files(context_files_input: list[Path] | None) -> str:
         return ""
 
     actual_files_to_read: list[Path] = []
+    # Paths already queued for reading; a set keeps deduplication O(1) per file
+    queued_files: set[Path] = set()
     processed_paths_for_deduplication = set() # To avoid processing the same file path string multiple times
 
     for path_item in context_files_input:
@@ -163,27 +244,22 @@ def parse_context_files(context_files_input: list[Path] | None) -> str:
         if "," in path_str:
             # Avoid reprocessing if this exact comma-separated string was already seen
             if path_str not in processed_paths_for_deduplication:
-                files_from_csv = parse_comma_separated_files(path_str)
-                for f in files_from_csv:
-                    # Add to actual_files_to_read only if not already added (by Path object equality)
-                    if f not in actual_files_to_read:
-                         actual_files_to_read.append(f)
+                for f in parse_comma_separated_files(path_str):
+                    if f not in queued_files:
+                        queued_files.add(f)
+                        actual_files_to_read.append(f)
                 processed_paths_for_deduplication.add(path_str)
         else:
             # Single file path
             path_obj = Path(path_str)
-            # Add to actual_files_to_read only if not already added
-            if path_obj not in actual_files_to_read:
+            if path_obj not in queued_files:
                 if is_valid_file(path_obj):
+                    queued_files.add(path_obj)
                     actual_files_to_read.append(path_obj)
                 else:
-                    # This warning is also covered by parse_comma_separated_files if it were called,
-                    # but direct calls also need it.
                     logger.warning(f"Context file '{path_obj}' not found or is not a file. Skipping.")
 
-    # The original code did not explicitly deduplicate files passed to _read_files_content,
-    # but the collection process here with `actual_files_to_read.append(f)` if f not in ...
-    # introduces deduplication based on Path object equality. This is generally good.
+    # Files are deduplicated by Path equality and read in first-seen order
     return read_files_content(actual_files_to_read)
 
 def parse_at_references(prompt: str) -> tuple[str, list[Path]]:
@@ -197,11 +273,7 @@ def parse_at_references(prompt: str) -> tuple[str, list[Path]]:
             - cleaned_prompt: The prompt with @file references removed.
             - referenced_files: A list of valid Path objects for files found.
     """
-    # Regex to find @filename.ext patterns.
-    # It looks for '@' followed by one or more non-whitespace, non-'@' characters,
-    # optionally followed by a dot and more such characters (for the extension).
-    at_pattern = r"@([^\s@]+(?:\.[^\s@]+)*)"
-    matches = re.findall(at_pattern, prompt)
+    matches = _AT_REFERENCE_PATTERN.findall(prompt)
 
     referenced_files_set = set() # Use a set to store unique Path objects
 
@@ -221,7 +293,7 @@ def parse_at_references(prompt: str) -> tuple[str, list[Path]]:
     referenced_files = sorted(referenced_files_set, key=lambda p: str(p))
 
     # Remove @ references from the prompt
-    cleaned_prompt = re.sub(at_pattern, "", prompt).strip()
+    cleaned_prompt = _AT_REFERENCE_PATTERN.sub("", prompt).strip()
     # Clean up extra whitespace that might result from removal and multiple spaces
     cleaned_prompt = " ".join(cleaned_prompt.split())
 
@@ -282,13 +354,19 @@ def extract_spec_description(file_path: Path) -> str:
     Returns:
         The extracted description string.
     """
+    # PyYAML is only needed here, so CLI commands that never read spec
+    # descriptions start without importing it
+    import yaml  # PyYAML library for YAML parsing
+
+    from elf0.utils.yaml_loader import parse_yaml
+
     try:
         with file_path.open(encoding="utf-8") as f:
             content = f.read()
 
             # Try to parse YAML and get 'description' field
             try:
-                data = yaml.safe_load(content)
+                data = parse_yaml(content)
                 if isinstance(data, dict) and "description" in data and isinstance(data["description"], str):
                     return data["description"].strip()
             except yaml.YAMLError as e:
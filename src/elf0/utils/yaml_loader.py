@@ -1,13 +1,58 @@
 # src/elf/utils/yaml_loader.py
+from collections import OrderedDict
+import copy
+import logging
 from pathlib import Path
+import threading
 from typing import Any
 
 import yaml
 
+logger = logging.getLogger(__name__)
+
+# The libyaml-backed loader parses several times faster than the pure-Python one;
+# PyYAML only ships it when it was built against libyaml
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+    logger.debug("libyaml is not available, YAML is parsed with the pure-Python loader")
+
+# Maximum number of parsed YAML documents kept in memory
+MAX_CACHED_YAML_FILES = 100
+
+# Parsed documents keyed by resolved path, stored with the (mtime_ns, size) they were read at
+_yaml_cache: OrderedDict[Path, tuple[int, int, Any]] = OrderedDict()
+_yaml_cache_lock = threading.Lock()
+
+def clear_yaml_cache() -> None:
+    """Remove all cached YAML documents."""
+    with _yaml_cache_lock:
+        _yaml_cache.clear()
+
+def parse_yaml(content: str | bytes) -> Any:
+    """Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        content: The YAML text, or its raw bytes (libyaml decodes those itself)
+
+    Returns:
+        The parsed YAML content
+
+    Raises:
+        yaml.YAMLError: If the YAML is invalid
+    """
+    return yaml.load(content, Loader=_SafeLoader)
 
 def load_yaml_file(file_path: str) -> dict[str, Any]:
     """Load a YAML file and return its contents as a dictionary.
 
+    Parsed documents are cached per process and reused while the file's mtime and
+    size are unchanged, so specs loaded repeatedly (for example a base spec pulled
+    in by several references) are only parsed once. Each call returns a deep copy,
+    so callers are free to mutate the result.
+
     Args:
         file_path: Path to the YAML file to load
 
@@ -19,17 +64,33 @@ def load_yaml_file(file_path: str) -> dict[str, Any]:
         yaml.YAMLError: If the YAML is invalid
     """
     path = Path(file_path)
-    if not path.exists():
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError as e:
         msg = f"YAML file not found: {file_path}"
-        raise FileNotFoundError(msg)
+        raise FileNotFoundError(msg) from e
 
-    raw = path.read_text()
+    key = path.resolve()
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(key)
+        if cached is not None and cached[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+            _yaml_cache.move_to_end(key)
+            return copy.deepcopy(cached[2])
+
+    raw = path.read_bytes()
     try:
-        return yaml.safe_load(raw)
+        data = parse_yaml(raw)
     except yaml.YAMLError as e:
         msg = f"Error parsing YAML file {file_path}: {e!s}"
         raise yaml.YAMLError(msg) from e
 
+    with _yaml_cache_lock:
+        _yaml_cache[key] = (stat_result.st_mtime_ns, stat_result.st_size, data)
+        _yaml_cache.move_to_end(key)
+        while len(_yaml_cache) > MAX_CACHED_YAML_FILES:
+            _yaml_cache.popitem(last=False)
+    return copy.deepcopy(data)
+
 def load_yaml_files(directory: str, pattern: str = "*.yaml") -> dict[str, dict[str, Any]]:
     """Load all YAML files matching a pattern in a directory.
 
@@ -2,6 +2,9 @@ import io  # For string IO
 import json
 import os
 from pathlib import Path
+import subprocess
+import sys
+import threading
 from unittest.mock import patch
 
 import pytest
@@ -10,11 +13,13 @@ from typer import Exit
 from typer.testing import CliRunner
 
 from elf0.cli import (
+    _parse_agent_args,
     app,
     app_state,
     display_workflow_result,
     format_workflow_result,
     get_multiline_input,
+    main,
     parse_context_files,
     prepare_workflow_input,
     read_prompt_file,
@@ -186,6 +191,15 @@ def test_display_workflow_result_dict_with_output(capsys):
     captured_capsys = capsys.readouterr() # Check for any stray stderr
     assert captured_capsys.err == ""
 
+def test_display_workflow_result_not_terminal_writes_raw_markdown():
+    """Test that piped output is written as-is instead of rendered Markdown."""
+    mock_stdout_buffer = io.StringIO()
+    long_line = "word " * 40
+    with patch("elf0.cli.stdout_workflow_console", RichConsole(file=mock_stdout_buffer, force_terminal=False)):
+        display_workflow_result({"output": f"# Title\n\n{long_line}"})
+
+    assert mock_stdout_buffer.getvalue() == f"# Title\n\n{long_line}\n"
+
 
 def test_display_workflow_result_dict_without_output(capsys):
     """Test displaying dict result without output key."""
@@ -332,6 +346,22 @@ workflow:
     # Typer's error messages for missing options/arguments go to what CliRunner captures as stdout.
     assert "Error: You must provide either --prompt or --prompt_file" in result.stdout
 
+def test_agent_command_invalid_output_fails_before_running(runner, tmp_path):
+    """Test that an unusable --output path is rejected before the workflow runs."""
+    spec_path = tmp_path / "workflow.yaml"
+    spec_path.write_text("version: '0.1'\n")
+
+    with patch("elf0.cli.run_workflow") as mock_run:
+        result = runner.invoke(app, [
+            "agent",
+            str(spec_path),
+            "--prompt", "Test",
+            "--output", str(tmp_path / "missing" / "result.md"),
+        ])
+        assert result.exit_code == 1
+        assert "does not exist" in result.stdout
+        mock_run.assert_not_called()
+
 def test_agent_command_empty_prompt_file(runner, tmp_path):
     """Test running workflow with empty prompt file."""
     file_path = tmp_path / "empty.md"
@@ -417,3 +447,99 @@ def test_exit_command_detection():
         should_exit = not prompt or prompt.lower() in ["exit", "quit", "bye", "/exit", "/quit", "/bye"]
 
         assert should_exit == expected_exit, f"'{prompt}' -> exit={should_exit}, expected={expected_exit}"
+
+def test_prompt_command_compiles_while_waiting_for_input(runner, tmp_path):
+    """Test that the interactive session compiles the workflow before the first prompt arrives."""
+    spec_path = tmp_path / "workflow.yaml"
+    spec_path.write_text("version: '0.1'")
+    compile_threads = []
+
+    def load_compiled_workflow(path):
+        compile_threads.append(threading.current_thread().name)
+
+    def run_workflow(path, prompt, session_id):
+        # The background compile has finished by the time the run starts
+        assert compile_threads == ["elf0-compile"]
+        return {"output": "done"}
+
+    with patch("elf0.core.runner.load_compiled_workflow", side_effect=load_compiled_workflow), \
+            patch("elf0.cli.get_multiline_input", side_effect=["hello", "/exit"]), \
+            patch("elf0.cli.run_workflow", side_effect=run_workflow) as mock_run:
+        result = runner.invoke(app, ["prompt", str(spec_path)])
+
+    assert result.exit_code == 0, result.stdout
+    mock_run.assert_called_once()
+
+def test_parse_agent_args_fast_path(tmp_path, temp_files):
+    """Test that supported agent options are parsed without Typer."""
+    spec_path = tmp_path / "workflow.yaml"
+    spec_path.write_text("version: '0.1'")
+
+    kwargs = _parse_agent_args([
+        str(spec_path), "--prompt", SAMPLE_PROMPT, "--session-id=abc",
+        "--context", str(temp_files[0]), "--context", str(temp_files[1]),
+        "--output", "result.md",
+    ])
+
+    assert kwargs == {
+        "spec_path": spec_path,
+        "prompt": SAMPLE_PROMPT,
+        "prompt_file": None,
+        "session_id": "abc",
+        "context_files": [temp_files[0], temp_files[1]],
+        "output_path": Path("result.md").resolve(),
+    }
+
+@pytest.mark.parametrize("extra_args", [
+    ["--help"],
+    ["--unknown", "x"],
+    ["--prompt"],
+    ["second_positional"],
+    ["--prompt_file", "missing.md"],
+])
+def test_parse_agent_args_defers_to_typer(tmp_path, extra_args):
+    """Test that help, unknown options and invalid values fall back to Typer."""
+    spec_path = tmp_path / "workflow.yaml"
+    spec_path.write_text("version: '0.1'")
+
+    assert _parse_agent_args([str(spec_path), *extra_args]) is None
+    assert _parse_agent_args([str(tmp_path / "missing.yaml"), "--prompt", "x"]) is None
+
+def test_main_rejects_directory_output_before_running(tmp_path, capsys):
+    """Test that a directory --output is rejected by Typer instead of after the workflow ran."""
+    spec_path = tmp_path / "workflow.yaml"
+    spec_path.write_text("version: '0.1'")
+    argv = ["elf0", "agent", str(spec_path), "--prompt", "x", "--output", str(tmp_path)]
+
+    with patch("sys.argv", argv), patch("elf0.core.runner.run_workflow") as mock_run, \
+            pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 2
+    assert "Invalid value for '--output'" in capsys.readouterr().err
+    mock_run.assert_not_called()
+
+def test_main_fast_path_exits_like_typer_when_interrupted(tmp_path, capsys):
+    """Test that interrupting a fast-path run exits without a traceback."""
+    spec_path = tmp_path / "workflow.yaml"
+    spec_path.write_text("version: '0.1'")
+    argv = ["elf0", "agent", str(spec_path), "--prompt", "x"]
+
+    with patch("sys.argv", argv), patch("elf0.cli.agent_command", side_effect=KeyboardInterrupt), \
+            pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 130
+
+    with patch("sys.argv", argv), patch("elf0.cli.agent_command", side_effect=EOFError), \
+            pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 1
+    assert "Aborted!" in capsys.readouterr().err
+
+def test_cli_import_defers_workflow_dependencies():
+    """Test that importing the CLI leaves PyYAML and Pydantic for the commands that need them."""
+    code = "import sys, elf0.cli; print(sorted(m for m in ('yaml', 'pydantic') if m in sys.modules))"
+    # A fresh interpreter is needed, as the test session has imported both already
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # noqa: S603
+
+    assert result.stdout.strip() == "[]"
@@ -1,5 +1,6 @@
 # tests/core/test_claude_code_integration.py
-from unittest.mock import Mock
+import threading
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -35,6 +36,20 @@ class TestClaudeCodeNodeBasics:
         assert node.task == "generate_code"
         assert node.prompt == "Create a Python function"
 
+    def test_claude_code_node_binds_state_references_in_prompt(self):
+        """Test that ${state.field} references are filled in from the state."""
+        # Arrange
+        node = ClaudeCodeNode({"task": "chat", "prompt": "Review ${state.plan.title} (${state.missing})"})
+        plain_node = ClaudeCodeNode({"task": "chat", "prompt": "Review {input}"})
+
+        # Act
+        prompt = node._bind_prompt_parameters({"plan": {"title": "v2"}})
+        plain_prompt = plain_node._bind_prompt_parameters({"input": "bugs"})
+
+        # Assert
+        assert prompt == "Review v2 (${state.missing})"
+        assert plain_prompt == "Review bugs"
+
 
 class TestClaudeCodeFactory:
     """Test Claude Code node factory registration and creation."""
@@ -87,6 +102,26 @@ class TestClaudeCodeFactory:
         result = node_fn(state)
         assert "configuration error" in result["output"]
 
+    def test_claude_code_node_runs_in_calling_thread_without_event_loop(self):
+        """Test that the node runs its task in the caller's thread when no loop is running."""
+        # Arrange
+        node = WorkflowNode(
+            id="chat_node",
+            kind="claude_code",
+            config={"task": "chat", "prompt": "Hello Claude Code!"}
+        )
+
+        async def fake_execute(self, state):
+            return {"output": threading.current_thread().name}
+
+        # Act
+        with patch.object(ClaudeCodeNode, "execute", fake_execute):
+            result = make_claude_code_node(Mock(), node)({"input": "test"})
+
+        # Assert
+        assert result["output"] == threading.current_thread().name
+        assert result["current_node"] == "chat_node"
+
 
 class TestClaudeCodeWorkflowIntegration:
     """Test Claude Code integration with workflow specs."""
@@ -0,0 +1,131 @@
+# tests/core/test_compile_cache.py
+"""Tests for the in-process compiled workflow cache."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from elf0.core.compile_cache import CompiledWorkflowCache, compiled_workflow_cache
+from elf0.core.config import get_env_int
+from elf0.core.runner import MAX_CONCURRENT_NODES, load_compiled_workflow, run_workflow
+
+TOOL_SPEC = """
+version: "0.1"
+runtime: langgraph
+functions:
+  processor:
+    type: python
+    name: Text Processor
+    entrypoint: elf0.functions.utils.text_processor
+workflow:
+  type: sequential
+  nodes:
+    - id: count
+      kind: tool
+      ref: processor
+      config:
+        parameters:
+          operation: {operation}
+      stop: true
+  edges: []
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty global cache."""
+    compiled_workflow_cache.clear()
+    yield
+    compiled_workflow_cache.clear()
+
+
+@pytest.fixture
+def spec_file(tmp_path: Path) -> Path:
+    """Write a tool-only spec that needs no API keys."""
+    path = tmp_path / "workflow.yaml"
+    path.write_text(TOOL_SPEC.format(operation="count_words"))
+    return path
+
+
+def test_reuses_compiled_graph_for_unchanged_spec(spec_file):
+    """Test that a second load returns the same compiled graph."""
+    first = load_compiled_workflow(spec_file)
+    second = load_compiled_workflow(spec_file)
+
+    assert first is second
+
+
+def test_touching_spec_without_edits_is_still_a_hit(spec_file):
+    """Test that an mtime change alone falls back to the content hash."""
+    first = load_compiled_workflow(spec_file)
+    stat_result = spec_file.stat()
+    os.utime(spec_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 5_000_000_000))
+
+    assert load_compiled_workflow(spec_file) is first
+
+
+def test_edited_spec_is_recompiled(spec_file):
+    """Test that changing the spec content invalidates the cached graph."""
+    assert run_workflow(spec_file, "one two three", "s")["output"] == "Word count: 3"
+
+    spec_file.write_text(TOOL_SPEC.format(operation="uppercase"))
+
+    assert run_workflow(spec_file, "one two three", "s")["output"] == "ONE TWO THREE"
+
+
+def test_runs_bound_node_concurrency(spec_file):
+    """Test that runs size LangGraph's node thread pool for I/O-bound nodes."""
+    graph = load_compiled_workflow(spec_file).graph
+
+    with patch.object(graph, "invoke", return_value={"output": "done"}) as invoke:
+        run_workflow(spec_file, "one two", "s")
+
+    assert invoke.call_args.kwargs["config"]["max_concurrency"] == MAX_CONCURRENT_NODES
+
+
+def test_edited_reference_is_recompiled(tmp_path):
+    """Test that changes to a referenced spec file invalidate the cache."""
+    base = tmp_path / "base.yaml"
+    base.write_text(TOOL_SPEC.format(operation="count_words"))
+    child = tmp_path / "child.yaml"
+    child.write_text('reference: "./base.yaml"\ndescription: child\n')
+
+    first = load_compiled_workflow(child)
+    base.write_text(TOOL_SPEC.format(operation="uppercase"))
+
+    assert load_compiled_workflow(child) is not first
+
+
+def test_evicts_least_recently_used_entry(tmp_path):
+    """Test that the cache stays within its size limit."""
+    cache = CompiledWorkflowCache(max_entries=2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.yaml"
+        path.write_text(name)
+        paths.append(path)
+        cache.put(path, spec=None, graph=name, files=[path])
+
+    assert cache.get(paths[0]) is None
+    assert cache.get(paths[1]).graph == "b"
+    assert cache.get(paths[2]).graph == "c"
+
+
+@pytest.mark.parametrize("raw_value", ["lots", "2.5", "0", "-3"])
+def test_invalid_cache_size_falls_back_to_default(monkeypatch, caplog, raw_value):
+    """Test that a malformed cache size setting is logged and replaced by the default."""
+    monkeypatch.setenv("ELF0_MAX_CACHED_WORKFLOWS", raw_value)
+
+    with caplog.at_level("WARNING", logger="elf0.core.config"):
+        assert get_env_int("ELF0_MAX_CACHED_WORKFLOWS", 100) == 100
+
+    assert "ELF0_MAX_CACHED_WORKFLOWS" in caplog.text
+
+
+def test_cache_size_is_read_from_environment(monkeypatch):
+    """Test that a valid cache size setting is used as given."""
+    monkeypatch.setenv("ELF0_MAX_CACHED_WORKFLOWS", " 7 ")
+
+    assert get_env_int("ELF0_MAX_CACHED_WORKFLOWS", 100) == 7
@@ -1,12 +1,31 @@
+import asyncio
+import gc
+import threading
+from unittest.mock import create_autospec, patch
+import weakref
+
 import pytest
 
 from elf0.core.compiler import (
     NodeFactoryRegistry,
+    SafeNamespace,
+    _compile_condition,
+    _compile_prompt_template,
+    _create_llm_client,
+    _linear_chains,
+    _prompt_template_values,
+    _result_cache_key,
+    _run_coroutine,
     compile_to_langgraph,
     create_condition_function,
+    load_tool,
+    make_judge_node,
+    make_llm_node,
+    make_tool_node,
 )
-from elf0.core.config import load_env_file
-from elf0.core.spec import LLM, Edge, Spec, Workflow, WorkflowNode
+from elf0.core.config import create_llm_config, load_env_file
+from elf0.core.spec import LLM, Edge, Function, Spec, Workflow, WorkflowNode
+from elf0.functions.utils import text_processor
 
 
 @pytest.fixture(autouse=True)
@@ -48,6 +67,13 @@ def test_compile_minimal_workflow():
     assert graph is not None
     # Only verify that the graph was created, not its internal structure
 
+def test_compiled_graphs_share_one_state_schema(monkeypatch):
+    """Test that compiling does not build a new state schema model per graph."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    spec = create_minimal_spec()
+
+    assert compile_to_langgraph(spec).state_schema is compile_to_langgraph(spec).state_schema
+
 def test_compile_workflow_with_conditional_edges():
     """Test compiling a workflow with conditional edges."""
     spec = Spec(
@@ -103,6 +129,81 @@ def test_condition_function_evaluation():
     state = {"evaluation_score": 4}
     assert complex_fn(state) is True  # Should use default for iteration_count
 
+def test_condition_function_literals_and_strings():
+    """Test literal, key access and string comparison conditions."""
+    assert create_condition_function("true")({}) is True
+    assert create_condition_function("false")({}) is False
+    assert create_condition_function("state.get('done')")({"done": 1}) is True
+    assert create_condition_function("'next_node'")({}) == "next_node"
+
+    # String state values are stripped before comparing against a string
+    string_fn = create_condition_function("state.get('output') == 'yes'")
+    assert string_fn({"output": " yes\n"}) is True
+    assert string_fn({"output": "no"}) is False
+
+    # Unsupported operators are reported when the condition is evaluated
+    invalid_fn = create_condition_function("state.get('score') => 3")
+    with pytest.raises(ValueError, match="Unsupported operator"):
+        invalid_fn({"score": 4})
+
+def test_condition_functions_share_parsed_expression():
+    """Test that identical condition expressions are parsed only once."""
+    _compile_condition.cache_clear()
+    expr = "state.get('score', 0) >= 3 or state.get('done')"
+
+    first = create_condition_function(expr)
+    second = create_condition_function(expr)
+
+    assert first({"score": 4}) is True
+    assert second({"done": True}) is True
+    assert second({"score": 1}) is False
+    assert _compile_condition.cache_info().misses == 1
+
+def test_compound_conditions_short_circuit_to_booleans():
+    """Test that 'and'/'or' conditions return bools and stop at the deciding part."""
+    or_fn = create_condition_function("state.get('done') or state.get('score', 0) => 3")
+    assert or_fn({"done": "yes"}) is True
+    with pytest.raises(ValueError, match="Unsupported operator"):
+        or_fn({})
+
+    mixed_fn = create_condition_function("state.get('score', 0) > 1 or state.get('retry') and 'next_node'")
+    assert mixed_fn({"score": 2}) is True
+    assert mixed_fn({"retry": False}) is False
+
+def test_prompt_template_values_follow_referenced_fields():
+    """Test that prompt templates only compute the state values they reference."""
+    assert _prompt_template_values("Answer: {input}") == ()
+    assert [name for name, _ in _prompt_template_values("{state.output} ({evaluation_score:.2f})")] == [
+        "evaluation_score",
+        "state",
+    ]
+    # Templates that cannot be analysed keep every value
+    assert len(_prompt_template_values("{iteration_count:>{width}}")) == 4
+
+def test_compiled_prompt_templates_render_like_format():
+    """Test that prompt templates parsed once render exactly as str.format would."""
+    values = {"input": "hi", "output": "before", "iteration_count": 2, "state": SafeNamespace({"output": "x"})}
+    for template in (
+        "Task: {input} {{literal}} (try {iteration_count})",
+        "{state.output} / {output!r} / {iteration_count:>3}",
+        "No fields at all",
+    ):
+        assert _compile_prompt_template(template)(values) == template.format(**values)
+
+    with pytest.raises(KeyError, match="missing"):
+        _compile_prompt_template("{missing}")(values)
+
+def test_safe_namespace_reads_through_to_state():
+    """Test that template namespaces wrap the state and parse output_key JSON once."""
+    state = {"output": "done", "dynamic_state": {"plan": '```json\n{"steps": 3}\n```'}}
+    namespace = SafeNamespace(state)
+
+    assert namespace.output == "done"
+    assert namespace.plan == state["dynamic_state"]["plan"]
+    assert namespace.missing == ""
+    assert namespace.json.steps == 3
+    assert namespace.json is namespace.json
+
 def test_node_factory_registry():
     """Test node factory registration and retrieval."""
     # Test getting registered factory
@@ -122,6 +223,11 @@ def test_node_factory_registry():
     NodeFactoryRegistry.register("test_kind", test_factory)
     assert NodeFactoryRegistry.get("test_kind") is not None
 
+    # The public view reflects registrations but cannot be modified directly
+    assert NodeFactoryRegistry.factories["test_kind"] is test_factory
+    with pytest.raises(TypeError):
+        NodeFactoryRegistry.factories["other_kind"] = test_factory
+
 def test_workflow_state_management():
     """Test workflow state handling during execution."""
     spec = create_minimal_spec()
@@ -153,3 +259,334 @@ def test_compile_workflow_with_judge_nodes():
     # Verify that compilation succeeds for workflows with judge nodes
     graph = compile_to_langgraph(spec)
     assert graph is not None
+
+def test_fan_out_branches_run_in_the_same_step():
+    """Test that nodes fanned out from one source can both update the state."""
+    def tool_node(node_id: str, operation: str, *, stop: bool = False) -> WorkflowNode:
+        return WorkflowNode(
+            id=node_id, kind="tool", ref="processor", config={"parameters": {"operation": operation}}, stop=stop
+        )
+
+    spec = Spec(
+        version="0.1",
+        functions={
+            "processor": Function(type="python", name="Processor", entrypoint="elf0.functions.utils.text_processor")
+        },
+        workflow=Workflow(
+            type="custom_graph",
+            nodes=[
+                tool_node("start", "uppercase"),
+                tool_node("count", "count_words", stop=True),
+                tool_node("length", "length", stop=True),
+            ],
+            edges=[Edge(source="start", target="count"), Edge(source="start", target="length")],
+        ),
+    )
+
+    result = compile_to_langgraph(spec).compile().invoke({"input": "one two three"})
+
+    assert result["output"] in ("Word count: 3", "Character count: 13")
+
+def test_independent_root_nodes_start_with_the_entry_point():
+    """Test that nodes no edge leads to run in the first step when parallel roots are enabled."""
+    def tool_node(node_id: str, operation: str, *, stop: bool = False) -> WorkflowNode:
+        return WorkflowNode(
+            id=node_id, kind="tool", ref="processor", config={"parameters": {"operation": operation}}, stop=stop
+        )
+
+    spec = Spec(
+        version="0.1",
+        functions={
+            "processor": Function(type="python", name="Processor", entrypoint="elf0.functions.utils.text_processor")
+        },
+        workflow=Workflow(
+            type="custom_graph",
+            nodes=[tool_node("upper", "uppercase"), tool_node("count", "count_words"), tool_node("end", "length", stop=True)],
+            edges=[Edge(source="upper", target="end"), Edge(source="count", target="end")],
+            parallel_roots=True,
+        ),
+    )
+
+    updates = [next(iter(update)) for update in compile_to_langgraph(spec).compile().stream({"input": "a b"})]
+
+    # Both roots finish before the node joining them, which then runs once
+    assert set(updates[:2]) == {"upper", "count"}
+    assert updates[2:] == ["end"]
+
+def test_unconnected_nodes_do_not_run_by_default(caplog):
+    """Test that a node no edge leads to is reported but never run unless opted in."""
+    spec = Spec(
+        version="0.1",
+        functions={
+            "processor": Function(type="python", name="Processor", entrypoint="elf0.functions.utils.text_processor")
+        },
+        workflow=Workflow(
+            type="custom_graph",
+            nodes=[
+                WorkflowNode(id="n1", kind="tool", ref="processor", config={"parameters": {"operation": "uppercase"}}, stop=True),
+                WorkflowNode(id="orphan", kind="tool", ref="processor", config={"parameters": {"operation": "count_words"}}, stop=True),
+            ],
+            edges=[],
+        ),
+    )
+
+    with caplog.at_level("WARNING", logger="elf0.core.compiler"):
+        updates = [next(iter(update)) for update in compile_to_langgraph(spec).compile().stream({"input": "a b"})]
+
+    assert updates == ["n1"]
+    assert "orphan has no incoming edges" in caplog.text
+
+def test_linear_chains_run_as_one_node():
+    """Test that nodes which can only run one after another are scheduled as a single step."""
+    def tool_node(node_id: str, operation: str, *, stop: bool = False) -> WorkflowNode:
+        return WorkflowNode(
+            id=node_id, kind="tool", ref="processor", config={"parameters": {"operation": operation}}, stop=stop
+        )
+
+    spec = Spec(
+        version="0.1",
+        functions={
+            "processor": Function(type="python", name="Processor", entrypoint="elf0.functions.utils.text_processor")
+        },
+        workflow=Workflow(
+            type="custom_graph",
+            nodes=[
+                tool_node("count", "count_words"),
+                tool_node("upper", "uppercase"),
+                tool_node("routed", "lowercase"),
+                tool_node("end", "length", stop=True),
+            ],
+            edges=[
+                Edge(source="count", target="upper"),
+                Edge(source="upper", target="routed", condition="state.get('output') == 'WORD COUNT: 2'"),
+                Edge(source="upper", target="end"),
+                Edge(source="routed", target="end"),
+            ],
+        ),
+    )
+
+    assert [node.id for node in _linear_chains(spec)["count"]] == ["count", "upper"]
+
+    graph = compile_to_langgraph(spec).compile()
+    updates = list(graph.stream({"input": "a b"}))
+
+    # The router after the chain still sees the state written by its last node
+    assert [next(iter(update)) for update in updates] == ["count", "routed", "end"]
+    assert updates[0]["count"]["output"] == "WORD COUNT: 2"
+
+def test_fused_claude_code_chain_passes_results_along():
+    """Test that a fused chain hands claude_code_result from one Claude Code node to the next."""
+    from elf0.core.nodes.claude_code_node import ClaudeCodeNode
+
+    seen_results = []
+
+    async def fake_execute(self, state):
+        seen_results.append(state.get("claude_code_result"))
+        return {"output": self.prompt, "claude_code_result": {"ok": len(seen_results)}}
+
+    spec = Spec(
+        version="0.1",
+        workflow=Workflow(
+            type="custom_graph",
+            nodes=[
+                WorkflowNode(id="first", kind="claude_code", config={"task": "chat", "prompt": "one"}),
+                WorkflowNode(id="second", kind="claude_code", config={"task": "chat", "prompt": "two"}, stop=True),
+            ],
+            edges=[Edge(source="first", target="second")],
+        ),
+    )
+    assert list(_linear_chains(spec)) == ["first"]
+
+    with patch.object(ClaudeCodeNode, "execute", fake_execute):
+        compile_to_langgraph(spec).compile().invoke({"input": "x"})
+
+    assert seen_results == [None, {"ok": 1}]
+
+def test_tool_nodes_return_only_the_keys_they_produce():
+    """Test that tool nodes leave other state keys for parallel branches to set."""
+    state = {"input": "a b", "output": "old", "error_context": "set by a sibling branch"}
+
+    assert load_tool(lambda state: "new")(state) == {"output": "new"}
+    assert load_tool(lambda state: {"evaluation_score": 0.5})(state) == {"evaluation_score": 0.5}
+    assert load_tool(lambda state: 3)(state) == {"output": "3"}
+
+def test_parallel_branches_keep_every_named_output():
+    """Test that fanned-out nodes with output keys all keep their results for later nodes."""
+    def tool_node(node_id: str, operation: str, *, output_key: str | None = None, stop: bool = False) -> WorkflowNode:
+        return WorkflowNode(
+            id=node_id, kind="tool", ref="processor", config={"parameters": {"operation": operation}},
+            output_key=output_key, stop=stop,
+        )
+
+    spec = Spec(
+        version="0.1",
+        functions={
+            "processor": Function(type="python", name="Processor", entrypoint="elf0.functions.utils.text_processor")
+        },
+        workflow=Workflow(
+            type="custom_graph",
+            nodes=[
+                tool_node("start", "count_words"),
+                tool_node("upper", "uppercase", output_key="shouted"),
+                WorkflowNode(
+                    id="count", kind="tool", ref="processor",
+                    config={"parameters": {"operation": "count_words"}, "output_key": "words"},
+                ),
+                tool_node("end", "length", stop=True),
+            ],
+            edges=[
+                Edge(source="start", target="upper"),
+                Edge(source="start", target="count"),
+                Edge(source="upper", target="end"),
+                Edge(source="count", target="end"),
+            ],
+        ),
+    )
+
+    result = compile_to_langgraph(spec).compile().invoke({"input": "a b"})
+
+    # Both branches read the "Word count: 2" output of the start node
+    assert result["dynamic_state"] == {"shouted": "WORD COUNT: 2", "words": "Word count: 3"}
+    assert SafeNamespace(result).shouted == "WORD COUNT: 2"
+
+def test_parallel_claude_code_and_mcp_branches_keep_each_result():
+    """Test that Claude Code and MCP nodes fanned out together only write the keys they produce."""
+    from elf0.core.nodes.claude_code_node import ClaudeCodeNode
+    from elf0.core.nodes.mcp_node import MCPNode
+
+    async def fake_claude_code(self, state):
+        return {"output": f"code for {self.prompt}", "claude_code_result": {"task": self.prompt}}
+
+    async def fake_mcp(self, state):
+        return {"output": f"{self.tool_name} done"}
+
+    def claude_code_node(node_id: str) -> WorkflowNode:
+        return WorkflowNode(
+            id=node_id, kind="claude_code", config={"task": "chat", "prompt": node_id}, output_key=node_id, stop=True
+        )
+
+    spec = Spec(
+        version="0.1",
+        functions={
+            "processor": Function(type="python", name="Processor", entrypoint="elf0.functions.utils.text_processor")
+        },
+        workflow=Workflow(
+            type="custom_graph",
+            nodes=[
+                WorkflowNode(id="start", kind="tool", ref="processor", config={"parameters": {"operation": "uppercase"}}),
+                claude_code_node("first_code"),
+                claude_code_node("second_code"),
+                WorkflowNode(
+                    id="lookup", kind="mcp", output_key="lookup", stop=True,
+                    config={"server": {"command": ["unused"]}, "tool": "search"},
+                ),
+            ],
+            edges=[
+                Edge(source="start", target="first_code"),
+                Edge(source="start", target="second_code"),
+                Edge(source="start", target="lookup"),
+            ],
+        ),
+    )
+
+    with patch.object(ClaudeCodeNode, "execute", fake_claude_code), patch.object(MCPNode, "execute", fake_mcp):
+        result = compile_to_langgraph(spec).compile().invoke({"input": "a b"})
+
+    assert result["dynamic_state"] == {
+        "first_code": "code for first_code",
+        "second_code": "code for second_code",
+        "lookup": "search done",
+    }
+    assert result["claude_code_result"] in ({"task": "first_code"}, {"task": "second_code"})
+
+def test_tool_node_result_cache_is_opt_in():
+    """Test that Python tool nodes reuse results for repeated inputs only when configured."""
+    spec = Spec(
+        version="0.1",
+        functions={
+            "processor": Function(type="python", name="Processor", entrypoint="elf0.functions.utils.text_processor")
+        },
+        workflow=Workflow(
+            type="sequential", nodes=[WorkflowNode(id="count", kind="tool", ref="processor", stop=True)], edges=[]
+        ),
+    )
+    processor = create_autospec(text_processor, side_effect=text_processor)
+
+    def run_node(config: dict, inputs: list[str]) -> list[str]:
+        node = WorkflowNode(id="count", kind="tool", ref="processor", config=config)
+        node_fn = make_tool_node(spec, node)
+        return [node_fn({"input": text})["output"] for text in inputs]
+
+    with patch("elf0.core.compiler.function_loader.load_function", return_value=processor):
+        parameters = {"operation": "count_words"}
+        cached = run_node({"parameters": parameters, "result_cache_size": 1}, ["a b", "a b", "c", "a b"])
+        assert cached == ["Word count: 2", "Word count: 2", "Word count: 1", "Word count: 2"]
+        # The second "a b" was a hit; the last one was evicted by "c"
+        assert processor.call_count == 3
+
+        processor.reset_mock()
+        run_node({"parameters": parameters}, ["a b", "a b"])
+        assert processor.call_count == 2
+
+def test_result_cache_keys_are_canonical():
+    """Test that tool result cache keys ignore key order and accept non-JSON values."""
+    assert _result_cache_key({"a": 1, "state": {"x": 1, "y": 2}}) == _result_cache_key({"state": {"y": 2, "x": 1}, "a": 1})
+    assert _result_cache_key({"a": 1}) != _result_cache_key({"a": 2})
+    assert _result_cache_key({"path": threading.Lock()}) is not None
+
+def test_node_coroutines_run_beside_a_running_event_loop():
+    """Test that node coroutines complete whether or not the caller has a running loop."""
+    async def current_thread() -> threading.Thread:
+        await asyncio.sleep(0)
+        return threading.current_thread()
+
+    async def call_from_running_loop() -> threading.Thread:
+        # Node functions are synchronous, so they block the running loop while waiting
+        return _run_coroutine(current_thread(), timeout=5)
+
+    assert _run_coroutine(current_thread()) is threading.current_thread()
+    worker = asyncio.run(call_from_running_loop())
+    assert worker is not threading.current_thread()
+    assert worker.name.startswith("elf0-node-loop")
+
+def test_llm_api_key_resolved_once_per_reference(monkeypatch):
+    """Test that nodes sharing an LLM reference resolve its API key and client once."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    spec = create_minimal_spec()
+
+    with patch("elf0.core.compiler.create_llm_config", wraps=create_llm_config) as mock_create:
+        first = _create_llm_client(spec, spec.workflow.nodes[0])
+        second = _create_llm_client(spec, spec.workflow.nodes[1])
+
+    assert mock_create.call_count == 1
+    assert first is second
+    assert spec.llms["llm1"].api_key == "test-key"
+
+def test_shared_llm_clients_are_released_with_their_graph(monkeypatch):
+    """Test that the shared LLM client cache does not keep clients of discarded graphs alive."""
+    monkeypatch.setenv("OPENAI_API_KEY", "release-key")
+    spec = create_minimal_spec()
+    graph = compile_to_langgraph(spec).compile()
+    client_ref = weakref.ref(_create_llm_client(spec, spec.workflow.nodes[0]))
+
+    assert client_ref() is not None
+
+    del graph
+    gc.collect()
+    assert client_ref() is None
+
+def test_llm_nodes_skip_calls_that_cannot_help(monkeypatch):
+    """Test that blank prompts and exit requests never reach the LLM."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    spec = create_minimal_spec()
+    agent = make_llm_node(spec, spec.workflow.nodes[0])
+    judge = make_judge_node(spec, WorkflowNode(id="judge", kind="judge", ref="llm1"))
+    llm_client = _create_llm_client(spec, spec.workflow.nodes[0])
+
+    with patch.object(llm_client, "generate") as mock_generate:
+        exit_state = {"input": "hello", "output": "User requested to exit", "user_exit_requested": True}
+        assert agent(exit_state) == {"current_node": "start"}
+        assert judge(exit_state) == {"current_node": "judge"}
+        assert agent({"input": "  \n"})["output"].startswith("ConfigurationError")
+
+    mock_generate.assert_not_called()
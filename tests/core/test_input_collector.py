@@ -0,0 +1,22 @@
+# tests/core/test_input_collector.py
+"""Tests for terminal input collection."""
+
+import io
+from unittest.mock import patch
+
+from elf0.core.input_collector import _collect_simple_input
+
+
+def test_simple_input_reads_piped_line_without_prompt(capsys):
+    """Test that piped input is read one line at a time without writing to stdout."""
+    with patch("sys.stdin", io.StringIO("first answer\nsecond answer\n")):
+        assert _collect_simple_input() == "first answer"
+        assert _collect_simple_input() == "second answer"
+
+    assert capsys.readouterr().out == ""
+
+
+def test_simple_input_returns_empty_string_at_end_of_piped_input():
+    """Test that exhausted piped input behaves like EOF."""
+    with patch("sys.stdin", io.StringIO("")):
+        assert _collect_simple_input() == ""
@@ -0,0 +1,180 @@
+# tests/core/test_llm_client.py
+"""Tests for LLM provider client setup."""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from unittest.mock import Mock, patch
+
+import httpx
+import openai
+import pytest
+
+from elf0.core.llm_client import (
+    AnthropicProvider,
+    LLMClient,
+    OllamaProvider,
+    OpenAIProvider,
+)
+from elf0.core.spec import LLM
+
+
+def test_openai_providers_use_their_own_clients(monkeypatch):
+    """Test that each OpenAI provider keeps its own key without touching the global client."""
+    monkeypatch.setattr(openai, "api_key", None)
+
+    first = OpenAIProvider("gpt-4.1-mini", "key-one", 0.5, {})
+    second = OpenAIProvider("gpt-4.1-mini", "key-two", 0.5, {"max_retries": 5})
+
+    assert first.client.api_key == "key-one"
+    assert second.client.api_key == "key-two"
+    assert second.client.max_retries == 5
+    assert openai.api_key is None
+
+
+def test_providers_with_the_same_settings_share_a_client():
+    """Test that providers on the same endpoint reuse one client and its connection pool."""
+    first = OpenAIProvider("gpt-4.1-mini", "shared-key", 0.5, {})
+    second = OpenAIProvider("gpt-4.1", "shared-key", 0.0, {})
+    local = OllamaProvider("llama3", None, 0.5, {})
+    other_local = OllamaProvider("mistral", None, 0.5, {"base_url": "http://localhost:11434"})
+
+    assert first.client is second.client
+    assert local.client is other_local.client
+    assert local.client is not first.client
+
+    claude = AnthropicProvider("claude-sonnet-4", "shared-key", 0.5, {})
+    other_claude = AnthropicProvider("claude-opus-4", "shared-key", 0.0, {"max_retries": 5})
+    assert claude.client is other_claude.client
+
+
+def test_openai_provider_stops_sending_rejected_temperature():
+    """Test that a model rejecting non-default temperature is only asked once with it."""
+    client = OpenAIProvider("o3-mini", "temperature-key", 0.5, {}).client
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    rejection = openai.BadRequestError(
+        "Unsupported value: 'temperature' does not support 0.5, only the default (1) value is supported.",
+        response=httpx.Response(400, request=request),
+        body=None,
+    )
+    completion = Mock(choices=[Mock(message=Mock(content="done"))])
+
+    with patch.object(client.chat.completions, "create", side_effect=[rejection, completion, completion]) as create:
+        # Providers bind the create method when they are built
+        provider = OpenAIProvider("o3-mini", "temperature-key", 0.5, {"max_tokens": 10})
+        assert provider.generate("first") == "done"
+        assert provider.generate("second") == "done"
+
+    assert [("temperature" in call.kwargs) for call in create.call_args_list] == [True, False, False]
+    assert all(call.kwargs["max_tokens"] == 10 for call in create.call_args_list)
+
+
+def test_ollama_requests_round_robin_across_servers():
+    """Test that several Ollama base URLs share the requests in turn."""
+    servers = {"base_url": "http://gpu-a:11434, http://gpu-b:11434"}
+    first, second = OllamaProvider("llama3", None, 0.5, servers).clients
+    completion = Mock(choices=[Mock(message=Mock(content="done"))])
+
+    with patch.object(first.chat.completions, "create", return_value=completion) as first_create, \
+            patch.object(second.chat.completions, "create", return_value=completion) as second_create:
+        provider = OllamaProvider("llama3", None, 0.5, servers)
+        for _ in range(3):
+            assert provider.generate("hi") == "done"
+
+    assert str(first.base_url) == "http://gpu-a:11434/v1/"
+    assert (first_create.call_count, second_create.call_count) == (2, 1)
+
+
+def test_anthropic_system_prompt_is_cacheable_when_enabled():
+    """Test that the system prompt is sent as a cached prefix only when requested."""
+    cached = AnthropicProvider("claude-sonnet-4", "key", 0.5, {"system_prompt": "Be brief.", "cache_system_prompt": 1})
+    plain = AnthropicProvider("claude-sonnet-4", "key", 0.5, {"system_prompt": "Be brief."})
+    message = Mock(content=[Mock(text="done")])
+
+    with patch.object(cached.client.messages, "create", return_value=message) as create:
+        assert cached.generate("hi") == "done"
+    assert create.call_args.kwargs["system"] == [
+        {"type": "text", "text": "Be brief.", "cache_control": {"type": "ephemeral"}}
+    ]
+
+    with patch.object(plain.client.messages, "create", return_value=message) as create:
+        assert plain.generate("hi") == "done"
+    assert create.call_args.kwargs["system"] == "Be brief."
+
+
+def test_anthropic_retries_follow_the_backoff_schedule():
+    """Test that transient Anthropic errors are retried with growing, jittered delays."""
+    provider = AnthropicProvider(
+        "claude-sonnet-4", "key", 0.5, {"max_retries": 2, "retry_delay": 1.0, "retry_backoff_factor": 3.0}
+    )
+    message = Mock(content=[Mock(text="done")])
+    failures = [RuntimeError("Overloaded"), RuntimeError("Rate limit exceeded")]
+
+    with patch.object(provider.client.messages, "create", side_effect=[*failures, message]), \
+            patch("elf0.core.llm_client.time.sleep") as sleep:
+        assert provider.generate("hi") == "done"
+
+    first_delay, second_delay = (call.args[0] for call in sleep.call_args_list)
+    assert 1.1 <= first_delay <= 1.3
+    assert 3.3 <= second_delay <= 3.9
+
+    with patch.object(provider.client.messages, "create", side_effect=ValueError("bad request")) as create, \
+            patch("elf0.core.llm_client.time.sleep") as sleep:
+        with pytest.raises(RuntimeError, match="after 3 attempts"):
+            provider.generate("hi")
+    assert create.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_response_cache_is_opt_in_and_bounded():
+    """Test that repeated prompts are served from the cache only when enabled."""
+    cached_client = LLMClient(LLM(type="ollama", model_name="llama3", params={"response_cache_size": 1}))
+    uncached_client = LLMClient(LLM(type="ollama", model_name="llama3"))
+
+    with patch.object(cached_client.provider, "generate", side_effect=["one", "two", "three"]) as mock_generate:
+        assert cached_client.generate("a") == "one"
+        assert cached_client.generate("a") == "one"
+        assert cached_client.generate("b") == "two"
+        # "a" was evicted when "b" was cached
+        assert cached_client.generate("a") == "three"
+    assert mock_generate.call_count == 3
+
+    with patch.object(uncached_client.provider, "generate", side_effect=["one", "two"]) as mock_generate:
+        assert uncached_client.generate("a") == "one"
+        assert uncached_client.generate("a") == "two"
+
+
+def test_deterministic_llms_cache_responses_by_default():
+    """Test that temperature-0 LLMs cache responses unless caching is disabled."""
+    deterministic_client = LLMClient(LLM(type="ollama", model_name="llama3", temperature=0))
+    disabled_client = LLMClient(
+        LLM(type="ollama", model_name="llama3", temperature=0, params={"response_cache_size": 0})
+    )
+
+    with patch.object(deterministic_client.provider, "generate", side_effect=["one", "two"]):
+        assert deterministic_client.generate("a") == "one"
+        assert deterministic_client.generate("a") == "one"
+    assert deterministic_client.response_cache_hits == 1
+    assert deterministic_client.response_cache_misses == 1
+
+    with patch.object(disabled_client.provider, "generate", side_effect=["one", "two"]):
+        assert disabled_client.generate("a") == "one"
+        assert disabled_client.generate("a") == "two"
+
+
+def test_concurrent_identical_prompts_share_one_request():
+    """Test that concurrent cache misses for the same prompt call the provider once."""
+    client = LLMClient(LLM(type="ollama", model_name="llama3", params={"response_cache_size": 8}))
+    release = threading.Event()
+
+    def slow_generate(prompt, system_prompt=None):
+        release.wait(timeout=5)
+        return f"answer to {prompt}"
+
+    with patch.object(client.provider, "generate", side_effect=slow_generate) as mock_generate, \
+            ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(client.generate, "same") for _ in range(4)]
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results == ["answer to same"] * 4
+    assert mock_generate.call_count == 1
@@ -126,6 +126,7 @@ class TestMCPToolNodeFactory:
         result = node_fn({"input": "test"})
         assert "Use MCP nodes instead" in result["output"]
         assert "MCP functionality is now handled by MCP nodes directly" in result["error_context"]
+        assert "input" not in result
 
     def test_make_tool_node_python_function(self):
         """Test make_tool_node with Python function."""
@@ -1,10 +1,15 @@
 # tests/core/test_mcp_node.py
+import asyncio
+import gc
+import os
+from pathlib import Path
+import sys
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from elf0.core.mcp_client import MCPConnectionError, MCPToolError
-from elf0.core.nodes.mcp_node import MCPNode
+from elf0.core.nodes.mcp_node import MCPNode, _get_server_loop
 
 
 class TestMCPNode:
@@ -62,6 +67,24 @@ class TestMCPNode:
         # Assert
         assert bound_params == {"input": "${state.missing_key}", "static": "value"}
 
+    def test_parameter_binding_from_json_output(self):
+        """Test that ${json.key} parameters read the key from JSON in the previous output."""
+        # Arrange
+        config = {
+            "server": {"command": ["echo", "test"]},
+            "tool": "test_tool",
+            "parameters": {"url": "${json.url}", "count": "${state.count}"}
+        }
+        node = MCPNode(config)
+
+        # Act
+        first = node._bind_parameters({"output": 'Result: {"url": "https://a.test"}', "count": 1})
+        second = node._bind_parameters({"output": '{"url": "https://b.test"}', "count": 2})
+
+        # Assert
+        assert first == {"url": "https://a.test", "count": 1}
+        assert second == {"url": "https://b.test", "count": 2}
+
     def test_parameter_binding_no_template(self):
         """Test parameter binding without template variables."""
         # Arrange
@@ -210,3 +233,55 @@ class TestMCPNode:
         assert bound_params["empty_string"] == ""  # Unchanged
         # Note: Current implementation doesn't handle partial templates
         assert bound_params["partial_template"] == "prefix_${state.value}_suffix"
+
+    def test_keep_alive_reuses_server_across_event_loops(self):
+        """Test that a keep-alive node starts its server once for calls from separate runs."""
+        # Arrange
+        server_script = Path(__file__).parents[2] / "mcp" / "calculator" / "server.py"
+        config = {
+            "server": {"command": [sys.executable, str(server_script)], "keep_alive": True},
+            "tool": "calculate",
+            "parameters": {"a": "${state.a}", "b": 2, "operation": "multiply"}
+        }
+        node = MCPNode(config)
+
+        # Act - each call runs on its own event loop, as node calls do
+        first = asyncio.run(node.execute({"a": 3}))
+        server_pid = node.client.process.pid
+        second = asyncio.run(node.execute({"a": 5}))
+
+        # Assert
+        assert (first["output"], second["output"]) == ("6", "10")
+        assert node.client.process.pid == server_pid
+
+        # A server that has exited is started again on the next call
+        asyncio.run_coroutine_threadsafe(node.client.disconnect(), _get_server_loop()).result(timeout=5)
+        assert asyncio.run(node.execute({"a": 1}))["output"] == "2"
+        assert node.client.process.pid != server_pid
+
+    def test_kept_server_stops_with_its_node(self):
+        """Test that a keep-alive server is stopped on close and when its node is collected."""
+        # Arrange
+        server_script = Path(__file__).parents[2] / "mcp" / "calculator" / "server.py"
+        config = {
+            "server": {"command": [sys.executable, str(server_script)], "keep_alive": True},
+            "tool": "calculate",
+            "parameters": {"a": 2, "b": 2, "operation": "add"}
+        }
+        closed_node = MCPNode(config)
+        collected_node = MCPNode(config)
+        asyncio.run(closed_node.execute({}))
+        asyncio.run(collected_node.execute({}))
+        closed_process = closed_node.client.process
+        collected_process = collected_node.client.process
+
+        # Act
+        closed_node.close()
+        del collected_node
+        gc.collect()
+
+        # Assert - both processes have exited and been reaped
+        for process in (closed_process, collected_process):
+            assert process.returncode is not None
+            with pytest.raises(ProcessLookupError):
+                os.kill(process.pid, 0)
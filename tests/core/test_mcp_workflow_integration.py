@@ -192,8 +192,8 @@ class TestMCPWorkflowIntegration:
                 mock_run.return_value = expected_result
                 result = node_fn(state)
 
-        # Assert - Test high-level behavior: state transformation
-        assert result["input"] == "test input"
+        # Assert - Test high-level behavior: only the produced keys are returned
+        assert "input" not in result
         assert result["output"] == "mcp tool result"
         assert result["current_node"] == "test_mcp"
         assert result["error_context"] is None
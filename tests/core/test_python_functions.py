@@ -1,6 +1,7 @@
 # tests/core/test_python_functions_new.py
 """High-level tests for Python function calling functionality."""
 
+import inspect
 from unittest.mock import patch
 
 import pytest
@@ -81,6 +82,53 @@ class TestParameterBinding:
         # Assert
         assert bound["file_path"] == "test.pdf"
 
+    def test_binder_inspects_signature_once(self):
+        """Test that a prepared binder reuses its parameter plan across calls."""
+        # Arrange
+        def dummy_func(state, file_path, mode) -> None:
+            pass
+
+        parameters = {"file_path": "${state.input}", "mode": "fast"}
+
+        # Act
+        with patch("elf0.core.function_loader.inspect.signature", wraps=inspect.signature) as signature:
+            bind = function_loader.parameter_binder(dummy_func, parameters)
+            first = bind(WorkflowState(input="a.pdf", output=None))
+            second = bind(WorkflowState(input="b.pdf", output=None))
+
+        # Assert
+        assert signature.call_count == 1
+        assert (first["file_path"], first["mode"]) == ("a.pdf", "fast")
+        assert (second["file_path"], second["mode"]) == ("b.pdf", "fast")
+
+    def test_state_caller_passes_the_same_arguments_as_the_binder(self):
+        """Test that prebound callers receive exactly the parameters a binder produces."""
+        # Arrange
+        def positional(state, mode="slow"):
+            return ("positional", state["input"], mode)
+
+        def keyword_only(*, state, mode="slow"):
+            return ("keyword_only", state["input"], mode)
+
+        def with_field(state, file_path, mode):
+            return ("with_field", state["input"], file_path, mode)
+
+        def without_state(mode):
+            return ("without_state", mode)
+
+        cases = [
+            (positional, {"mode": "fast"}),
+            (keyword_only, {"mode": "fast"}),
+            (with_field, {"file_path": "${state.input}", "mode": "fast"}),
+            (without_state, {"mode": "fast"}),
+        ]
+        state = WorkflowState(input="a.pdf", output=None)
+
+        # Act / Assert
+        for func, parameters in cases:
+            expected = func(**function_loader.parameter_binder(func, parameters)(state))
+            assert function_loader.state_caller(func, parameters)(state) == expected
+
 
 class TestUtilityFunctions:
     """Test utility functions behavior."""
@@ -1,7 +1,18 @@
+from datetime import date
+import os
+from unittest.mock import patch
 
 import pytest
 
-from elf0.core.spec import LLM, Edge, Spec, Workflow, WorkflowNode
+from elf0.core.spec import (
+    LLM,
+    Edge,
+    Spec,
+    Workflow,
+    WorkflowNode,
+    clear_spec_cache,
+    load_spec,
+)
 
 # Test data
 VALID_LLM_CONFIG = {
@@ -22,6 +33,18 @@ VALID_EDGE = {
     "target": "node2"
 }
 
+# Single-node sequential spec written by the spec cache tests
+BASE_SPEC_YAML = (
+    'version: "0.1"\n'
+    "llms:\n  llm1: {{type: openai, model_name: {model}, temperature: 0.5}}\n"
+    "workflow:\n  type: sequential\n  nodes: [{{id: start, kind: agent, ref: llm1, stop: true{node_fields}}}]\n"
+    "  edges: []\n"
+)
+
+def _write_spec(path, model="gpt-4.1-mini", node_fields=""):
+    """Write BASE_SPEC_YAML to `path`, with extra flow-mapping fields for its node."""
+    path.write_text(BASE_SPEC_YAML.format(model=model, node_fields=f", {node_fields}" if node_fields else ""))
+
 def test_create_valid_spec():
     """Test creating a valid spec."""
     spec = Spec(
@@ -165,3 +188,79 @@ workflow:
     # A node without a config block should have an empty dict by default_factory
     assert isinstance(end_node.config, dict)
     assert not end_node.config
+
+def test_load_spec_reuses_validated_spec_until_files_change(tmp_path):
+    """Test that load_spec caches specs and notices edits to referenced files."""
+    clear_spec_cache()
+    base = tmp_path / "base.yaml"
+    _write_spec(base)
+    child = tmp_path / "child.yaml"
+    child.write_text('reference: "./base.yaml"\ndescription: child\n')
+
+    loaded_files = []
+    first = load_spec(str(child), loaded_files=loaded_files)
+    first.llms["llm1"].api_key = "set-by-caller"
+
+    with patch.object(Spec, "from_file", wraps=Spec.from_file) as from_file:
+        second = load_spec(str(child))
+        assert from_file.call_count == 0
+        # Callers get independent copies
+        assert second.llms["llm1"].api_key is None
+        assert loaded_files == [child.resolve(), base.resolve()]
+
+        _write_spec(base, model="gpt-4.1")
+        assert load_spec(str(child)).llms["llm1"].model_name == "gpt-4.1"
+        # Reloaded once for the child and once for its reference
+        assert from_file.call_count == 2
+
+def test_touched_spec_is_still_served_from_the_cache(tmp_path):
+    """Test that a spec whose mtime changed but whose content did not is not reloaded."""
+    clear_spec_cache()
+    spec_file = tmp_path / "touched.yaml"
+    _write_spec(spec_file)
+    load_spec(str(spec_file))
+    stat_result = spec_file.stat()
+    os.utime(spec_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 5_000_000_000))
+
+    with patch.object(Spec, "from_file", wraps=Spec.from_file) as from_file:
+        load_spec(str(spec_file))
+        load_spec(str(spec_file))
+        assert from_file.call_count == 0
+
+        _write_spec(spec_file, model="gpt-4.1-nano")
+        assert load_spec(str(spec_file)).llms["llm1"].model_name == "gpt-4.1-nano"
+        assert from_file.call_count == 1
+
+def test_shared_reference_is_validated_once(tmp_path):
+    """Test that specs referencing the same base reuse its validated copy."""
+    clear_spec_cache()
+    base = tmp_path / "base.yaml"
+    _write_spec(base)
+    children = []
+    for name in ("first", "second"):
+        child = tmp_path / f"{name}.yaml"
+        child.write_text(f'reference: "./base.yaml"\ndescription: {name}\n')
+        children.append(child)
+
+    with patch.object(Spec, "from_file", wraps=Spec.from_file) as from_file:
+        first_files = []
+        second_files = []
+        assert load_spec(str(children[0]), loaded_files=first_files).description == "first"
+        assert load_spec(str(children[1]), loaded_files=second_files).description == "second"
+
+    # Once for each child and once for the shared base
+    assert from_file.call_count == 3
+    assert second_files == [children[1].resolve(), base.resolve()]
+
+def test_cached_specs_keep_values_json_cannot_represent(tmp_path):
+    """Test that specs with non-JSON config values are still returned unchanged from the cache."""
+    clear_spec_cache()
+    spec_file = tmp_path / "dated.yaml"
+    _write_spec(spec_file, node_fields="config: {since: 2024-05-01}")
+
+    first = load_spec(str(spec_file))
+    second = load_spec(str(spec_file))
+
+    assert second == first
+    assert second.workflow.nodes[0].config["since"] == date(2024, 5, 1)
+    assert second.workflow.nodes[0] is not first.workflow.nodes[0]
@@ -0,0 +1,48 @@
+import os
+from unittest.mock import patch
+
+from elf0.utils import file_fingerprints
+from elf0.utils.file_fingerprints import FileFingerprints
+
+
+def _bump_mtime(path):
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 5_000_000_000))
+
+def test_touched_file_stays_fresh_and_is_hashed_once(tmp_path):
+    """Test that a file touched without edits is rehashed once, then matched by stamp."""
+    # Arrange
+    spec_file = tmp_path / "spec.yaml"
+    spec_file.write_text("version: '0.1'\n")
+    fingerprints = FileFingerprints([spec_file])
+    _bump_mtime(spec_file)
+
+    # Act
+    with patch.object(file_fingerprints, "file_digest", wraps=file_fingerprints.file_digest) as digest:
+        first = fingerprints.is_fresh()
+        second = fingerprints.is_fresh()
+
+    # Assert
+    assert first
+    assert second
+    assert digest.call_count == 1
+
+def test_edited_or_deleted_file_is_stale(tmp_path):
+    """Test that changed contents or a missing file make the fingerprints stale."""
+    # Arrange
+    edited = tmp_path / "edited.yaml"
+    deleted = tmp_path / "deleted.yaml"
+    edited.write_text("a: 1\n")
+    deleted.write_text("b: 1\n")
+    edited_fingerprints = FileFingerprints([edited])
+    deleted_fingerprints = FileFingerprints([deleted])
+
+    # Act
+    edited.write_text("a: 2\n")
+    _bump_mtime(edited)
+    deleted.unlink()
+
+    # Assert
+    assert not edited_fingerprints.is_fresh()
+    assert not deleted_fingerprints.is_fresh()
+    assert deleted_fingerprints.paths == [deleted]
@@ -0,0 +1,68 @@
+# tests/utils/test_file_utils.py
+"""Tests for file reading helpers."""
+
+from pathlib import Path
+
+import pytest
+
+from elf0.utils import file_utils
+from elf0.utils.file_utils import (
+    get_directory_files,
+    parse_comma_separated_files,
+    read_files_content,
+    read_text_file,
+)
+
+
+@pytest.mark.parametrize("mmap_min_bytes", [1024 * 1024, 1])
+def test_read_text_file_matches_read_text(tmp_path, monkeypatch, mmap_min_bytes):
+    """Test that buffered and memory-mapped reads decode like Path.read_text."""
+    monkeypatch.setattr(file_utils, "MMAP_MIN_BYTES", mmap_min_bytes)
+    path = tmp_path / "context.txt"
+    path.write_bytes("line one\r\nline two\rcafé\n".encode())
+
+    assert read_text_file(path) == path.read_text(encoding="utf-8")
+
+
+def test_read_text_file_empty_file(tmp_path, monkeypatch):
+    """Test that an empty file reads as an empty string even when every other file is mapped."""
+    monkeypatch.setattr(file_utils, "MMAP_MIN_BYTES", 1)
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    assert read_text_file(path) == ""
+
+
+def test_get_directory_files_skips_subdirectories_and_binaries(tmp_path):
+    """Test that only relevant regular files are collected from a directory."""
+    (tmp_path / "notes.md").write_text("notes")
+    (tmp_path / "Makefile").write_text("all:\n\techo hi\n")
+    (tmp_path / "blob").write_bytes(bytes(range(256)))
+    (tmp_path / "image.png").write_bytes(b"png")
+    (tmp_path / "subdir").mkdir()
+
+    assert get_directory_files(tmp_path) == [tmp_path / "Makefile", tmp_path / "notes.md"]
+
+
+def test_parse_comma_separated_files_skips_missing(tmp_path, monkeypatch):
+    """Test that only existing files are returned, with surrounding spaces stripped."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.txt").write_text("a")
+
+    assert parse_comma_separated_files(" a.txt , missing.txt") == [Path("a.txt")]
+
+
+def test_read_files_content_keeps_order_with_concurrent_reads(tmp_path, monkeypatch):
+    """Test that files read by a small thread pool keep their order."""
+    monkeypatch.setattr(file_utils, "MAX_READ_WORKERS", 2)
+    files = []
+    for index in range(7):
+        path = tmp_path / f"file{index}.txt"
+        path.write_text(f"text {index}")
+        files.append(path)
+    files.insert(3, tmp_path / "missing.txt")
+
+    content = read_files_content(files)
+
+    assert content.count("---") == 7
+    assert [int(line[-1]) for line in content.splitlines() if line.startswith("text")] == list(range(7))
@@ -1,10 +1,16 @@
 
+import os
+
 import pytest
+import yaml
 
+from elf0.utils import yaml_loader
 from elf0.utils.yaml_loader import (
+    clear_yaml_cache,
     load_yaml_file,
     load_yaml_files,
     merge_yaml_data,
+    parse_yaml,
     save_yaml_file,
 )
 
@@ -58,6 +64,42 @@ def test_load_yaml_file_invalid_yaml(tmp_path):
         load_yaml_file(str(yaml_file))
     assert "Error parsing YAML file" in str(exc_info.value)
 
+def test_load_yaml_file_cache_returns_independent_copies(tmp_path):
+    """Test that cached documents are reused but never shared with callers."""
+    clear_yaml_cache()
+    yaml_file = tmp_path / "cached.yaml"
+    yaml_file.write_text(VALID_YAML_CONTENT)
+
+    first = load_yaml_file(str(yaml_file))
+    first["llms"]["llm1"]["model_name"] = "mutated"
+    second = load_yaml_file(str(yaml_file))
+
+    assert second["llms"]["llm1"]["model_name"] == "gpt-4.1-mini"
+    assert yaml_file.resolve() in yaml_loader._yaml_cache
+
+def test_load_yaml_file_cache_detects_edits(tmp_path):
+    """Test that a changed file is parsed again instead of served from the cache."""
+    clear_yaml_cache()
+    yaml_file = tmp_path / "edited.yaml"
+    yaml_file.write_text("key: one")
+    assert load_yaml_file(str(yaml_file)) == {"key": "one"}
+
+    yaml_file.write_text("key: two")
+    stat_result = yaml_file.stat()
+    # Force a distinct mtime even on filesystems with coarse timestamps
+    os.utime(yaml_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+    assert load_yaml_file(str(yaml_file)) == {"key": "two"}
+
+def test_parse_yaml_matches_safe_load_for_text_and_bytes():
+    """Test that the fast loader parses text and UTF-8 bytes exactly like yaml.safe_load."""
+    content = VALID_YAML_CONTENT + 'notes: "caf\u00e9"\nsince: 2024-05-01\n'
+
+    assert parse_yaml(content) == yaml.safe_load(content)
+    assert parse_yaml(content.encode("utf-8")) == yaml.safe_load(content)
+    with pytest.raises(yaml.YAMLError):
+        parse_yaml("!!python/object:os.system {}")
+
 def test_load_yaml_files(tmp_path):
     """Test loading multiple YAML files from a directory."""
     # Arrange